@@ -0,0 +1,97 @@
+import os
+import argparse
+from itertools import product
+from loguru import logger
+
+from src.utils import setup_logger, load_config, get_single_flight, get_pool_metrics
+from src.core import (
+    get_model_router,
+    get_embeddings,
+    get_embedding_settings,
+    load_ethics_frameworks_to_db,
+    EthicsState,
+    CheckpointStore,
+    StageCache,
+    RunRegistry,
+    cleanup_artifacts,
+    load_framework_kbs,
+    create_ethics_workflow
+)
+from src.core.batch import BatchLimits, BatchScheduler
+
+CRITERIA_CHOICES = ["EU AI Act", "UNESCO AI Ethics", "OECD AI Principles"]
+
+def main():
+    """여러 AI 서비스 x 윤리 기준 조합을 동시에 진단하는 배치 실행 스크립트"""
+    parser = argparse.ArgumentParser(description="AI 윤리성 리스크 진단 배치 실행")
+    parser.add_argument("--services", "-s", type=str, nargs="+", required=True, help="분석할 AI 서비스 이름 목록")
+    parser.add_argument("--criteria", "-c", type=str, nargs="+", default=["EU AI Act"], choices=CRITERIA_CHOICES, help="적용할 윤리 기준 목록")
+    parser.add_argument("--max-jobs", type=int, default=int(os.getenv("BATCH_MAX_JOBS", "4")), help="동시에 실행할 워크플로우 수")
+    parser.add_argument("--llm-rps", type=float, default=float(os.getenv("BATCH_LLM_RPS", "2")), help="LLM 초당 요청 수 제한")
+    parser.add_argument("--cpu-workers", type=int, default=int(os.getenv("BATCH_CPU_WORKERS", "2")), help="CPU 작업용 프로세스 수 (0이면 프로세스 풀 미사용)")
+    parser.add_argument("--no-cache", action="store_true", help="실행 간 단계 결과 캐시를 사용하지 않음")
+    args = parser.parse_args()
+
+    # 동시 실행 중 노드 진행 메시지는 기본적으로 콘솔에 출력하지 않음 (LOG_CONSOLE=true로 켜기)
+    setup_logger(console=os.getenv("LOG_CONSOLE", "false").lower() in ("1", "true", "yes"))
+    logger.info("AI 윤리성 리스크 진단 배치 실행 시작")
+    cleanup_artifacts()
+
+    scheduler = None
+    try:
+        load_config()
+        limits = BatchLimits(max_jobs=args.max_jobs, llm_rps=args.llm_rps, cpu_workers=args.cpu_workers)
+
+        # 임베딩 모델과 벡터 DB를 먼저 로드한 뒤 프로세스 풀을 fork (워커가 읽기 전용으로 공유)
+        embedding_mode, embedding_model, faiss_path = get_embedding_settings()
+        embeddings = get_embeddings(model_name=embedding_model)
+        ethics_db = load_ethics_frameworks_to_db(embeddings, faiss_path=faiss_path)
+        scheduler = BatchScheduler(ethics_db, limits)
+
+        # 모든 작업이 하나의 모델 라우터(등급별 LLM 클라이언트)와 OpenAI 공급자 속도 제한기를 공유
+        llm = get_model_router()
+
+        checkpoint_store = CheckpointStore(os.getenv("CHECKPOINT_DB_PATH"))
+        run_registry = RunRegistry(os.getenv("RUN_REGISTRY_DB_PATH"))
+        workflow = create_ethics_workflow(
+            llm,
+            scheduler.vector_db,
+            checkpoint_store=checkpoint_store,
+            stage_cache=None if args.no_cache else StageCache(os.getenv("STAGE_CACHE_DB_PATH")),
+            run_registry=run_registry,
+            single_flight=get_single_flight(),
+            framework_kbs=load_framework_kbs(os.getenv("FRAMEWORK_KB_DIR", "data/framework_kb"))
+        )
+
+        jobs = [
+            EthicsState(ai_service=service, criteria=criteria, workflow_status="processing")
+            for service, criteria in product(args.services, args.criteria)
+        ]
+        print(f"배치 작업 {len(jobs)}건 실행 (max_jobs={limits.max_jobs}, llm_rps={limits.llm_rps}, cpu_workers={limits.cpu_workers})")
+
+        results = scheduler.run(
+            workflow,
+            jobs,
+            run_registry=run_registry,
+            journal_dir=os.getenv("STATE_JOURNAL_DIR")
+        )
+
+        logger.info(f"HTTP 연결 풀 통계: {get_pool_metrics()}")
+        failed = 0
+        for state in results:
+            print(f"- {state.ai_service} / {state.criteria}: {state.workflow_status} ({state.workflow_id}) {state.report_path or ''}")
+            if state.workflow_status != "completed":
+                failed += 1
+        return 1 if failed else 0
+
+    except Exception as e:
+        logger.error(f"배치 실행 중 오류 발생: {e}")
+        print(f"오류 발생: {e}")
+        return 1
+    finally:
+        if scheduler is not None:
+            scheduler.shutdown()
+
+if __name__ == "__main__":
+    exit_code = main()
+    exit(exit_code)
@@ -0,0 +1,120 @@
+import os
+import time
+import argparse
+from datetime import datetime
+from dotenv import load_dotenv
+from loguru import logger
+from langchain_community.callbacks import get_openai_callback
+
+from src.utils import setup_logger, get_artifact_manager
+from src.agents import create_service_input_agent
+from src.core import (
+    get_model_router,
+    get_embeddings,
+    get_embedding_settings,
+    load_ethics_frameworks_to_db,
+    EthicsState,
+    load_framework_kbs,
+    create_ethics_workflow
+)
+
+MODES = ("ko", "en")
+
+def usage(callback):
+    """OpenAI 콜백 집계값 (로컬 모델 호출은 집계되지 않음)"""
+    return {
+        "requests": callback.successful_requests,
+        "prompt_tokens": callback.prompt_tokens,
+        "completion_tokens": callback.completion_tokens,
+        "total_tokens": callback.total_tokens,
+        "cost_usd": round(callback.total_cost, 4)
+    }
+
+def run_mode(workflow, base_state):
+    """서비스 정보가 채워진 상태에서 기준 검색부터 보고서 생성까지 실행하고 토큰, 지연 시간, 중간 산출물 크기를 측정합니다."""
+    state = base_state.copy(update={"workflow_status": "processing"})
+    started = time.perf_counter()
+    with get_openai_callback() as callback:
+        result = EthicsState(**workflow.invoke(state))
+    latency = time.perf_counter() - started
+    report_chars = 0
+    if result.report_path and os.path.exists(result.report_path):
+        with open(result.report_path, "r", encoding="utf-8") as f:
+            report_chars = len(f.read())
+    return dict(
+        usage(callback),
+        latency=round(latency, 2),
+        criteria_info_chars=result.criteria_info.length if result.criteria_info else 0,
+        risk_message_chars=result.risk_message.length if result.risk_message else 0,
+        report_chars=report_chars,
+        state_score=result.state_score,
+        report_path=result.report_path
+    )
+
+def summarize(runs):
+    """모드별 실행 결과의 평균"""
+    keys = ("requests", "prompt_tokens", "completion_tokens", "total_tokens", "cost_usd", "latency", "criteria_info_chars", "risk_message_chars", "report_chars")
+    return {key: round(sum(run[key] for run in runs) / len(runs), 2) for key in keys}
+
+def main():
+    """중간 산출물 한국어 모드(ko)와 영어 모드(en)의 토큰 사용량과 지연 시간 비교"""
+    parser = argparse.ArgumentParser(description="중간 산출물 언어(ko/en)별 토큰 사용량과 지연 시간 벤치마크")
+    parser.add_argument("--service", "-s", type=str, required=True, help="분석할 AI 서비스 이름")
+    parser.add_argument("--criteria", "-c", type=str, default="EU AI Act", choices=["EU AI Act", "UNESCO AI Ethics", "OECD AI Principles"], help="적용할 윤리 기준")
+    parser.add_argument("--runs", type=int, default=1, help="모드별 반복 실행 횟수 (모드를 번갈아 실행)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    setup_logger()
+    try:
+        llm = get_model_router()
+        embedding_mode, embedding_model, faiss_path = get_embedding_settings()
+        ethics_db = load_ethics_frameworks_to_db(get_embeddings(model_name=embedding_model), faiss_path=faiss_path)
+        framework_kbs = load_framework_kbs(os.getenv("FRAMEWORK_KB_DIR", "data/framework_kb"))
+
+        # 서비스 입력 단계는 두 모드가 같으므로 한 번만 실행하여 공유 (비교 대상은 기준 검색 ~ 보고서 생성)
+        base_state = EthicsState(ai_service=args.service, criteria=args.criteria)
+        with get_openai_callback() as callback:
+            base_state = base_state.apply(create_service_input_agent(llm)(base_state))
+        service_input_usage = usage(callback)
+        logger.info(f"서비스 입력 완료: 키워드 {base_state.ethical_risk_keywords}")
+
+        # 단계 결과 캐시 없이 실행 (기준 검색 결과 재사용 시 비교가 왜곡됨)
+        workflows = {mode: create_ethics_workflow(llm, ethics_db, framework_kbs=framework_kbs, intermediate_language=mode) for mode in MODES}
+        runs = {mode: [] for mode in MODES}
+        for i in range(args.runs):
+            for mode in MODES:
+                logger.info(f"[{mode}] 실행 {i + 1}/{args.runs}")
+                runs[mode].append(run_mode(workflows[mode], base_state))
+
+        report = {
+            "created_at": datetime.now().isoformat(),
+            "ai_service": args.service,
+            "criteria": args.criteria,
+            "llm": llm.model_name,
+            "embedding_model": embedding_model,
+            "service_input": service_input_usage,
+            "modes": {mode: {"mean": summarize(runs[mode]), "runs": runs[mode]} for mode in MODES}
+        }
+        artifacts = get_artifact_manager()
+        output_path = artifacts.path("benchmarks", f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        artifacts.write_json(output_path, report)
+
+        columns = ("requests", "prompt_tokens", "completion_tokens", "total_tokens", "latency", "criteria_info_chars", "risk_message_chars")
+        print(f"{'모드':<6}" + "".join(f"{column:>20}" for column in columns))
+        for mode in MODES:
+            mean = report["modes"][mode]["mean"]
+            print(f"{mode:<6}" + "".join(f"{mean[column]:>20}" for column in columns))
+        ko, en = report["modes"]["ko"]["mean"], report["modes"]["en"]["mean"]
+        if ko["total_tokens"]:
+            print(f"en 모드 토큰 변화: {(en['total_tokens'] - ko['total_tokens']) / ko['total_tokens']:+.1%}, 지연 시간 변화: {(en['latency'] - ko['latency']) / max(ko['latency'], 1e-9):+.1%}")
+        print(f"벤치마크 결과 저장: {output_path}")
+        return 0
+    except Exception as e:
+        logger.error(f"파이프라인 벤치마크 실패: {e}")
+        print(f"오류 발생: {e}")
+        return 1
+
+if __name__ == "__main__":
+    exit_code = main()
+    exit(exit_code)
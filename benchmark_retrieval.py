@@ -0,0 +1,139 @@
+import os
+import re
+import time
+import argparse
+from datetime import datetime
+from dotenv import load_dotenv
+from loguru import logger
+
+from src.utils import setup_logger, get_artifact_manager
+from src.utils.model_router import TRANSLATE
+from src.core import get_model_router, get_embeddings, load_framework_kbs
+from src.core.ethics_frameworks import (
+    file_path as default_framework_path,
+    load_or_build_faiss,
+    vectorstore_path,
+    DEFAULT_FAISS_PATH,
+    DEFAULT_EMBEDDING_MODEL,
+    MULTILINGUAL_EMBEDDING_MODEL
+)
+
+# 한국어 검색 쿼리와 정답 조항 번호 (EU AI Act)
+BENCHMARK_QUERIES = [
+    ("얼굴 인식 데이터베이스 구축을 위한 무차별 이미지 수집 금지", ["5"]),
+    ("고위험 AI 시스템 분류 기준", ["6"]),
+    ("고위험 AI 시스템의 위험 관리 체계", ["9"]),
+    ("학습 데이터 품질과 데이터 거버넌스", ["10"]),
+    ("고위험 AI 시스템 기술 문서 작성 의무", ["11"]),
+    ("자동 로그 기록 보관 의무", ["12"]),
+    ("배포자에 대한 투명성과 정보 제공", ["13"]),
+    ("인간 감독 조치", ["14"]),
+    ("정확성 견고성 사이버보안 요구사항", ["15"]),
+    ("기본권 영향 평가", ["27"]),
+    ("챗봇과 딥페이크 콘텐츠의 투명성 의무", ["50"]),
+    ("범용 AI 모델 제공자의 의무", ["53"])
+]
+
+TRANSLATE_PROMPT = """다음 한국어 검색어를 EU AI Act 문서 검색에 적합한 영어 검색 쿼리로 번역해주세요.
+번역된 영어 쿼리만 응답해주세요.
+
+{query}"""
+
+def _normalize(text):
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+def is_relevant(doc, articles, kb):
+    """검색된 청크가 정답 조항에 속하는지 확인합니다 (조항 제목 언급 또는 지식 베이스 조항 본문과 일치)."""
+    content = _normalize(doc.page_content)
+    for number in articles:
+        if re.search(rf"\barticle\s+{number}\b", content):
+            return True
+        article = kb.article(number) if kb is not None else None
+        if article:
+            # 청크 가운데 부분이 조항 본문에 포함되면 같은 조항으로 봄
+            middle = content[len(content) // 3: len(content) // 3 + 80]
+            if middle and middle in _normalize(article["text"]):
+                return True
+    return False
+
+def run_mode(name, search, queries, k, kb, translate=None):
+    """쿼리마다 (번역 후) 검색하여 recall@k와 지연 시간을 측정합니다."""
+    results = []
+    for query, articles in queries:
+        started = time.perf_counter()
+        search_query = translate(query) if translate else query
+        docs = search(search_query, k)
+        latency = time.perf_counter() - started
+        hit = any(is_relevant(doc, articles, kb) for doc in docs)
+        results.append({"query": query, "search_query": search_query, "hit": hit, "latency": round(latency, 3)})
+        logger.info(f"[{name}] {query} -> {'hit' if hit else 'miss'} ({latency:.2f}초)")
+    latencies = sorted(result["latency"] for result in results)
+    return {
+        "mode": name,
+        "recall_at_k": round(sum(result["hit"] for result in results) / len(results), 3),
+        "mean_latency": round(sum(latencies) / len(latencies), 3),
+        "p95_latency": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "queries": results
+    }
+
+def main():
+    """다국어 임베딩 인덱스(한국어 쿼리 직접 검색)와 번역 후 영어 인덱스 검색의 recall과 지연 시간 비교"""
+    parser = argparse.ArgumentParser(description="번역 후 검색 vs 다국어 임베딩 직접 검색 벤치마크")
+    parser.add_argument("--pdf", type=str, default=default_framework_path, help="프레임워크 PDF 경로")
+    parser.add_argument("--english-model", type=str, default=os.getenv("EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL), help="영어 임베딩 모델")
+    parser.add_argument("--multilingual-model", type=str, default=os.getenv("MULTILINGUAL_EMBEDDING_MODEL", MULTILINGUAL_EMBEDDING_MODEL), help="다국어 임베딩 모델")
+    parser.add_argument("--k", type=int, default=5, help="recall@k의 k")
+    parser.add_argument("--no-translate", action="store_true", help="번역 후 검색 모드를 건너뜀 (LLM 호출 없음)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    setup_logger()
+    try:
+        sources = [("EU_AI_Act", args.pdf)]
+        kb = load_framework_kbs(os.getenv("FRAMEWORK_KB_DIR", "data/framework_kb")).get("EU_AI_Act")
+
+        english_db = load_or_build_faiss(sources, get_embeddings(args.english_model), vectorstore_path(DEFAULT_FAISS_PATH, args.english_model))
+        multilingual_db = load_or_build_faiss(sources, get_embeddings(args.multilingual_model), vectorstore_path(DEFAULT_FAISS_PATH, args.multilingual_model))
+
+        def english_search(query, k):
+            return english_db.similarity_search(query, k=k)
+
+        def multilingual_search(query, k):
+            return multilingual_db.similarity_search(query, k=k)
+
+        report = {
+            "created_at": datetime.now().isoformat(),
+            "k": args.k,
+            "english_model": args.english_model,
+            "multilingual_model": args.multilingual_model,
+            "modes": [
+                run_mode("multilingual", multilingual_search, BENCHMARK_QUERIES, args.k, kb),
+                # 번역 없이 영어 인덱스에 한국어로 검색 (기준선)
+                run_mode("english_untranslated", english_search, BENCHMARK_QUERIES, args.k, kb)
+            ]
+        }
+        if not args.no_translate:
+            translator = get_model_router().for_task(TRANSLATE)
+
+            def translate(query):
+                return translator.invoke(TRANSLATE_PROMPT.format(query=query)).content.strip()
+
+            report["modes"].append(run_mode("translate_first", english_search, BENCHMARK_QUERIES, args.k, kb, translate=translate))
+
+        artifacts = get_artifact_manager()
+        output_path = artifacts.path("benchmarks", f"retrieval_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        artifacts.write_json(output_path, report)
+
+        print(f"{'모드':<22} {'recall@' + str(args.k):>10} {'평균(초)':>10} {'p95(초)':>10}")
+        for mode in report["modes"]:
+            print(f"{mode['mode']:<22} {mode['recall_at_k']:>10.2f} {mode['mean_latency']:>10.3f} {mode['p95_latency']:>10.3f}")
+        print(f"벤치마크 결과 저장: {output_path}")
+        return 0
+    except Exception as e:
+        logger.error(f"검색 벤치마크 실패: {e}")
+        print(f"오류 발생: {e}")
+        return 1
+
+if __name__ == "__main__":
+    exit_code = main()
+    exit(exit_code)
@@ -0,0 +1,30 @@
+import os
+import argparse
+from loguru import logger
+
+from src.utils import setup_logger
+from src.core.ethics_frameworks import file_path as default_framework_path
+from src.core.framework_kb import build_framework_kb
+
+
+def main():
+    """프레임워크 지식 베이스 사전 생성 스크립트 (실행당 LLM 재분석 대신 조회에 사용)"""
+    parser = argparse.ArgumentParser(description="윤리 프레임워크 문서에서 조항/부록/의무사항/위험 등급 지식 베이스 생성")
+    parser.add_argument("--pdf", type=str, default=default_framework_path, help="프레임워크 PDF 경로")
+    parser.add_argument("--framework", type=str, default="EU_AI_Act", help="프레임워크 이름 (벡터 DB 메타데이터와 동일)")
+    parser.add_argument("--output-dir", type=str, default=os.getenv("FRAMEWORK_KB_DIR", "data/framework_kb"), help="지식 베이스 저장 디렉토리")
+    args = parser.parse_args()
+
+    setup_logger()
+    try:
+        output_path = build_framework_kb(args.pdf, os.path.join(args.output_dir, f"{args.framework}.json"), framework=args.framework)
+        print(f"프레임워크 지식 베이스 생성 완료: {output_path}")
+        return 0
+    except Exception as e:
+        logger.error(f"프레임워크 지식 베이스 생성 실패: {e}")
+        print(f"오류 발생: {e}")
+        return 1
+
+if __name__ == "__main__":
+    exit_code = main()
+    exit(exit_code)
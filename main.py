@@ -1,141 +1,183 @@
 import os
 import argparse
+import asyncio
 from loguru import logger
 
-from src.utils import setup_logger, load_config
+from src.utils import setup_logger, console, run_context, load_config, get_single_flight, get_pool_metrics
 from src.core import (
-    get_llm,
+    get_model_router,
     get_embeddings,
+    get_embedding_settings,
     load_ethics_frameworks_to_db,
     EthicsState,
-    create_ethics_workflow
+    CheckpointStore,
+    StageCache,
+    StateJournal,
+    RunRegistry,
+    cleanup_artifacts,
+    load_framework_kbs,
+    create_ethics_workflow,
+    run_with_events
 )
-from langchain.embeddings import HuggingFaceEmbeddings
+
+
+def print_event(event):
+    """워크플로우 진행 이벤트를 콘솔에 출력합니다 (토큰 이벤트는 출력하지 않음)."""
+    if event.type == "node_start":
+        console(f"실행 중인 노드: {event.node}")
+    elif event.type == "node_end":
+        console(f"노드 완료: {event.node} ({event.data['duration']:.1f}s, 출력 키: {event.data['output_keys']})")
+    elif event.type == "tool_call":
+        console(f"  도구 호출: {event.data.get('tool')} {event.data.get('input')}")
+    elif event.type == "workflow_end":
+        logger.info(f"노드별 소요 시간: {event.data['timings']}")
 
 
 def main():
     """AI 윤리성 리스크 진단 시스템 메인 함수"""
     # 명령줄 인자 파싱
     parser = argparse.ArgumentParser(description="AI 윤리성 리스크 진단 시스템")
-    parser.add_argument("--service", "-s", type=str, required=True, help="분석할 AI 서비스 이름")
+    parser.add_argument("--service", "-s", type=str, help="분석할 AI 서비스 이름")
     parser.add_argument("--criteria", "-c", type=str, default="EU AI Act", choices=["EU AI Act", "UNESCO AI Ethics", "OECD AI Principles"], help="적용할 윤리 기준")
+    parser.add_argument("--resume", type=str, metavar="WORKFLOW_ID", help="체크포인트에서 복원하여 이어서 실행할 워크플로우 ID")
+    parser.add_argument("--no-cache", action="store_true", help="실행 간 단계 결과 캐시(서비스 정보, 기준 정보)를 사용하지 않음")
     args = parser.parse_args()
+    if not args.service and not args.resume:
+        parser.error("--service 또는 --resume 중 하나는 반드시 지정해야 합니다.")
     
     # 로거 설정
     setup_logger()
     logger.info("AI 윤리성 리스크 진단 시스템 시작")
     
+    # 보존 기간(ARTIFACT_RETENTION_DAYS)이 지난 산출물 정리
+    cleanup_artifacts()
+    
+    run_registry = None
+    current_state = None
     try:
         # 환경 설정 로드
         config = load_config()
-        print("환경 설정 로드 완료")
+        console("환경 설정 로드 완료")
         
         # 모델 초기화
-        llm = get_llm(model_name=os.getenv("LLM_MODEL", "gpt-4o"))
-        print("LLM 모델 초기화 완료")
+        # 작업 유형별 모델 라우터 (보조 호출은 작은 모델, 분석과 보고서 작성은 큰 모델)
+        llm = get_model_router()
+        console(f"LLM 모델 초기화 완료: {llm.model_name}")
         
-        # 임베딩 모델 초기화 - 테스트와 같은 모델 사용
-        embedding_model = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
-        embeddings = HuggingFaceEmbeddings(model_name=embedding_model)
-        print(f"임베딩 모델 초기화 완료: {embedding_model}")
+        # 임베딩 모델 초기화 - 인덱스 모드(EMBEDDING_MODE: english, multilingual)에 맞는 모델과 인덱스 경로 사용
+        embedding_mode, embedding_model, faiss_path = get_embedding_settings()
+        embeddings = get_embeddings(model_name=embedding_model)
+        console(f"임베딩 모델 초기화 완료: {embedding_model} ({embedding_mode})")
         
         # 윤리 프레임워크 벡터 DB 로드 - FAISS 사용
-        faiss_path = os.getenv("FAISS_DB_PATH", "./data/vectorstore")
         ethics_db = load_ethics_frameworks_to_db(embeddings, faiss_path=faiss_path)
-        print(f"윤리 프레임워크 벡터 DB 로드 완료: {faiss_path}")
+        console(f"윤리 프레임워크 벡터 DB 로드 완료: {faiss_path}")
         
-        # 상태 초기화
-        state = EthicsState(
-            ai_service=args.service,
-            criteria=args.criteria,
-            workflow_status="processing"
-        )
-        print(f"상태 초기화 완료: {state.ai_service}, {state.criteria}")
+        # 체크포인트 저장소 초기화
+        checkpoint_store = CheckpointStore(os.getenv("CHECKPOINT_DB_PATH"))
         
-        # 워크플로우 생성 및 실행
-        workflow = create_ethics_workflow(llm, ethics_db)
-        print("워크플로우 생성 완료, 실행 시작...")
-        
-        # 상태 저장
-        state_path = state.save_state()
-        logger.info(f"초기 상태 저장 완료: {state_path}")
+        # 상태 초기화 (재개 시에는 마지막 체크포인트에서 복원)
+        if args.resume:
+            state = checkpoint_store.load(args.resume)
+            if state is None:
+                console(f"재개할 체크포인트가 없습니다: {args.resume}")
+                return 1
+            state.workflow_status = "processing"
+            console(f"체크포인트에서 상태 복원 완료: {state.ai_service}, {state.criteria} (완료된 노드: {checkpoint_store.completed_nodes(args.resume)})")
+        else:
+            state = EthicsState(
+                ai_service=args.service,
+                criteria=args.criteria,
+                workflow_status="processing"
+            )
+            console(f"상태 초기화 완료: {state.ai_service}, {state.criteria}")
+        console(f"워크플로우 ID: {state.workflow_id}")
         
-        # 워크플로우 실행
-        current_state = state  # 초기 상태로 설정
-        for step in workflow.stream(state):
-            # 현재 단계 로깅
-            node = step.get("node")
-            if node:
-                print(f"실행 중인 노드: {node}")
+        # 이후 모든 로그 레코드에 workflow_id를 붙임
+        with run_context(state.workflow_id):
+            # 단계 결과 캐시 초기화 (같은 서비스의 서비스 정보/기준 정보 재사용)
+            stage_cache = None if args.no_cache else StageCache(os.getenv("STAGE_CACHE_DB_PATH"))
             
-            # 노드 실행 결과 명시적으로 확인 및 로깅
-            if step.get("output"):
-                output = step.get("output")
-                print(f"노드 출력 키: {list(output.keys())}")
-                logger.info(f"노드 '{node}' 출력 키: {list(output.keys())}")
-                
-                # 출력 결과를 현재 상태에 반영
-                for key, value in output.items():
-                    if hasattr(current_state, key):
-                        setattr(current_state, key, value)
-                        logger.info(f"상태 업데이트: {key}")
-                
-                # 중간 상태 저장
-                try:
-                    temp_dir = os.path.join("ai_agent/outputs/states", "temp")
-                    os.makedirs(temp_dir, exist_ok=True)
-                    temp_state_path = current_state.save_state(
-                        directory=temp_dir
-                    )
-                    logger.info(f"중간 상태 저장 완료: {temp_state_path}")
-                except Exception as e:
-                    logger.error(f"중간 상태 저장 실패: {e}")
+            # 실행 이력 저장소 초기화
+            run_registry = RunRegistry(os.getenv("RUN_REGISTRY_DB_PATH"))
             
-            # 상태 업데이트 (step의 "state" 키가 있는 경우에만)
-            if step.get("state") is not None:
-                current_state = step.get("state")
-                logger.info("워크플로우 상태 갱신됨")
+            framework_kbs = load_framework_kbs(os.getenv("FRAMEWORK_KB_DIR", "data/framework_kb"))
+            config = {"configurable": {"thread_id": state.workflow_id}}
             
-            # 완료된 경우
-            if current_state.workflow_status == "completed" or node == "end":
-                logger.info("워크플로우 완료 감지됨")
-                break
-        
-        # 워크플로우 상태 완료로 설정
-        current_state.workflow_status = "completed"
-        logger.info("워크플로우 상태 완료로 설정됨")
-        
-        # 워크플로우 완료 후 처리
-        if hasattr(current_state, "report_path") and current_state.report_path:
-            # TXT 파일 경로에서 PDF 파일 경로 추출
-            pdf_path = current_state.report_path.replace('.txt', '.pdf')
+            # 상태 저널 초기화 및 초기 상태 기록 (단계별 변경 필드만 append)
+            journal = StateJournal(state.workflow_id, directory=os.getenv("STATE_JOURNAL_DIR"))
+            journal.append(state, node="start")
+            logger.info(f"초기 상태 기록 완료: {journal.path}")
+            run_registry.start_run(state, journal_path=journal.path)
+            
+            # 워크플로우 생성 (노드 완료마다 체크포인트 저장소에 상태 저장, 재개는 이 저장소에서 복원)
+            workflow = create_ethics_workflow(
+                llm,
+                ethics_db,
+                checkpoint_store=checkpoint_store,
+                stage_cache=stage_cache,
+                run_registry=run_registry,
+                single_flight=get_single_flight(),
+                framework_kbs=framework_kbs
+            )
+            console("워크플로우 생성 완료, 실행 시작...")
             
-            if os.path.exists(current_state.report_path):
-                logger.info(f"보고서 생성 확인됨: {current_state.report_path} (TXT)")
-                print(f"\n보고서가 생성되었습니다:")
-                print(f"- TXT: {current_state.report_path}")
+            # 워크플로우 실행 (노드 시작/종료, 도구 호출 이벤트를 받아 진행 상황 출력, 노드 종료마다 저널 기록)
+            current_state = state  # 실행 중 오류 시 실행 이력 갱신에 사용할 초기 상태
+            current_state = asyncio.run(run_with_events(workflow, state, config, journal=journal, on_event=print_event))
+            
+            # 워크플로우 상태 완료로 설정
+            current_state.workflow_status = "completed"
+            logger.info("워크플로우 상태 완료로 설정됨")
+            
+            # 워크플로우 완료 후 처리
+            pdf_path = None
+            if hasattr(current_state, "report_path") and current_state.report_path:
+                # TXT 파일 경로에서 PDF 파일 경로 추출
+                pdf_path = current_state.report_path.replace('.txt', '.pdf')
+            
+                if os.path.exists(current_state.report_path):
+                    logger.info(f"보고서 생성 확인됨: {current_state.report_path} (TXT)")
+                    console(f"\n보고서가 생성되었습니다:")
+                    console(f"- TXT: {current_state.report_path}")
                 
-                if os.path.exists(pdf_path):
-                    logger.info(f"PDF 보고서 확인됨: {pdf_path}")
-                    print(f"- PDF: {pdf_path}")
+                    if os.path.exists(pdf_path):
+                        logger.info(f"PDF 보고서 확인됨: {pdf_path}")
+                        console(f"- PDF: {pdf_path}")
+                    else:
+                        logger.warning(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
                 else:
-                    logger.warning(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
+                    logger.warning(f"TXT 파일을 찾을 수 없습니다: {current_state.report_path}")
+                    console("\n보고서 파일을 찾을 수 없습니다.")
             else:
-                logger.warning(f"TXT 파일을 찾을 수 없습니다: {current_state.report_path}")
-                print("\n보고서 파일을 찾을 수 없습니다.")
-        else:
-            logger.warning("보고서 경로가 설정되지 않았습니다.")
-            print("\n보고서 생성에 실패했습니다.")
-        
-        # 최종 상태 저장
-        final_state_path = current_state.save_state()
-        logger.info(f"최종 상태 저장 완료: {final_state_path}")
-        
-        return 0
+                logger.warning("보고서 경로가 설정되지 않았습니다.")
+                console("\n보고서 생성에 실패했습니다.")
+            
+            # 최종 상태 저장 (저널에 마지막 변경 기록 후 스냅샷 1개 저장)
+            journal.append(current_state, node="end")
+            final_state_path = current_state.save_state()
+            logger.info(f"최종 상태 저장 완료: {final_state_path}")
+            
+            logger.info(f"HTTP 연결 풀 통계: {get_pool_metrics()}")
+            
+            # 실행 이력 갱신
+            run_registry.finish_run(
+                current_state,
+                status="completed" if current_state.report_path else "failed",
+                pdf_path=pdf_path if pdf_path and os.path.exists(pdf_path) else None,
+                state_path=final_state_path
+            )
+            
+            return 0
     
     except Exception as e:
         logger.error(f"시스템 실행 중 오류 발생: {e}")
-        print(f"오류 발생: {e}")
+        console(f"오류 발생: {e}")
+        if run_registry is not None and current_state is not None:
+            try:
+                run_registry.finish_run(current_state, status="failed", error=str(e))
+            except Exception as registry_error:
+                logger.error(f"실행 이력 갱신 실패: {registry_error}")
         return 1
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+import os
+import argparse
+import sqlite3
+from src.core.run_registry import RunRegistry, cleanup_artifacts
+
+LIST_COLUMNS = ("workflow_id", "ai_service", "criteria", "status", "started_at", "duration_seconds", "report_path")
+
+def print_runs(runs):
+    """실행 목록을 표 형식으로 출력합니다."""
+    if not runs:
+        print("조건에 맞는 실행이 없습니다.")
+        return
+    rows = [[("" if run[column] is None else str(run[column])) for column in LIST_COLUMNS] for run in runs]
+    widths = [max(len(column), *(len(row[i]) for row in rows)) for i, column in enumerate(LIST_COLUMNS)]
+    print("  ".join(column.ljust(widths[i]) for i, column in enumerate(LIST_COLUMNS)))
+    for row in rows:
+        print("  ".join(value.ljust(widths[i]) for i, value in enumerate(row)))
+
+def print_run(run):
+    """실행 1건의 상세 정보를 출력합니다."""
+    for key, value in run.items():
+        if key in ("keywords", "timings"):
+            continue
+        print(f"{key}: {'' if value is None else value}")
+    print(f"keywords: {', '.join(run['keywords'])}")
+    print("timings:")
+    for node, seconds in run["timings"]:
+        print(f"  - {node}: {seconds:.2f}s")
+
+def main():
+    """실행 이력 조회 스크립트"""
+    parser = argparse.ArgumentParser(description="AI 윤리성 리스크 진단 실행 이력 조회")
+    parser.add_argument("--db", type=str, default=os.getenv("RUN_REGISTRY_DB_PATH"), help="실행 이력 DB 경로 (기본값: <ARTIFACT_ROOT>/runs/runs.db)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="실행 목록 조회")
+    list_parser.add_argument("--service", "-s", type=str, help="AI 서비스 이름 (대소문자 무시)")
+    list_parser.add_argument("--criteria", "-c", type=str, help="윤리 기준")
+    list_parser.add_argument("--status", type=str, choices=["processing", "completed", "failed"], help="실행 상태")
+    list_parser.add_argument("--keyword", "-k", type=str, help="윤리적 리스크 키워드")
+    list_parser.add_argument("--limit", "-n", type=int, default=20, help="최대 조회 건수")
+
+    show_parser = subparsers.add_parser("show", help="실행 상세 조회")
+    show_parser.add_argument("workflow_id", type=str, help="워크플로우 ID")
+
+    latest_parser = subparsers.add_parser("latest", help="서비스의 최신 완료 실행 조회")
+    latest_parser.add_argument("--service", "-s", type=str, required=True, help="AI 서비스 이름")
+    latest_parser.add_argument("--criteria", "-c", type=str, help="윤리 기준")
+
+    cleanup_parser = subparsers.add_parser("cleanup", help="보존 기간이 지난 보고서/상태/저널/로그/blob/잠금 파일 삭제 (실행 이력의 산출물 경로도 정리)")
+    cleanup_parser.add_argument("--days", type=int, help="보존 기간(일), 기본값: ARTIFACT_RETENTION_DAYS")
+
+    args = parser.parse_args()
+
+    if args.command == "cleanup":
+        removed = cleanup_artifacts(retention_days=args.days, db_path=args.db)
+        print(f"삭제된 산출물: {removed}개")
+        return 0
+
+    try:
+        registry = RunRegistry(args.db)
+    except sqlite3.Error as e:
+        print(f"실행 이력 DB를 열 수 없습니다: {e}")
+        return 1
+
+    if args.command == "list":
+        print_runs(registry.list_runs(
+            service=args.service,
+            criteria=args.criteria,
+            status=args.status,
+            keyword=args.keyword,
+            limit=args.limit
+        ))
+    elif args.command == "show":
+        run = registry.get_run(args.workflow_id)
+        if run is None:
+            print(f"실행을 찾을 수 없습니다: {args.workflow_id}")
+            return 1
+        print_run(run)
+    elif args.command == "latest":
+        run = registry.latest_run(args.service, criteria=args.criteria)
+        if run is None:
+            print(f"완료된 실행이 없습니다: {args.service}")
+            return 1
+        print_run(registry.get_run(run["workflow_id"]))
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    exit(exit_code)
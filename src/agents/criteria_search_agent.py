@@ -4,10 +4,15 @@ from typing import Dict, Any, Optional, List
 from typing_extensions import TypedDict
 from langgraph.prebuilt import ToolNode
 import asyncio
+import os
+import time
 
-from ..prompts import criteria_search_prompt
-from ..tools.ethics_retriever import create_ethics_retriever_tool
+from ..prompts import criteria_search_prompt, criteria_analysis_en_prompt
+from ..tools.ethics_retriever import create_ethics_retriever_tool, create_multi_query_retriever_tool, create_parent_fetch_tool
 from ..tools.web_search import create_web_search_tool
+from ..tools.evidence import EvidenceThresholds, score_evidence, normalize_query, merge_evidence, format_evidence
+from ..utils.logger import console
+from ..utils.model_router import for_task, TRANSLATE, REWRITE, EXTRACT, ANALYSE
 
 class CriteriaSearchAgentState(TypedDict):
     """기준 검색 에이전트의 상태를 정의하는 타입"""
@@ -18,13 +23,80 @@ class CriteriaSearchAgentState(TypedDict):
     criteria_info: Optional[AIMessage]
     query_attempt: Optional[int]
     last_query: Optional[str]
+    tried_queries: Optional[List[str]]
+    evidence_pool: Optional[List[Dict[str, Any]]]
+    search_keywords: Optional[List[str]]
+    search_elapsed: Optional[float]
+    english_keywords: Optional[List[str]]
 
-def create_criteria_search_agent(llm, vector_db):
-    """기준 검색 에이전트를 생성합니다."""
+# 기준 검색 분석 결과 형식 (벡터 DB, 웹 검색, 지식 베이스 맞춤화 호출 공통)
+CRITERIA_SECTIONS = """
+            ### AI 서비스 분류
+            [EU AI Act 기준으로 해당 서비스의 위험 분류 및 근거]
+            
+            ### 적용 조항 및 부록
+            [서비스에 직접 적용되는 EU AI Act의 조항과 부록 번호]
+            출처: [정보 출처]
+            
+            ### 주요 의무사항
+            [서비스가 준수해야 할 구체적인 요구사항]
+            출처: [정보 출처]
+            
+            ### 기술적 요구사항
+            [구현 시 고려해야 할 기술적 요구사항]
+            출처: [정보 출처]
+            
+            ### 문서화 및 투명성 요구사항
+            [필요한 문서화 및 투명성 관련 요구사항]
+            출처: [정보 출처]
+            
+            ### 평가 및 감독 체계
+            [서비스 평가 및 감독 관련 요구사항]
+            출처: [정보 출처]
+"""
+
+def create_criteria_search_agent(llm, vector_db, framework_kbs=None, evidence_thresholds=None, max_attempts=None, latency_budget=None, translate_queries=True, intermediate_language="ko", kb_fast_path=None):
+    """기준 검색 에이전트를 생성합니다.
+    
+    framework_kbs(프레임워크 이름 -> FrameworkKB)가 주어지면 위험 등급 후보, Annex III 영역, 관련 조항을
+    사전 구축된 지식 베이스에서 조회합니다. 지식 베이스가 서비스 설명의 표현으로 위험 등급을 분류하면
+    (kb_fast_path, CRITERIA_KB_FAST_PATH 기본 true) 쿼리 생성, 다중 쿼리 벡터 검색, 웹 검색을 건너뛰고
+    지식 베이스 요약만으로 짧은 맞춤화 호출 1회를 수행합니다. 분류되지 않으면 검색 근거 분석 프롬프트에 요약을 덧붙입니다.
+    웹 검색은 벡터 DB 근거가 evidence_thresholds(기본값: 환경 변수) 기준에 못 미칠 때만 수행합니다.
+    
+    근거가 부족하면 criteria_info 없이 query_attempt를 올려 반환하고, 워크플로우가 이 노드를 다시 실행합니다.
+    재시도는 누적 근거 풀과 이미 시도한 쿼리를 상태로 이어받아 새 쿼리의 근거만 추가로 가져오며,
+    max_attempts(CRITERIA_SEARCH_MAX_ATTEMPTS)회 또는 latency_budget(CRITERIA_SEARCH_BUDGET_SECONDS)초를 넘기면
+    그때까지 누적된 근거로 분석합니다.
+    
+    llm이 모델 라우터이면 키워드 번역, 쿼리 생성/리라이팅, 검색 결과 압축은 작은 등급 모델을,
+    기준 분석은 analyse 등급 모델을 사용합니다.
+    
+    translate_queries=False(다국어 임베딩 인덱스)이면 첫 검색에서 키워드 번역과 쿼리 생성 호출 없이
+    한국어 키워드와 서비스 이름으로 영어 규제 문서를 바로 검색합니다.
+    
+    intermediate_language="en"이면 영어 검색 근거를 한국어로 옮기지 않고 간결한 구조화 영어 근거로 정리합니다.
+    검색에 영어 키워드를 썼거나 영어 모드이면 이후 단계가 사용할 영어 리스크 키워드(english_keywords)를 함께 반환합니다.
+    """
     logger.info("기준 검색 에이전트 생성 중...")
+    evidence_thresholds = evidence_thresholds or EvidenceThresholds.from_env()
+    max_attempts = max_attempts or int(os.getenv("CRITERIA_SEARCH_MAX_ATTEMPTS", "3"))
+    latency_budget = latency_budget or float(os.getenv("CRITERIA_SEARCH_BUDGET_SECONDS", "90"))
+    if kb_fast_path is None:
+        kb_fast_path = os.getenv("CRITERIA_KB_FAST_PATH", "true").lower() in ("1", "true", "yes")
+    
+    # 호출 지점별 모델
+    translate_llm = for_task(llm, TRANSLATE)
+    rewrite_llm = for_task(llm, REWRITE)
+    analysis_llm = for_task(llm, ANALYSE)
     
-    # 윤리 기준 검색 도구 생성 - 동일한 임베딩 모델 사용 확인
-    ethics_retriever_tool = create_ethics_retriever_tool(vector_db, llm)
+    # 윤리 기준 검색 도구 생성 - 동일한 임베딩 모델 사용 확인 (검색 결과 압축은 extract 등급)
+    ethics_retriever_tool = create_ethics_retriever_tool(vector_db, for_task(llm, EXTRACT))
+    
+    # 다중 쿼리 배치 검색 도구 생성 (N개 쿼리를 한 번에 임베딩/검색)
+    multi_query_retriever_tool = create_multi_query_retriever_tool(vector_db)
+    # 청크 근거가 부족할 때 소속 조항 전체를 가져오는 도구 (LLM 호출 없음)
+    parent_fetch_tool = create_parent_fetch_tool(vector_db)
     
     # 웹 검색 도구 생성
     web_search_tool = create_web_search_tool()
@@ -38,6 +110,17 @@ def create_criteria_search_agent(llm, vector_db):
         tools=[web_search_tool]
     )
     
+    def translate_keywords(keywords):
+        """윤리적 리스크 키워드를 영어로 일괄 번역합니다 (translate 등급 모델, 호출 1회)."""
+        translate_keywords_prompt = f"""
+        다음 윤리적 리스크 키워드를 영어로 번역해주세요:
+        {', '.join(keywords[:10])}
+        
+        번역된 영어 키워드만 쉼표로 구분하여 응답해주세요.
+        """
+        translate_response = translate_llm.invoke(translate_keywords_prompt)
+        return [kw.strip() for kw in translate_response.content.split(',') if kw.strip()]
+    
     # 비동기 함수를 동기적으로 실행하는 헬퍼 함수
     def run_async(coro):
         try:
@@ -49,7 +132,7 @@ def create_criteria_search_agent(llm, vector_db):
     def criteria_search_node(state):
         """기준 검색을 처리하는 노드"""
         try:
-            print("기준 검색 노드 실행 중...")
+            console("기준 검색 노드 실행 중...")
             # 서비스 정보 확인
             if not hasattr(state, "service_info") or state.service_info is None:
                 logger.warning("서비스 정보가 없습니다. 기준 검색을 건너뜁니다.")
@@ -62,22 +145,107 @@ def create_criteria_search_agent(llm, vector_db):
             else:
                 logger.warning("윤리적 리스크 키워드가 없습니다. 서비스 정보만 사용합니다.")
             
-            # 쿼리 시도 횟수 초기화
+            # 재시도 상태 (시도 횟수, 누적 근거 풀, 이미 시도한 쿼리, 사용한 시간)
+            started = time.perf_counter()
             query_attempt = getattr(state, "query_attempt", 0)
+            evidence_pool = list(getattr(state, "evidence_pool", None) or [])
+            tried_queries = list(getattr(state, "tried_queries", None) or [])
+            search_elapsed = getattr(state, "search_elapsed", 0.0) or 0.0
+            
+            def finished(criteria_info):
+                """검색을 마친 결과 (재시도 상태 초기화)"""
+                result = {
+                    "criteria_info": criteria_info,
+                    "query_attempt": 0,
+                    "last_query": last_query,
+                    "tried_queries": [],
+                    "evidence_pool": [],
+                    "search_keywords": None,
+                    "search_elapsed": 0.0
+                }
+                if has_keywords and (english_keywords or intermediate_language == "en"):
+                    # 검색에 쓴 영어 키워드를 윤리 평가(키워드 x 조항 매핑, 영어 모드 평가)에 넘김
+                    # (영어 중간 산출물 모드에서 다국어 인덱스라 번역하지 않았으면 여기서 1회 번역)
+                    result["english_keywords"] = english_keywords or translate_keywords(state.ethical_risk_keywords)
+                return result
+            
+            def analyse_in_english(entries, source):
+                """검색 근거를 간결한 구조화 영어 근거로 정리합니다 (한국어 번역 없음)."""
+                kb_note = (
+                    f"\nPre-built {state.criteria} knowledge base (risk tier candidates and related provisions). "
+                    f"Base the classification and provision numbers on this list:\n{kb_context}\n"
+                ) if kb_context else ""
+                return analysis_llm.invoke(criteria_analysis_en_prompt.format(
+                    ai_service=state.ai_service,
+                    criteria=state.criteria,
+                    source=source,
+                    evidence=format_evidence(entries),
+                    kb_context=kb_note
+                ))
+            
+            def tailor_from_kb(kb_context):
+                """지식 베이스 요약만으로 서비스 맞춤 기준 정리를 생성합니다 (검색 근거 없음, 짧은 호출 1회)."""
+                if intermediate_language == "en":
+                    return analysis_llm.invoke(criteria_analysis_en_prompt.format(
+                        ai_service=state.ai_service,
+                        criteria=state.criteria,
+                        source=f"pre-built {state.criteria} knowledge base",
+                        evidence=kb_context,
+                        kb_context=""
+                    ))
+                tailoring_prompt = f"""
+            다음은 사전 구축된 '{state.criteria}' 지식 베이스에서 '{state.ai_service}'에 대해 조회한 위험 등급 후보와 관련 조항입니다:
+            
+            {kb_context}
+            
+            서비스 정보:
+            {state.service_info.content[:1500]}
+            
+            이 목록만을 근거로 서비스에 해당하는 위험 분류와 적용 조항을 판단하여 한국어로 간결하게 정리해주세요.
+            각 항목은 핵심만 2~4개 글머리표로 작성하고, 다음 형식에 맞추어 응답해 주세요:
+            {CRITERIA_SECTIONS}
+            출처는 조항/부록 번호로 표시해주세요. 예: "출처: EU AI Act 제6조", "출처: EU AI Act 부록 III"
+            """
+                return analysis_llm.invoke(tailoring_prompt)
+            
+            # 메타데이터에 맞게 프레임워크 이름 변환
+            framework_mapping = {
+                "EU AI Act": "EU_AI_Act", 
+                "UNESCO AI Ethics": "UNESCO_AI_Ethics",
+                "OECD AI Principles": "OECD_AI_Principles"
+            }
+            framework = framework_mapping.get(state.criteria, state.criteria)
+            framework_kb = (framework_kbs or {}).get(framework)
+            
+            # 초기 쿼리 또는 재시도 쿼리 (재시도 시 첫 시도에서 번역한 영어 키워드 재사용)
+            english_keywords = list(getattr(state, "search_keywords", None) or []) if query_attempt > 0 else []
+            last_query = getattr(state, "last_query", None)
+            
+            if kb_fast_path and query_attempt == 0 and framework_kb is not None:
+                # 지식 베이스가 서비스 설명의 표현으로 위험 등급을 분류하면 검색 없이 맞춤화 호출만 수행
+                service_text = f"{state.ai_service}\n{state.service_info.content}\n{' '.join(state.ethical_risk_keywords or [])}"
+                classified = [candidate for candidate in framework_kb.classify(service_text) if candidate["matched"]]
+                if classified:
+                    if has_keywords and (translate_queries or intermediate_language == "en"):
+                        english_keywords = translate_keywords(state.ethical_risk_keywords)
+                    lookup_terms = (english_keywords or list(state.ethical_risk_keywords)) if has_keywords else []
+                    kb_context = framework_kb.tailoring_context(f"{service_text}\n{' '.join(lookup_terms)}", keywords=lookup_terms)
+                    logger.info(f"지식 베이스 위험 등급 분류로 검색 생략: {[candidate['tier'] for candidate in classified]}")
+                    return finished(tailor_from_kb(kb_context))
             
-            # 초기 쿼리 또는 재시도 쿼리
-            if query_attempt == 0:
+            if query_attempt == 0 and not translate_queries:
+                # 다국어 임베딩 인덱스: 한국어 쿼리로 영어 문서를 바로 검색 (번역/쿼리 생성 LLM 호출 없음)
+                # 근거(영어)와 키워드(한국어)의 언어가 다르므로 키워드 포함 비율은 충분성 평가에서 제외됨
+                if has_keywords:
+                    last_query = f"{state.ai_service} {' '.join(state.ethical_risk_keywords[:5])} {state.criteria} 규제 요구사항"
+                else:
+                    last_query = f"{state.ai_service} {state.criteria} 위험 분류 및 규제 요구사항"
+                logger.info(f"다국어 검색 쿼리 구성: {last_query}")
+            elif query_attempt == 0:
                 # 키워드 기반 검색 쿼리 준비
                 if has_keywords:
                     # 영어 검색 쿼리 생성
-                    translate_keywords_prompt = f"""
-                    다음 윤리적 리스크 키워드를 영어로 번역해주세요:
-                    {', '.join(state.ethical_risk_keywords[:10])}
-                    
-                    번역된 영어 키워드만 쉼표로 구분하여 응답해주세요.
-                    """
-                    translate_response = llm.invoke(translate_keywords_prompt)
-                    english_keywords = [kw.strip() for kw in translate_response.content.split(',')]
+                    english_keywords = translate_keywords(state.ethical_risk_keywords)
                     
                     # 영어 키워드 중에서 가장 관련성 높은 키워드 선택
                     keywords_selection_prompt = f"""
@@ -87,7 +255,7 @@ def create_criteria_search_agent(llm, vector_db):
                     '{state.criteria}' 관련 규제 문서를 검색하기에 가장 적합한 키워드 5개를 선택하고, 
                     효과적인 검색 쿼리로 조합해주세요. 검색 쿼리만 응답해주세요.
                     """
-                    query_response = llm.invoke(keywords_selection_prompt)
+                    query_response = rewrite_llm.invoke(keywords_selection_prompt)
                     last_query = query_response.content.strip()
                 else:
                     # 서비스 정보만 사용하여 쿼리 생성
@@ -111,172 +279,225 @@ def create_criteria_search_agent(llm, vector_db):
                     영어로 된 검색 쿼리만 작성해주세요. 추가 설명 없이 쿼리만 응답하세요.
                     """
                     
-                    english_query_response = llm.invoke(translate_prompt)
+                    english_query_response = rewrite_llm.invoke(translate_prompt)
                     last_query = english_query_response.content.strip()
                 
                 logger.info(f"영어 검색 쿼리 생성: {last_query}")
             else:
-                # 쿼리 리라이팅을 위한 프롬프트 (영어로)
+                # 쿼리 리라이팅을 위한 프롬프트 (영어로, 이미 시도한 쿼리는 피하도록)
+                tried_list = "\n".join(f"- {query}" for query in tried_queries if not query.startswith("web:")) or "- None"
                 rewrite_prompt = f"""
                 The previous query '{getattr(state, "last_query", "")}' did not return adequate results.
                 Please rewrite a more effective query in English to search for ethical issues related to 
                 '{state.ai_service}' in the context of '{state.criteria}'.
                 
+                These queries were already tried. Write a query that covers different aspects or wording:
+                {tried_list}
+                
                 Consider these ethical risk keywords if available:
                 {', '.join(state.ethical_risk_keywords[:10]) if has_keywords else 'No keywords available'}
                 
                 Respond with only the new query in English, no additional explanation.
                 """
                 # 쿼리 리라이팅
-                rewrite_response = llm.invoke(rewrite_prompt)
+                rewrite_response = rewrite_llm.invoke(rewrite_prompt)
                 last_query = rewrite_response.content.strip()
                 logger.info(f"영어 쿼리 리라이팅: {last_query}")
                 
             # 윤리 기준 검색 (메타데이터 지정)
             logger.info(f"윤리 기준 검색 중: {last_query} (프레임워크: {state.criteria})")
             
-            # 메타데이터에 맞게 프레임워크 이름 변환
-            framework_mapping = {
-                "EU AI Act": "EU_AI_Act", 
-                "UNESCO AI Ethics": "UNESCO_AI_Ethics",
-                "OECD AI Principles": "OECD_AI_Principles"
-            }
-            framework = framework_mapping.get(state.criteria, state.criteria)
+            # 사전 구축된 프레임워크 지식 베이스 조회 (위험 등급, Annex III 영역, 관련 조항)
+            kb_context = ""
+            if framework_kb is not None:
+                lookup_terms = (english_keywords or list(state.ethical_risk_keywords)) if has_keywords else []
+                kb_context = framework_kb.tailoring_context(
+                    f"{state.ai_service}\n{state.service_info.content}\n{' '.join(lookup_terms)}",
+                    keywords=lookup_terms + [last_query]
+                )
+                logger.info(f"프레임워크 지식 베이스 조회 완료: {framework}")
+            kb_section = f"""
+            다음은 사전 구축된 '{state.criteria}' 지식 베이스에서 조회한 위험 등급 후보와 관련 조항입니다.
+            위험 분류와 조항/부록 번호는 이 목록을 기준으로 서비스에 맞게 판단하고 인용해주세요:
             
-            # 윤리 기준 검색 수행 (비동기 함수 동기적으로 실행)
-            search_results = []
+            {kb_context}
+            """ if kb_context else ""
             
+            # 윤리 기준 검색 수행 (비동기 함수 동기적으로 실행)
             try:
-                # 1. 먼저 키워드를 조합한 주 검색 쿼리 실행
-                ethics_result = run_async(ethics_retriever_tool(last_query, framework))
-                
-                # 검색 결과가 빈약하면 각 키워드로 개별 검색
-                if "could not find relevant" in ethics_result.content.lower() or len(ethics_result.content.strip()) < 100:
-                    if has_keywords:
-                        # 키워드별 개별 검색 시도
-                        for idx, keyword in enumerate(state.ethical_risk_keywords[:5]):  # 상위 5개 키워드만 사용
-                            translated_keyword_prompt = f"Translate this term to English for searching in regulatory documents: {keyword}"
-                            translated_response = llm.invoke(translated_keyword_prompt)
-                            eng_keyword = translated_response.content.strip()
-                            
-                            search_query = f"{eng_keyword} {state.ai_service} {framework} requirements"
-                            logger.info(f"키워드 개별 검색: {search_query}")
-                            
-                            keyword_result = run_async(ethics_retriever_tool(search_query, framework))
-                            if not "could not find relevant" in keyword_result.content.lower() and len(keyword_result.content.strip()) > 50:
-                                search_results.append(keyword_result.content)
-                                logger.info(f"키워드 '{keyword}' 검색 성공")
-                    
-                    # 추가 대체 쿼리 시도
-                    alternative_queries = [
-                        f"{state.ai_service} {framework} requirements",
-                        f"{state.ai_service} type classification in {framework}",
-                        f"obligations for {state.ai_service} under {framework}",
-                        f"{state.ai_service} risk assessment {framework}"
+                # 주 쿼리, 키워드별 쿼리, 대체 쿼리를 모아 한 번의 배치 벡터 검색으로 후보 근거를 모두 가져옴
+                candidate_queries = [last_query]
+                if has_keywords:
+                    # 첫 시도에서 일괄 번역된 영어 키워드를 재사용 (키워드별 번역 호출 없음)
+                    search_keywords = english_keywords if english_keywords else state.ethical_risk_keywords
+                    candidate_queries += [
+                        f"{keyword} {state.ai_service} {framework} requirements"
+                        for keyword in search_keywords[:5]  # 상위 5개 키워드만 사용
                     ]
-                    
-                    # 대체 쿼리 시도
-                    for alt_query in alternative_queries:
-                        if not search_results:  # 이미 결과가 있으면 건너뛰기
-                            logger.info(f"대체 쿼리로 검색 시도: {alt_query}")
-                            alt_result = run_async(ethics_retriever_tool(alt_query, framework))
-                            if not "could not find relevant" in alt_result.content.lower() and len(alt_result.content.strip()) > 100:
-                                ethics_result = alt_result
-                                last_query = alt_query
-                                logger.info(f"대체 쿼리 성공: {alt_query}")
-                                break
+                candidate_queries += [
+                    f"{state.ai_service} {framework} requirements",
+                    f"{state.ai_service} type classification in {framework}",
+                    f"obligations for {state.ai_service} under {framework}",
+                    f"{state.ai_service} risk assessment {framework}"
+                ]
+                
+                # 이전 시도에서 실행한 쿼리는 제외하고 새 쿼리의 근거만 가져옴
+                tried = set(tried_queries)
+                new_queries = list({
+                    normalize_query(query): query
+                    for query in candidate_queries
+                    if query and normalize_query(query) not in tried
+                }.values())
+                if new_queries:
+                    logger.info(f"다중 쿼리 검색: 새 쿼리 {len(new_queries)}개 (후보 {len(candidate_queries)}개)")
+                    ethics_result = run_async(multi_query_retriever_tool(new_queries, framework))
+                    if ethics_result.response_metadata.get("num_documents") is not None:
+                        tried_queries += [normalize_query(query) for query in new_queries]
+                    evidence_pool, added = merge_evidence(evidence_pool, ethics_result.response_metadata.get("passages") or [])
+                    logger.info(f"다중 쿼리 검색 완료: 새 근거 {added}개 (누적 {len(evidence_pool)}개)")
                 else:
-                    # 주 검색이 성공한 경우
-                    search_results.append(ethics_result.content)
+                    logger.info("새로 시도할 검색 쿼리가 없어 벡터 검색을 건너뜁니다.")
             except Exception as e:
                 logger.error(f"윤리 기준 검색 오류: {e}")
-                ethics_result = AIMessage(content=f"윤리 기준 검색 중 오류가 발생했습니다: {e}")
             
-            # 검색 결과 확인
-            if not search_results or len(search_results) < 100:
-                logger.warning(f"윤리 기준 검색 결과 부족")
+            # 근거 충분성 평가 (누적 근거의 길이, 검색 유사도, 영어 키워드 포함 비율) - 부족할 때만 웹 검색
+            coverage_keywords = english_keywords[:10]
+            def vector_evidence():
+                entries = [entry for entry in evidence_pool if entry["source"] == "vector"]
+                return entries, score_evidence(
+                    [entry["content"] for entry in entries],
+                    coverage_keywords,
+                    [entry["similarity"] for entry in entries if entry.get("similarity") is not None],
+                    evidence_thresholds
+                )
+            vector_entries, evidence = vector_evidence()
+            if not evidence.sufficient:
+                # 웹 검색 전에 상위 청크가 속한 조항/부록 전체로 근거를 넓혀 다시 평가
+                try:
+                    parents = parent_fetch_tool([entry for entry in vector_entries if not entry.get("expanded")])
+                except Exception as e:
+                    logger.error(f"상위 조항 확장 오류: {e}")
+                    parents = []
+                if parents:
+                    expanded = {entry["parent"] for entry in parents}
+                    evidence_pool = [entry for entry in evidence_pool if entry.get("expanded") or entry.get("parent") not in expanded]
+                    evidence_pool, _ = merge_evidence(evidence_pool, parents)
+                    vector_entries, evidence = vector_evidence()
+                    logger.info(f"상위 조항 확장 후 근거 평가: {evidence.summary()}")
+            if not evidence.sufficient:
+                logger.warning(f"윤리 기준 검색 결과 부족: {evidence.summary()}")
                 
                 # 웹 검색 수행
                 web_search_keywords = []
                 if has_keywords:
-                    # 키워드 기반 웹 검색 쿼리 생성
+                    # 키워드 기반 웹 검색 쿼리 생성 (시도마다 달라지는 규제 문서 검색 쿼리를 함께 제공)
                     translate_prompt = f"""
                     Create an effective English web search query about ethical regulations for this AI service:
                     Service: {state.ai_service}
                     Ethical Framework: {state.criteria}
                     Ethical risk keywords: {', '.join(state.ethical_risk_keywords[:7])}
+                    Current regulation search query: {last_query}
                     
                     Respond with only the search query.
                     """
-                    web_query_response = llm.invoke(translate_prompt)
+                    web_query_response = rewrite_llm.invoke(translate_prompt)
                     web_search_keywords.append(web_query_response.content.strip())
                 else:
                     # 기본 웹 검색 쿼리
                     web_search_keywords.append(f"{state.criteria} {state.ai_service} ethical requirements")
                 
-                web_results = []
                 for web_query in web_search_keywords:
+                    web_key = f"web:{normalize_query(web_query)}"
+                    if web_key in tried_queries:
+                        logger.info(f"이미 수행한 웹 검색 건너뜀: {web_query}")
+                        continue
                     logger.info(f"웹 검색 수행: {web_query}")
                     web_result = run_async(web_search_tool(web_query))
+                    tried_queries.append(web_key)
                     if len(web_result.content.strip()) > 100:
-                        web_results.append(web_result.content)
+                        evidence_pool, _ = merge_evidence(evidence_pool, [{
+                            "source": "web",
+                            "label": f"웹 검색: {web_query}",
+                            "content": web_result.content,
+                            "similarity": None
+                        }])
                 
-                # 웹 검색 결과도 부족한 경우
-                if not web_results or len(web_results) < 100:
-                    if query_attempt < 2:  # 최대 2번까지 재시도
-                        logger.info(f"웹 검색 결과도 부족, 쿼리 리라이팅 후 재시도 ({query_attempt + 1}/2)")
+                # 웹 검색 결과도 부족한 경우 (웹 결과는 유사도 없이 길이와 키워드 포함 비율로 평가)
+                web_entries = [entry for entry in evidence_pool if entry["source"] == "web"]
+                web_results = [entry["content"] for entry in web_entries]
+                web_evidence = score_evidence(web_results, coverage_keywords, thresholds=evidence_thresholds, min_chars=evidence_thresholds.min_web_chars)
+                if not web_evidence.sufficient:
+                    attempt_elapsed = time.perf_counter() - started
+                    elapsed = search_elapsed + attempt_elapsed
+                    # 다음 시도가 이번 시도만큼 걸린다고 보고 시간 예산 안에 끝날 때만 재시도
+                    if query_attempt + 1 < max_attempts and elapsed + attempt_elapsed <= latency_budget:
+                        logger.info(f"근거 부족, 새 쿼리로 재시도 ({query_attempt + 1}/{max_attempts - 1}, 누적 근거 {len(evidence_pool)}개, {elapsed:.1f}/{latency_budget:.0f}초)")
                         return {
-                            "criteria_info": AIMessage(content="관련 정보 없음"),
+                            "criteria_info": None,
                             "query_attempt": query_attempt + 1,
-                            "last_query": last_query
+                            "last_query": last_query,
+                            "tried_queries": tried_queries,
+                            "evidence_pool": evidence_pool,
+                            "search_keywords": english_keywords,
+                            "search_elapsed": elapsed
                         }
-                    else:
-                        logger.warning("최대 재시도 횟수 초과, 검색 실패")
-                        return {"criteria_info": AIMessage(content="충분한 관련 윤리 기준 정보를 찾을 수 없습니다.")}
-                
-                # 웹 검색 결과가 있는 경우, 이를 기반으로 응답 생성 (영어 -> 한국어 번역)
-                web_analysis_prompt = f"""
-                다음은 '{state.ai_service}'에 대한 '{state.criteria}' 관련 영어로 된 웹 검색 결과입니다:
-                
-                {web_results}
-                
-                이 정보를 바탕으로 AI 서비스에 적용 가능한 윤리 기준을 분석하여 한국어로 정리해주세요.
-                다음 형식에 맞추어 응답해 주세요:
-                
-                ### AI 서비스 분류
-                [EU AI Act 기준으로 해당 서비스의 위험 분류 및 근거]
-                
-                ### 적용 조항 및 부록
-                [서비스에 직접 적용되는 EU AI Act의 조항과 부록 번호]
-                출처: [정보 출처]
-                
-                ### 주요 의무사항
-                [서비스가 준수해야 할 구체적인 요구사항]
-                출처: [정보 출처]
-                
-                ### 기술적 요구사항
-                [구현 시 고려해야 할 기술적 요구사항]
-                출처: [정보 출처]
-                
-                ### 문서화 및 투명성 요구사항
-                [필요한 문서화 및 투명성 관련 요구사항]
-                출처: [정보 출처]
-                
-                ### 평가 및 감독 체계
-                [서비스 평가 및 감독 관련 요구사항]
-                출처: [정보 출처]
-                
-                모든 정보에 [출처: 웹 검색]을 표시해주세요.
-                """
-                criteria_response = llm.invoke(web_analysis_prompt)
-                return {"criteria_info": criteria_response, "query_attempt": 0, "last_query": last_query}
+                    if not evidence_pool:
+                        logger.warning("재시도 한도 또는 시간 예산 초과, 검색 실패")
+                        return finished(AIMessage(content="충분한 관련 윤리 기준 정보를 찾을 수 없습니다."))
+                    # 누적된 근거(벡터 DB + 웹)로 분석
+                    logger.warning(f"재시도 한도 또는 시간 예산 초과, 누적 근거 {len(evidence_pool)}개로 분석 ({elapsed:.1f}초)")
+                    vector_entries = evidence_pool
+                elif intermediate_language == "en":
+                    # 웹 검색 결과를 영어 그대로 구조화된 근거로 정리
+                    return finished(analyse_in_english(web_entries, "web search"))
+                else:
+                    # 웹 검색 결과가 있는 경우, 이를 기반으로 응답 생성 (영어 -> 한국어 번역)
+                    web_analysis_prompt = f"""
+                    다음은 '{state.ai_service}'에 대한 '{state.criteria}' 관련 영어로 된 웹 검색 결과입니다:
+                    
+                    {format_evidence(web_entries)}
+                    {kb_section}
+                    이 정보를 바탕으로 AI 서비스에 적용 가능한 윤리 기준을 분석하여 한국어로 정리해주세요.
+                    다음 형식에 맞추어 응답해 주세요:
+                    
+                    ### AI 서비스 분류
+                    [EU AI Act 기준으로 해당 서비스의 위험 분류 및 근거]
+                    
+                    ### 적용 조항 및 부록
+                    [서비스에 직접 적용되는 EU AI Act의 조항과 부록 번호]
+                    출처: [정보 출처]
+                    
+                    ### 주요 의무사항
+                    [서비스가 준수해야 할 구체적인 요구사항]
+                    출처: [정보 출처]
+                    
+                    ### 기술적 요구사항
+                    [구현 시 고려해야 할 기술적 요구사항]
+                    출처: [정보 출처]
+                    
+                    ### 문서화 및 투명성 요구사항
+                    [필요한 문서화 및 투명성 관련 요구사항]
+                    출처: [정보 출처]
+                    
+                    ### 평가 및 감독 체계
+                    [서비스 평가 및 감독 관련 요구사항]
+                    출처: [정보 출처]
+                    
+                    모든 정보에 [출처: 웹 검색]을 표시해주세요.
+                    """
+                    criteria_response = analysis_llm.invoke(web_analysis_prompt)
+                    return finished(criteria_response)
+            
+            if intermediate_language == "en":
+                # 벡터DB 검색 결과를 영어 그대로 구조화된 근거로 정리
+                return finished(analyse_in_english(vector_entries, "regulation search"))
             
             # 벡터DB 검색 결과가 있는 경우, 이를 기반으로 응답 생성 (영어 -> 한국어 번역)
             criteria_analysis_prompt = f"""
             다음은 '{state.ai_service}'에 대한 '{state.criteria}' 관련 영어로 된 윤리 기준 검색 결과입니다:
             
-            {search_results}
-            
+            {format_evidence(vector_entries)}
+            {kb_section}
             이 정보를 바탕으로 AI 서비스에 적용 가능한 윤리 기준을 분석하여 한국어로 정리해주세요.
             다음 형식에 맞추어 응답해 주세요:
             
@@ -305,8 +526,8 @@ def create_criteria_search_agent(llm, vector_db):
             
             모든 정보의 출처를 명확히 표시해주세요. 예: "출처: EU AI Act 제6조", "출처: EU AI Act 부록 III"
             """
-            criteria_response = llm.invoke(criteria_analysis_prompt)
-            return {"criteria_info": criteria_response, "query_attempt": 0, "last_query": last_query}
+            criteria_response = analysis_llm.invoke(criteria_analysis_prompt)
+            return finished(criteria_response)
             
         except Exception as e:
             logger.error(f"기준 검색 처리 중 오류 발생: {e}")
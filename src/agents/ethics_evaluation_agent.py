@@ -3,7 +3,11 @@ from langchain_core.messages import AIMessage
 from typing import Optional, List
 from typing_extensions import TypedDict
 
-from ..prompts import ethics_evaluation_prompt
+from ..prompts import ethics_evaluation_prompt, ethics_evaluation_en_prompt
+from ..tools.keyword_relevance import format_keyword_evidence
+from ..tools.quality import QualityScorer
+from ..utils.logger import console
+from ..utils.model_router import for_task, ANALYSE
 
 class EthicsEvaluationAgentState(TypedDict):
     """윤리 평가 에이전트의 상태를 정의하는 타입"""
@@ -13,15 +17,24 @@ class EthicsEvaluationAgentState(TypedDict):
     ethical_risk_keywords: Optional[List[str]]  # 윤리적 리스크 키워드 추가
     criteria_info: Optional[AIMessage]
     risk_message: Optional[AIMessage]
+    english_keywords: Optional[List[str]]
 
-def create_ethics_evaluation_agent(llm):
-    """윤리 평가 에이전트를 생성합니다."""
+def create_ethics_evaluation_agent(llm, keyword_relevance=None, quality_scorer=None, intermediate_language="ko"):
+    """윤리 평가 에이전트를 생성합니다.
+    
+    keyword_relevance(KeywordArticleRelevance)가 주어지면 키워드별 근거 조항을 임베딩 유사도로 미리 선택하여
+    프롬프트에 넣습니다. 검증 호출은 quality_scorer(QualityScorer)의 품질 평가가 기준에 못 미칠 때만 수행합니다.
+    
+    intermediate_language="en"이면 영어 기준 정보와 영어 키워드로 간결한 구조화 영어 평가를 작성합니다.
+    """
     logger.info("윤리 평가 에이전트 생성 중...")
+    llm = for_task(llm, ANALYSE)
+    quality_scorer = quality_scorer or QualityScorer()
     
     def ethics_evaluation_node(state):
         """윤리 평가를 처리하는 노드"""
         try:
-            print("윤리 평가 노드 실행 중...")
+            console("윤리 평가 노드 실행 중...")
             # 필요한 정보 확인
             if not hasattr(state, "service_info") or state.service_info is None:
                 logger.warning("서비스 정보가 없습니다. 윤리 평가를 건너뜁니다.")
@@ -36,12 +49,34 @@ def create_ethics_evaluation_agent(llm):
             keywords_text = ", ".join(state.ethical_risk_keywords) if has_keywords else "윤리적 리스크 키워드 없음"
             logger.info(f"윤리적 리스크 키워드: {keywords_text}")
             
+            # 영어 중간 산출물 모드에서는 기준 검색 단계가 넘긴 영어 키워드로 근거 조항 선택, 평가, 품질 점검
+            english = intermediate_language == "en"
+            keywords = state.ethical_risk_keywords if has_keywords else []
+            if english and getattr(state, "english_keywords", None):
+                keywords = state.english_keywords
+                keywords_text = ", ".join(keywords)
+            
+            # 키워드 x 조항 유사도 행렬로 키워드별 근거 조항 선택 (영어 조항과 비교하므로 영어 키워드 사용,
+            # 영어 키워드가 없으면 다국어 임베딩 모델일 때만 한국어 키워드로 매핑)
+            keyword_evidence = {}
+            if keyword_relevance is not None and has_keywords:
+                mapping_keywords = getattr(state, "english_keywords", None) or (keywords if keyword_relevance.multilingual else [])
+                if not mapping_keywords:
+                    logger.info("영어 키워드가 없고 영어 전용 임베딩 모델이므로 키워드별 근거 조항 선택을 건너뜁니다.")
+                else:
+                    try:
+                        keyword_evidence = keyword_relevance.keyword_evidence(state.criteria, mapping_keywords)
+                        logger.info(f"키워드별 근거 조항 선택 완료: {len(keyword_evidence)}개 키워드")
+                    except Exception as e:
+                        logger.error(f"키워드별 근거 조항 선택 실패: {e}")
+            
             # 프롬프트 준비 (키워드 포함)
-            formatted_prompt = ethics_evaluation_prompt.format(
+            formatted_prompt = (ethics_evaluation_en_prompt if english else ethics_evaluation_prompt).format(
                 ai_service=state.ai_service,
                 criteria=state.criteria,
                 service_info=state.service_info.content,
                 ethical_risk_keywords=keywords_text,
+                keyword_evidence=format_keyword_evidence(keyword_evidence),
                 criteria_info=state.criteria_info.content
             )
             
@@ -50,21 +85,37 @@ def create_ethics_evaluation_agent(llm):
             response = llm.invoke(formatted_prompt)
             logger.info("윤리 평가 완료")
             
-            # 리스크 평가가 적절히 수행되었는지 검증
+            # 섹션 구조, 인용 수, 키워드 포함 비율이 품질 기준을 충족하면 검증 호출 생략
+            language = "en" if english else "ko"
+            quality = quality_scorer.score("risk_message", response.content, keywords, language)
+            if quality.passed:
+                logger.info("윤리 평가가 품질 기준을 충족하여 검증을 생략합니다.")
+                return {"risk_message": response}
+            
+            # 품질 평가에서 발견된 부족한 점을 보완하도록 검증
             verification_prompt = f"""
             당신의 윤리 평가 결과를 검토하여 다음 사항을 확인해주세요:
             
-            1. 다음 윤리적 리스크 키워드가 모두 적절히 다루어졌는지: {keywords_text}
+            1. 다음 윤리적 리스크 키워드가 모두 적절히 다루어졌는지: {", ".join(quality.missing_keywords) or keywords_text}
             2. 모든 주장에 윤리 기준의 출처와 조항이 명확히 연결되었는지
             3. 서비스 특성에 맞는 구체적인 평가가 제공되었는지
             
+            자동 점검에서 발견된 부족한 점:
+            {quality.feedback()}
+            
             누락된 부분이 있다면 보완하여 완전한 평가를 제공해주세요.
             결과만 응답하고, 검증 과정에 대한 설명은 포함하지 마세요.
             """
+            if english:
+                verification_prompt += "\n기존 평가와 같은 영어 구조화 형식(섹션 제목 포함)을 유지하여 영어로 작성하세요.\n"
             
             verified_response = llm.invoke(response.content + "\n\n" + verification_prompt)
             logger.info("윤리 평가 검증 완료")
             
+            # 검증 결과가 오히려 나빠졌으면 원래 평가 사용
+            if quality_scorer.score("risk_message", verified_response.content, keywords, language).score < quality.score:
+                logger.warning("검증 결과의 품질 점수가 더 낮아 원래 평가를 사용합니다.")
+                return {"risk_message": response}
             return {"risk_message": verified_response}
         except Exception as e:
             logger.error(f"윤리 평가 처리 중 오류 발생: {e}")
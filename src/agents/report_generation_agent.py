@@ -3,8 +3,11 @@ from langchain_core.messages import AIMessage
 from typing import Optional, List
 from typing_extensions import TypedDict
 import datetime
-from ..prompts import report_generation_prompt
+from ..prompts import report_generation_prompt, report_from_english_prompt
+from ..tools.quality import QualityScorer
 from ..utils import save_report
+from ..utils.logger import console, log_payload
+from ..utils.model_router import for_task, WRITE
 
 class ReportGenerationAgentState(TypedDict):
     """보고서 생성 에이전트의 상태를 정의하는 타입"""
@@ -16,15 +19,21 @@ class ReportGenerationAgentState(TypedDict):
     risk_message: Optional[AIMessage]
     report_path: Optional[str]
 
-def create_report_generation_agent(llm):
-    """보고서 생성 에이전트를 생성합니다."""
+def create_report_generation_agent(llm, quality_scorer=None, intermediate_language="ko"):
+    """보고서 생성 에이전트를 생성합니다.
+    
+    검증/개선 호출은 quality_scorer(QualityScorer)의 보고서 품질 평가가 기준에 못 미칠 때만 수행합니다.
+    intermediate_language="en"이면 영어로 작성된 기준 정보와 윤리 평가 결과를 이 단계에서 한 번만 한국어로 옮깁니다.
+    """
     logger.info("보고서 생성 에이전트 생성 중...")
+    llm = for_task(llm, WRITE)
+    quality_scorer = quality_scorer or QualityScorer()
     
     # 보고서 생성 처리 노드 생성
     def report_generation_node(state):
         """보고서 생성을 처리하는 노드"""
         try:
-            print("보고서 생성 노드 실행 중...")
+            console("보고서 생성 노드 실행 중...")
             # 입력 정보 확인
             if (not hasattr(state, "service_info") or state.service_info is None or
                 not hasattr(state, "criteria_info") or state.criteria_info is None or
@@ -39,7 +48,8 @@ def create_report_generation_agent(llm):
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             
             # 프롬프트 준비 (키워드 포함)
-            formatted_prompt = report_generation_prompt.format(
+            prompt = report_from_english_prompt if intermediate_language == "en" else report_generation_prompt
+            formatted_prompt = prompt.format(
                 ai_service=state.ai_service,
                 criteria=state.criteria,
                 ethical_risk_keywords=keywords_text,
@@ -68,51 +78,62 @@ def create_report_generation_agent(llm):
                 적용 가능한 윤리 기준: {state.criteria_info.content}
                 윤리 평가 결과: {state.risk_message.content}
                 """
+                if intermediate_language == "en":
+                    retry_prompt += "\n적용 가능한 윤리 기준과 윤리 평가 결과는 영어 요약입니다. 보고서는 한국어로 작성하세요.\n"
                 response = llm.invoke(retry_prompt)
                 logger.info("보고서 재생성 완료")
             
-            # 보고서 검증 준비 (키워드 기반 검증)
-            verification_prompt = f"""
-            당신은 AI 윤리성 리스크 진단 보고서의 검증자입니다. 다음 보고서를 검토하고, 보고서를 개선해야 합니다.
-            
-            검토 기준:
-            1. 모든 윤리적 리스크 키워드({keywords_text})가 보고서에서 적절히 다루어져야 합니다.
-            2. 모든 주장에 윤리 기준의 출처와 조항이 명확히 연결되어야 합니다.
-            3. 서비스 특성에 맞는 맞춤형 보고서여야 합니다.
-            4. 모든 섹션이 적절히 작성되어야 합니다.
-            
-            검토 후, 보고서 전체를 개선된 형태로 다시 작성해주세요. 검토 의견이나 설명 없이 
-            개선된 보고서 전체만 작성해주세요. 보고서는 반드시 '# AI 윤리성 리스크 진단 보고서:'로 시작해야 합니다.
-            
-            검토할 보고서:
-            {response.content}
-            """
-            
-            # 검증 및 개선된 보고서 생성
-            logger.info("보고서 검증 및 개선 중...")
-            verified_response = llm.invoke(verification_prompt)
-            
-            # 검증 결과 확인
-            if "# AI 윤리성 리스크 진단 보고서" not in verified_response.content:
-                logger.warning("검증 결과가 올바른 보고서 형식이 아닙니다. 원본 보고서를 사용합니다.")
-                final_content = response.content
+            # 섹션 구조, 인용 수, 키워드 포함 비율이 품질 기준을 충족하면 검증 호출 생략
+            keywords = state.ethical_risk_keywords if has_keywords else []
+            quality = quality_scorer.score("report", response.content, keywords)
+            final_content = response.content
+            if quality.passed:
+                logger.info("보고서가 품질 기준을 충족하여 검증을 생략합니다.")
             else:
-                logger.info("보고서 검증 및 개선 완료")
-                final_content = verified_response.content
+                # 보고서 검증 준비 (품질 평가에서 발견된 부족한 점 포함)
+                verification_prompt = f"""
+                당신은 AI 윤리성 리스크 진단 보고서의 검증자입니다. 다음 보고서를 검토하고, 보고서를 개선해야 합니다.
+                
+                검토 기준:
+                1. 모든 윤리적 리스크 키워드({keywords_text})가 보고서에서 적절히 다루어져야 합니다.
+                2. 모든 주장에 윤리 기준의 출처와 조항이 명확히 연결되어야 합니다.
+                3. 서비스 특성에 맞는 맞춤형 보고서여야 합니다.
+                4. 모든 섹션이 적절히 작성되어야 합니다.
+                
+                자동 점검에서 발견된 부족한 점:
+                {quality.feedback()}
+                
+                검토 후, 보고서 전체를 개선된 형태로 다시 작성해주세요. 검토 의견이나 설명 없이 
+                개선된 보고서 전체만 작성해주세요. 보고서는 반드시 '# AI 윤리성 리스크 진단 보고서:'로 시작해야 합니다.
+                
+                검토할 보고서:
+                {response.content}
+                """
+                
+                # 검증 및 개선된 보고서 생성
+                logger.info("보고서 검증 및 개선 중...")
+                verified_response = llm.invoke(verification_prompt)
+                
+                # 검증 결과 확인 (형식이 맞지 않거나 품질 점수가 더 낮으면 원본 사용)
+                if "# AI 윤리성 리스크 진단 보고서" not in verified_response.content:
+                    logger.warning("검증 결과가 올바른 보고서 형식이 아닙니다. 원본 보고서를 사용합니다.")
+                elif quality_scorer.score("report", verified_response.content, keywords).score < quality.score:
+                    logger.warning("검증 결과의 품질 점수가 더 낮아 원본 보고서를 사용합니다.")
+                else:
+                    logger.info("보고서 검증 및 개선 완료")
+                    final_content = verified_response.content
             
-            # 로그에 일부 내용만 출력하여 로그 가독성 향상
-            content_preview = final_content[:300] + "..." if len(final_content) > 300 else final_content
-            logger.info(f"최종 보고서 내용(일부): {content_preview}")
+            # 보고서 내용은 길이만 기록하고 미리보기는 샘플링
+            log_payload("최종 보고서 내용", final_content, level="INFO")
             
             # 보고서 저장
             try:
-                # 저장 경로 명시
-                save_directory = "outputs/reports"
+                # 산출물 루트의 날짜/실행 ID별 디렉토리에 저장
                 report_files = save_report(
                     content=final_content,
                     service_name=state.ai_service.replace(" ", "_"),
                     criteria=state.criteria.replace(" ", "_"),
-                    directory=save_directory
+                    run_id=state.workflow_id
                 )
                 
                 logger.info(f"보고서 저장 성공: {report_files['txt_path']}")
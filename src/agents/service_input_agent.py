@@ -8,6 +8,9 @@ import re
 
 from ..prompts import service_input_prompt
 from ..tools.web_search import create_web_search_tool
+from ..tools.keyword_extractor import normalize_keywords
+from ..utils.logger import console
+from ..utils.model_router import for_task, ANALYSE, EXTRACT
 
 class ServiceInputAgentState(TypedDict):
     """서비스 입력 에이전트의 상태를 정의하는 타입"""
@@ -15,9 +18,16 @@ class ServiceInputAgentState(TypedDict):
     service_info: Optional[AIMessage]
     ethical_risk_keywords: Optional[List[str]]
 
-def create_service_input_agent(llm):
-    """서비스 입력 에이전트를 생성합니다."""
+def create_service_input_agent(llm, keyword_extractor=None):
+    """서비스 입력 에이전트를 생성합니다.
+    
+    llm이 모델 라우터이면 서비스 분석은 analyse 등급, 키워드 추출 보조 호출은 extract 등급 모델을 사용합니다.
+    키워드 섹션이 없을 때는 keyword_extractor(KeywordExtractor)로 LLM 호출 없이 키워드를 추출하고,
+    추출기가 없거나 결과가 없을 때만 LLM으로 추출합니다.
+    """
     logger.info("서비스 입력 에이전트 생성 중...")
+    analysis_llm = for_task(llm, ANALYSE)
+    extract_llm = for_task(llm, EXTRACT)
     
     # 웹 검색 도구 생성
     web_search_tool = create_web_search_tool()
@@ -45,6 +55,15 @@ def create_service_input_agent(llm):
             # 키워드 섹션을 찾을 수 없는 경우, 전체 내용에서 잠재적 키워드 추출 시도
             logger.warning("윤리적 리스크 키워드 섹션을 찾을 수 없습니다. 내용 분석을 통해 키워드를 추출합니다.")
             
+            # 임베딩 기반 로컬 추출 (후보 구문 x 리스크 어휘 중심 벡터 유사도 + MMR)
+            if keyword_extractor is not None:
+                try:
+                    keywords = keyword_extractor.extract(content, top_n=15)
+                    if keywords:
+                        return keywords
+                except Exception as e:
+                    logger.error(f"임베딩 기반 키워드 추출 실패, LLM으로 추출합니다: {e}")
+            
             # 키워드 추출 프롬프트
             extract_prompt = f"""
             다음 AI 서비스 설명에서 윤리적 리스크와 관련된 핵심 키워드를 10-15개 추출해주세요.
@@ -54,7 +73,7 @@ def create_service_input_agent(llm):
             """
             
             # 키워드 추출을 위한 LLM 호출
-            extract_response = llm.invoke(extract_prompt)
+            extract_response = extract_llm.invoke(extract_prompt)
             keywords_raw = extract_response.content.strip()
         else:
             # 키워드 섹션이 발견된 경우
@@ -66,17 +85,14 @@ def create_service_input_agent(llm):
         # 쉼표로 구분된 키워드 리스트 생성
         keywords = [kw.strip() for kw in re.split(r'[,\n]', keywords_raw) if kw.strip()]
         
-        # 중복 제거 및 빈 키워드 제거
-        keywords = list(set(keywords))
-        keywords = [kw for kw in keywords if kw and len(kw) > 1]
-        
-        return keywords
+        # 표기 정규화, 순서를 유지한 중복 제거, 빈 키워드 제거
+        return normalize_keywords(keywords)
     
     # 서비스 입력 처리 노드 생성
     def service_input_node(state):
         """서비스 입력을 처리하는 노드"""
         try:
-            print("서비스 입력 노드 실행 중...")
+            console("서비스 입력 노드 실행 중...")
             logger.info(f"서비스 정보 수집 중: {state.ai_service}")
             
             # 프롬프트 준비
@@ -85,7 +101,7 @@ def create_service_input_agent(llm):
             )
             
             # LLM에 질의
-            response = llm.invoke(formatted_prompt)
+            response = analysis_llm.invoke(formatted_prompt)
             
             # 서비스 정보가 부족한 경우 웹 검색 수행
             if "분석할 수 없는 서비스" in response.content:
@@ -112,7 +128,7 @@ def create_service_input_agent(llm):
                     """
                     
                     # LLM에 통합된 프롬프트로 질의
-                    combined_response = llm.invoke(combined_prompt)
+                    combined_response = analysis_llm.invoke(combined_prompt)
                     logger.info("웹 검색 결과 기반으로 서비스 정보 업데이트")
                     
                     # 웹 검색 결과에서 키워드 추출
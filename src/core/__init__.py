@@ -1,19 +1,51 @@
-from .models import get_llm, get_embeddings
+from .models import get_llm, get_chat_model, get_model_router, get_embeddings
+from .local_llm import LocalChatModel, get_local_llm
 from .ethics_frameworks import (
-    create_or_load_faiss,
     create_documents,
-    load_ethics_frameworks_to_db
+    load_ethics_frameworks_to_db,
+    load_or_build_faiss,
+    framework_sources,
+    get_embedding_settings
 )
+from .ingestion import build_faiss_index, iter_chunks
+from .legal_chunker import LegalChunker
 from .state import EthicsState
-from .workflow import create_ethics_workflow, router
+from .workflow import create_ethics_workflow, router, route_after_criteria_search
+from .checkpoint import CheckpointStore
+from .stage_cache import StageCache
+from .state_journal import StateJournal, load_journal_state
+from .run_registry import RunRegistry, cleanup_artifacts
+from .framework_kb import FrameworkKB, load_framework_kbs
+from .events import WorkflowEvent, stream_workflow_events, run_with_events
 
 __all__ = [
     "get_llm", 
+    "get_chat_model", 
+    "get_model_router", 
+    "LocalChatModel", 
+    "get_local_llm", 
     "get_embeddings", 
-    "create_or_load_faiss", 
     "create_documents",
     "load_ethics_frameworks_to_db",
+    "load_or_build_faiss",
+    "framework_sources",
+    "build_faiss_index",
+    "iter_chunks",
+    "LegalChunker",
+    "get_embedding_settings",
     "EthicsState",
     "create_ethics_workflow",
-    "router"
+    "router",
+    "route_after_criteria_search",
+    "CheckpointStore",
+    "StageCache",
+    "StateJournal",
+    "load_journal_state",
+    "RunRegistry",
+    "cleanup_artifacts",
+    "FrameworkKB",
+    "load_framework_kbs",
+    "WorkflowEvent",
+    "stream_workflow_events",
+    "run_with_events"
 ] 
\ No newline at end of file
@@ -0,0 +1,163 @@
+from loguru import logger
+from pydantic import BaseModel, Field
+from typing import Any, List
+from concurrent.futures import ProcessPoolExecutor
+from langchain_core.retrievers import BaseRetriever
+import asyncio
+import multiprocessing
+import os
+import time
+
+from .state import EthicsState
+from .state_journal import StateJournal
+from .events import run_with_events
+from ..utils.file_utils import set_pdf_executor
+from ..utils.logger import run_context
+from ..utils.resilience import configure_provider_guard
+from ..tools.ethics_retriever import multi_query_search
+
+# 워커 프로세스가 fork 시점에 상속받는 읽기 전용 공유 자원 (임베딩 모델, FAISS 인덱스)
+_shared = {}
+
+def _init_worker():
+    """워커 프로세스 초기화: 프로세스마다 CPU 스레드가 과도하게 늘어나지 않도록 제한합니다."""
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+def _warmup(_):
+    """워커 프로세스를 미리 fork시키기 위한 빈 작업"""
+    return os.getpid()
+
+def _pool_similarity_search(query, k):
+    """워커 프로세스에서 상속받은 FAISS 인덱스로 유사도 검색을 수행합니다."""
+    return _shared["vector_db"].similarity_search(query, k=k)
+
+def _pool_multi_query_search(queries, k, fetch_k, rrf_k):
+    """워커 프로세스에서 다중 쿼리 배치 검색을 수행합니다."""
+    return multi_query_search(_shared["vector_db"], queries, k=k, fetch_k=fetch_k, rrf_k=rrf_k)
+
+class BatchLimits(BaseModel):
+    """배치 실행 시 자원별 동시성 제한"""
+    max_jobs: int = Field(default=4, description="동시에 실행할 워크플로우 수 (LLM/검색 I/O 동시성)")
+    llm_rps: float = Field(default=2.0, description="LLM 초당 요청 수 제한")
+    cpu_workers: int = Field(default=2, description="임베딩/FAISS 검색/PDF 렌더링용 프로세스 수")
+
+class PooledRetriever(BaseRetriever):
+    """유사도 검색을 CPU 프로세스 풀에서 수행하는 검색기"""
+    executor: Any
+    k: int = 4
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return self.executor.submit(_pool_similarity_search, query, self.k).result()
+
+class PooledVectorStore:
+    """벡터 DB 프록시. 검색 연산은 프로세스 풀로 보내고 나머지 속성은 원본에 위임합니다."""
+
+    def __init__(self, vector_db, executor):
+        self._vector_db = vector_db
+        self._executor = executor
+
+    def as_retriever(self, search_kwargs=None, **kwargs):
+        return PooledRetriever(executor=self._executor, k=(search_kwargs or {}).get("k", 4))
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return self._executor.submit(_pool_similarity_search, query, k).result()
+
+    def multi_query_search(self, queries, k=8, fetch_k=10, rrf_k=60):
+        return self._executor.submit(_pool_multi_query_search, list(queries), k, fetch_k, rrf_k).result()
+
+    def __getattr__(self, name):
+        return getattr(self._vector_db, name)
+
+def create_cpu_pool(vector_db, limits):
+    """임베딩 모델과 인덱스를 로드한 뒤(fork-after-load) CPU 작업용 프로세스 풀을 생성합니다.
+
+    워커는 fork로 부모의 메모리를 copy-on-write로 공유하므로 모델과 인덱스를 다시 로드하지 않습니다.
+    """
+    _shared["vector_db"] = vector_db
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:
+        logger.warning("fork를 지원하지 않는 플랫폼입니다. CPU 프로세스 풀을 사용하지 않습니다.")
+        return None
+
+    executor = ProcessPoolExecutor(
+        max_workers=limits.cpu_workers,
+        mp_context=context,
+        initializer=_init_worker
+    )
+    # 이벤트 루프 스레드가 시작되기 전에 워커를 모두 fork
+    pids = list(executor.map(_warmup, range(limits.cpu_workers)))
+    logger.info(f"CPU 프로세스 풀 시작: {len(set(pids))}개 워커")
+    return executor
+
+def run_workflow_job(workflow, state, run_registry=None, journal_dir=None):
+    """워크플로우 1건을 실행하고 최종 상태를 반환합니다."""
+    with run_context(state.workflow_id):
+        return _run_workflow_job(workflow, state, run_registry, journal_dir)
+
+def _run_workflow_job(workflow, state, run_registry, journal_dir):
+    journal = StateJournal(state.workflow_id, directory=journal_dir)
+    journal.append(state, node="start")
+    if run_registry is not None:
+        run_registry.start_run(state, journal_path=journal.path)
+
+    try:
+        config = {"configurable": {"thread_id": state.workflow_id}}
+        # 작업 스레드마다 별도 이벤트 루프에서 이벤트 스트림을 소비하며 노드 종료마다 저널 기록
+        final_state = asyncio.run(run_with_events(workflow, state, config, journal=journal))
+        final_state.workflow_status = "completed" if final_state.report_path else "failed"
+        journal.append(final_state, node="end")
+        if run_registry is not None:
+            run_registry.finish_run(final_state, status=final_state.workflow_status)
+        return final_state
+    except Exception as e:
+        logger.error(f"배치 작업 실패 ({state.ai_service}, {state.criteria}): {e}")
+        state.workflow_status = "failed"
+        if run_registry is not None:
+            run_registry.finish_run(state, status="failed", error=str(e))
+        return state
+
+async def run_batch(workflow, jobs: List[EthicsState], limits: BatchLimits, run_registry=None, journal_dir=None):
+    """여러 워크플로우를 max_jobs 만큼 동시에 실행합니다. 결과는 jobs 순서대로 반환합니다."""
+    semaphore = asyncio.Semaphore(limits.max_jobs)
+
+    async def run_one(state):
+        async with semaphore:
+            started = time.perf_counter()
+            logger.info(f"배치 작업 시작: {state.ai_service} / {state.criteria} ({state.workflow_id})")
+            final_state = await asyncio.to_thread(run_workflow_job, workflow, state, run_registry, journal_dir)
+            logger.info(f"배치 작업 종료: {state.ai_service} / {state.criteria} - {final_state.workflow_status} ({time.perf_counter() - started:.1f}s)")
+            return final_state
+
+    return await asyncio.gather(*(run_one(state) for state in jobs))
+
+class BatchScheduler:
+    """여러 AI 서비스/윤리 기준 조합을 동시에 진단하는 배치 스케줄러
+
+    - LLM/검색 I/O: asyncio 동시성(max_jobs)과 공유 LLM 속도 제한(llm_rps)
+    - CPU 작업(FAISS 검색, PDF 렌더링): fork-after-load 프로세스 풀(cpu_workers)
+    """
+
+    def __init__(self, vector_db, limits=None):
+        self.limits = limits or BatchLimits()
+        self.executor = create_cpu_pool(vector_db, self.limits) if self.limits.cpu_workers > 0 else None
+        self.vector_db = PooledVectorStore(vector_db, self.executor) if self.executor else vector_db
+        # get_llm이 사용하는 OpenAI 공급자 보호 계층의 시작 속도를 배치 제한으로 설정 (응답 헤더에 따라 자동 조정)
+        configure_provider_guard("openai", self.limits.llm_rps)
+        if self.executor is not None:
+            set_pdf_executor(self.executor)
+
+    def run(self, workflow, jobs, run_registry=None, journal_dir=None):
+        """배치를 실행하고 최종 상태 목록을 반환합니다."""
+        return asyncio.run(run_batch(workflow, jobs, self.limits, run_registry=run_registry, journal_dir=journal_dir))
+
+    def shutdown(self):
+        """프로세스 풀을 종료합니다."""
+        set_pdf_executor(None)
+        if self.executor is not None:
+            self.executor.shutdown()
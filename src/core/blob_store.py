@@ -0,0 +1,75 @@
+from loguru import logger
+from functools import lru_cache
+import gzip
+import hashlib
+import os
+import threading
+
+from ..utils.artifacts import get_artifact_manager
+
+class BlobStore:
+    """큰 텍스트를 내용 해시(sha256)로 주소 지정하여 gzip 파일로 저장하는 디스크 blob 저장소
+
+    같은 내용은 한 번만 저장되며, 최근에 읽은 blob만 메모리에 캐시합니다.
+    다시 저장하거나 읽을 때 파일 수정 시각을 갱신하므로, 보존 기간 정리는 마지막으로 사용한 시각을 기준으로 합니다.
+    """
+
+    def __init__(self, directory=None, cache_size=32):
+        directory = directory or get_artifact_manager().path("blobs")
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self._read = lru_cache(maxsize=cache_size)(self._read_file)
+
+    def _path(self, ref):
+        return os.path.join(self.directory, ref[:2], f"{ref}.txt.gz")
+
+    def put(self, text):
+        """텍스트를 저장하고 참조(sha256)를 반환합니다."""
+        ref = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = self._path(ref)
+        if os.path.exists(path):
+            self._touch(ref)
+            return ref
+        with self._write_lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 다른 프로세스가 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        return ref
+
+    def _touch(self, ref):
+        try:
+            os.utime(self._path(ref), None)
+        except OSError:
+            pass
+
+    def _read_file(self, ref):
+        with gzip.open(self._path(ref), "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def get(self, ref):
+        """참조로 텍스트를 읽습니다."""
+        try:
+            text = self._read(ref)
+            self._touch(ref)
+            return text
+        except FileNotFoundError:
+            logger.error(f"blob을 찾을 수 없습니다: {ref}")
+            raise
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_blob_store():
+    """프로세스 전역 blob 저장소를 반환합니다 (STATE_BLOB_DIR, STATE_BLOB_CACHE_SIZE 환경 변수)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BlobStore(
+                os.getenv("STATE_BLOB_DIR"),
+                cache_size=int(os.getenv("STATE_BLOB_CACHE_SIZE", "32"))
+            )
+        return _store
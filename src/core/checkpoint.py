@@ -0,0 +1,106 @@
+from loguru import logger
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from .state import EthicsState
+from .stage_cache import FAILURE_MARKERS
+from ..utils.artifacts import get_artifact_manager
+
+# 단계 결과 필드 (실패 메시지가 담긴 필드가 있으면 체크포인트로 저장하지 않음)
+STAGE_FIELDS = ("service_info", "criteria_info", "risk_message")
+
+def failed_fields(state):
+    """실패 메시지(에러, 검색 오류 등)가 담긴 단계 결과 필드 목록"""
+    failed = []
+    for field in STAGE_FIELDS:
+        content = getattr(getattr(state, field, None), "content", None)
+        if isinstance(content, str) and any(marker in content for marker in FAILURE_MARKERS):
+            failed.append(field)
+    return failed
+
+class CheckpointStore:
+    """workflow_id 기준으로 노드 완료 시점의 상태를 SQLite에 저장하는 체크포인트 저장소
+
+    --resume은 이 저장소의 마지막 체크포인트에서 상태를 복원하고, 워크플로우 진입 라우터가 첫 미완료 노드부터 실행합니다.
+    """
+
+    def __init__(self, db_path=None):
+        db_path = db_path or get_artifact_manager().path("checkpoints", "checkpoints.db")
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # LangGraph 스레드 풀에서도 같은 연결을 사용할 수 있도록 check_same_thread 해제
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    workflow_id TEXT NOT NULL,
+                    step INTEGER NOT NULL,
+                    node TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (workflow_id, step)
+                )
+                """
+            )
+        logger.info(f"체크포인트 저장소 초기화: {db_path}")
+
+    def save(self, state, node):
+        """노드 실행이 끝난 상태를 다음 step 번호로 저장합니다.
+
+        단계 결과 필드에 실패 메시지가 있으면 저장하지 않고 None을 반환합니다 (재개 시 실패한 단계부터 다시 실행).
+        """
+        failed = failed_fields(state)
+        if failed:
+            logger.warning(f"실패한 단계 결과가 있어 체크포인트를 저장하지 않습니다: {state.workflow_id} node={node} ({', '.join(failed)})")
+            return None
+        payload = json.dumps(state.to_dict(), ensure_ascii=False)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT COALESCE(MAX(step), -1) FROM checkpoints WHERE workflow_id = ?",
+                (state.workflow_id,)
+            ).fetchone()
+            step = row[0] + 1
+            self._conn.execute(
+                "INSERT INTO checkpoints (workflow_id, step, node, state, created_at) VALUES (?, ?, ?, ?, ?)",
+                (state.workflow_id, step, node, payload, datetime.now().isoformat())
+            )
+        logger.info(f"체크포인트 저장: {state.workflow_id} step={step} node={node}")
+        return step
+
+    def load(self, workflow_id):
+        """가장 최근 체크포인트에서 상태를 복원합니다. 없으면 None을 반환합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, node, step FROM checkpoints WHERE workflow_id = ? ORDER BY step DESC LIMIT 1",
+                (workflow_id,)
+            ).fetchone()
+        if row is None:
+            logger.warning(f"체크포인트를 찾을 수 없습니다: {workflow_id}")
+            return None
+
+        # EthicsState.load_state와 동일한 방식으로 메시지 객체 복원
+        state = EthicsState.from_dict(json.loads(row[0]))
+        logger.info(f"체크포인트 복원: {workflow_id} step={row[2]} (마지막 완료 노드: {row[1]})")
+        return state
+
+    def completed_nodes(self, workflow_id):
+        """체크포인트가 기록된 노드 목록을 실행 순서대로 반환합니다."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT node FROM checkpoints WHERE workflow_id = ? ORDER BY step",
+                (workflow_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        """SQLite 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
@@ -1,61 +1,74 @@
 from loguru import logger
 import os
 from langchain_community.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.schema.document import Document
-from langchain_community.document_loaders import PyMuPDFLoader
+
+from .ingestion import iter_chunks, index_is_current, build_faiss_index
 
 file_path = "data/eu_ai_act.pdf"
 
-def create_documents(file_path):
-    """PDF 파일을 문서로 변환하고 청크로 나눕니다."""
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    
-    loader = PyMuPDFLoader(file_path)
-    docs = loader.load()
-        
-    # 문서를 청크로 나누기
-    split_documents = text_splitter.split_documents(docs)
-    
-    # 각 문서에 framework 메타데이터 추가
-    for doc in split_documents:
-        if 'metadata' not in doc:
-            doc.metadata = {}
-        doc.metadata['framework'] = 'EU_AI_Act'
-    
+DEFAULT_FAISS_PATH = "./data/vectorstore"
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+MULTILINGUAL_EMBEDDING_MODEL = "BAAI/bge-m3"
+
+def vectorstore_path(base_path, embedding_model):
+    """임베딩 모델별 FAISS 인덱스 경로 (기본 영어 모델은 기존 경로를 그대로 사용)"""
+    if embedding_model == DEFAULT_EMBEDDING_MODEL:
+        return base_path
+    slug = embedding_model.replace("/", "_").replace(":", "_")
+    return f"{base_path.rstrip('/')}_{slug}"
+
+def get_embedding_settings(mode=None):
+    """인덱스 모드에 따른 (모드, 임베딩 모델, FAISS 경로)를 반환합니다.
+
+    - english(기본): EMBEDDING_MODEL(all-MiniLM-L6-v2) 인덱스, 기준 검색 시 한국어 키워드를 영어 쿼리로 변환
+    - multilingual: MULTILINGUAL_EMBEDDING_MODEL(BAAI/bge-m3) 인덱스, 한국어 쿼리로 바로 검색
+    EMBEDDING_MODE 환경 변수로 모드를 선택하며, FAISS_DB_PATH를 지정하면 그 경로를 사용합니다.
+    """
+    mode = (mode or os.getenv("EMBEDDING_MODE", "english")).lower()
+    if mode == "multilingual":
+        model = os.getenv("MULTILINGUAL_EMBEDDING_MODEL", MULTILINGUAL_EMBEDDING_MODEL)
+    else:
+        mode = "english"
+        model = os.getenv("EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+    return mode, model, os.getenv("FAISS_DB_PATH") or vectorstore_path(DEFAULT_FAISS_PATH, model)
+
+def framework_sources():
+    """벡터 DB에 넣을 (프레임워크 이름, PDF 경로) 목록
+
+    FRAMEWORK_SOURCES 환경 변수("EU_AI_Act=data/eu_ai_act.pdf,Korea_AI_Act=data/kr_ai_act.pdf")로 문서를 추가합니다.
+    """
+    value = os.getenv("FRAMEWORK_SOURCES")
+    if not value:
+        return [("EU_AI_Act", file_path)]
+    sources = []
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        framework, path = (part.strip() for part in item.split("=", 1))
+        sources.append((framework, path))
+    return sources
+
+def create_documents(file_path, framework="EU_AI_Act"):
+    """PDF 파일을 문서로 변환하고 청크로 나눕니다 (페이지 구간 단위 병렬 파싱)."""
+    split_documents = [doc for _, chunks in iter_chunks([(framework, file_path)]) for doc in chunks]
     logger.info(f"분할된 청크의 수: {len(split_documents)}")
     return split_documents
 
-def load_ethics_frameworks_to_db(embeddings, faiss_path="data/vectorstore"):
+def load_or_build_faiss(sources, embeddings, persist_directory):
+    """같은 임베딩 모델과 원본 문서로 만든 인덱스가 있으면 PDF를 파싱하지 않고 로드하고,
+    없으면 스트리밍 수집(build_faiss_index)으로 생성합니다 (중단된 수집은 체크포인트에서 재개)."""
+    if index_is_current(persist_directory, getattr(embeddings, "model_name", None), sources):
+        logger.info(f"기존 FAISS 데이터베이스 로드: {persist_directory}")
+        return FAISS.load_local(persist_directory, embeddings, allow_dangerous_deserialization=True)
+    logger.info(f"새로운 FAISS 데이터베이스 생성: {persist_directory}")
+    os.makedirs(persist_directory, exist_ok=True)
+    return build_faiss_index(sources, embeddings, persist_directory)
+
+def load_ethics_frameworks_to_db(embeddings, faiss_path=DEFAULT_FAISS_PATH, sources=None):
     """윤리 프레임워크를 벡터 데이터베이스에 로드합니다."""
     try:
         logger.info(f"윤리 프레임워크 벡터 DB에 로드 중...")
-        docs = create_documents(file_path)
-        return create_or_load_faiss(docs, embeddings, faiss_path)
+        return load_or_build_faiss(sources or framework_sources(), embeddings, faiss_path)
     except Exception as e:
         logger.error(f"윤리 프레임워크 벡터 DB 로드 실패: {e}")
         raise
-
-def create_or_load_faiss(documents, embeddings, persist_directory):
-    """FAISS 벡터 데이터베이스를 생성하거나 로드합니다."""
-    try:
-        # 디렉토리가 없으면 생성
-        os.makedirs(persist_directory, exist_ok=True)
-        
-        # FAISS 인덱스 파일이 있는지 확인
-        index_file = os.path.join(persist_directory, "index.faiss")
-        if os.path.exists(index_file):
-            logger.info(f"기존 FAISS 데이터베이스 로드: {persist_directory}")
-            return FAISS.load_local(persist_directory, embeddings, allow_dangerous_deserialization=True)
-        else:
-            logger.info(f"새로운 FAISS 데이터베이스 생성: {persist_directory}")
-            vector_db = FAISS.from_documents(documents, embeddings)
-            # 저장
-            vector_db.save_local(persist_directory)
-            logger.info(f"FAISS 데이터베이스 저장 완료: {persist_directory}")
-            return vector_db
-    except Exception as e:
-        logger.error(f"FAISS 데이터베이스 초기화 실패: {e}")
-        raise
-
-
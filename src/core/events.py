@@ -0,0 +1,105 @@
+from loguru import logger
+from pydantic import BaseModel, Field
+from typing import Any, AsyncIterator, Dict, Optional
+import time
+
+from .state import EthicsState
+from ..utils.progress import TOOL_CALL_EVENT, TOOL_END_EVENT
+
+# 이벤트 스트림에서 노드 시작/종료로 보고할 워크플로우 노드
+WORKFLOW_NODES = ("service_input", "criteria_search", "ethics_evaluation", "report_generation", "end")
+
+class WorkflowEvent(BaseModel):
+    """워크플로우 진행 이벤트
+
+    type: node_start, node_end, token, tool_call, tool_end, workflow_end
+    """
+    type: str = Field(description="이벤트 유형")
+    workflow_id: str = Field(description="워크플로우 ID")
+    node: Optional[str] = Field(default=None, description="이벤트가 발생한 노드")
+    elapsed: float = Field(default=0.0, description="워크플로우 시작 후 경과 시간(초)")
+    data: Dict[str, Any] = Field(default_factory=dict, description="이벤트별 데이터 (JSON 직렬화 가능)")
+    state: Optional[Any] = Field(default=None, exclude=True, description="node_end/workflow_end 시점의 상태 (프로세스 내 소비자용)")
+
+    def to_dict(self):
+        """서버 모드(SSE, WebSocket 등)로 전송할 수 있는 딕셔너리로 변환합니다."""
+        return self.dict(exclude={"state"})
+
+def _node_of(event):
+    return (event.get("metadata") or {}).get("langgraph_node")
+
+async def stream_workflow_events(workflow, state: EthicsState, config=None) -> AsyncIterator[WorkflowEvent]:
+    """컴파일된 워크플로우를 실행하며 노드 시작/종료, 토큰, 도구 호출 이벤트를 비동기 제너레이터로 전달합니다.
+
+    node_end 이벤트는 노드 출력 키와 소요 시간을, 마지막 workflow_end 이벤트는 노드별 소요 시간을 포함하며
+    두 이벤트의 state에는 노드 출력이 반영된 상태가 들어 있습니다.
+    """
+    started = time.perf_counter()
+    node_started = {}
+    timings = {}
+    token_counts = {}
+    current_state = state
+
+    def make(type, node=None, data=None, state=None):
+        return WorkflowEvent(
+            type=type,
+            workflow_id=current_state.workflow_id,
+            node=node,
+            elapsed=round(time.perf_counter() - started, 3),
+            data=data or {},
+            state=state
+        )
+
+    async for event in workflow.astream_events(state, config, version="v2"):
+        kind = event["event"]
+        name = event.get("name")
+
+        if kind == "on_chain_start" and name in WORKFLOW_NODES and _node_of(event) == name:
+            node_started[name] = time.perf_counter()
+            token_counts[name] = 0
+            yield make("node_start", node=name)
+
+        elif kind == "on_chain_end" and name in WORKFLOW_NODES and _node_of(event) == name:
+            output = (event.get("data") or {}).get("output") or {}
+            if not isinstance(output, dict):
+                output = {}
+            duration = time.perf_counter() - node_started.pop(name, time.perf_counter())
+            timings[name] = round(duration, 3)
+            current_state = current_state.apply(output)
+            yield make("node_end", node=name, state=current_state, data={
+                "duration": timings[name],
+                "output_keys": list(output.keys()),
+                "tokens": token_counts.get(name, 0)
+            })
+
+        elif kind == "on_chat_model_stream":
+            chunk = (event.get("data") or {}).get("chunk")
+            content = getattr(chunk, "content", None)
+            if isinstance(content, str) and content:
+                node = _node_of(event)
+                token_counts[node] = token_counts.get(node, 0) + 1
+                yield make("token", node=node, data={"delta": content})
+
+        elif kind == "on_custom_event" and name in (TOOL_CALL_EVENT, TOOL_END_EVENT):
+            yield make(name, node=_node_of(event), data=dict(event.get("data") or {}))
+
+    logger.info(f"워크플로우 이벤트 스트림 종료: 노드별 소요 시간 {timings}")
+    yield make("workflow_end", state=current_state, data={"timings": timings})
+
+async def run_with_events(workflow, state: EthicsState, config=None, journal=None, on_event=None):
+    """이벤트 스트림으로 워크플로우를 실행하고 최종 상태를 반환합니다.
+
+    journal이 주어지면 노드가 끝날 때마다 변경 필드를 기록하고, on_event가 주어지면 모든 이벤트를 전달합니다.
+    """
+    final_state = state
+    async for event in stream_workflow_events(workflow, state, config):
+        if event.type == "node_end" and journal is not None:
+            try:
+                journal.append(event.state, node=event.node)
+            except Exception as e:
+                logger.error(f"중간 상태 기록 실패: {e}")
+        if event.state is not None:
+            final_state = event.state
+        if on_event is not None:
+            on_event(event)
+    return final_state
@@ -0,0 +1,339 @@
+from loguru import logger
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+from datetime import datetime
+
+# PDF 페이지 머리글/바닥글 (Official Journal 판 EU AI Act)
+HEADER_PATTERNS = [
+    re.compile(r"^EN$"),
+    re.compile(r"^OJ L, \d{1,2}\.\d{1,2}\.\d{4}$"),
+    re.compile(r"^ELI: \S+$"),
+    re.compile(r"^\d+/\d+$")
+]
+
+ARTICLE_HEADING = re.compile(r"^Article\s+(\d+)\s*$", re.MULTILINE)
+ANNEX_HEADING = re.compile(r"^ANNEX\s+([IVXLC]+)\s*$", re.MULTILINE)
+CHAPTER_HEADING = re.compile(r"^CHAPTER\s+([IVXLC]+)\s*$", re.MULTILINE)
+NUMBERED_ITEM = re.compile(r"^(\d+)\.\s+(.+)$", re.MULTILINE)
+SENTENCE_SPLIT = re.compile(r"(?<=[.;:])\s+(?=[A-Z(])")
+TOKEN = re.compile(r"[a-z0-9가-힣]+")
+
+# EU AI Act 위험 등급 구조: 근거 조항/부록과 서비스 설명에서 등급 후보를 찾기 위한 영어/한국어 표현
+# 표현은 단어 경계에서만 일치하며(_term_pattern), 끝의 *는 어미/복수형 등 이어지는 글자를 허용합니다.
+# 거의 모든 서비스 설명에 등장하는 일반적인 표현(조작, 취약, llm, gpt 등)은 넣지 않습니다.
+EU_AI_ACT_RISK_TIERS = {
+    "prohibited": {
+        "label": "금지된 AI 관행 (Prohibited AI Practices)",
+        "articles": ["5"],
+        "annexes": [],
+        "terms": ["social scoring", "사회적 점수", "사회 신용 점수", "subliminal", "잠재의식", "manipulative techni*", "조작적 기법",
+                  "exploit* vulnerabilit*", "취약성을 악용", "취약성 악용", "emotion recognition in the workplace", "직장 내 감정",
+                  "predictive policing", "범죄 예측", "untargeted scraping", "얼굴 이미지 수집", "real-time remote biometric", "실시간 원격 생체"]
+    },
+    "high_risk": {
+        "label": "고위험 AI 시스템 (High-risk AI Systems)",
+        "articles": ["6", "8", "9", "10", "11", "12", "13", "14", "15", "16", "26", "27", "43", "49"],
+        "annexes": ["I", "III"],
+        "terms": []  # 부록 III 항목별 표현(ANNEX_III_TERMS)으로 판단
+    },
+    "transparency": {
+        "label": "특정 투명성 의무가 있는 AI (Limited Risk)",
+        "articles": ["50"],
+        "annexes": [],
+        "terms": ["chatbot", "챗봇", "conversational", "대화형", "deepfake", "딥페이크", "generated content", "생성형",
+                  "synthetic", "합성 이미지", "합성 음성", "emotion recognition", "감정 인식", "biometric categorisation", "생체 분류"]
+    },
+    "general_purpose": {
+        "label": "범용 AI 모델 (General-purpose AI Models)",
+        "articles": ["51", "52", "53", "54", "55"],
+        "annexes": ["XI", "XII", "XIII"],
+        "terms": ["general-purpose ai", "general purpose ai", "범용 ai", "범용 인공지능", "범용 모델", "foundation model",
+                  "파운데이션 모델", "기반 모델"]
+    },
+    "minimal": {
+        "label": "최소 위험 AI (Minimal Risk)",
+        "articles": ["95"],
+        "annexes": [],
+        "terms": []
+    }
+}
+
+# 부록 III 고위험 영역(항목 번호)별 영어/한국어 표현
+ANNEX_III_TERMS = {
+    "1": ["biometric identification", "remote biometric", "생체 인식", "face recognition", "facial recognition", "얼굴 인식", "안면 인식"],
+    "2": ["critical infrastructure", "중요 인프라", "electricity supply", "전력망", "전력 공급", "water supply", "road traffic", "교통 관제"],
+    "3": ["education", "educational", "교육", "vocational training", "직업 훈련", "exam", "examination", "admission", "입학", "입시", "학생", "대학생"],
+    "4": ["employment", "고용", "recruitment", "recruiting", "채용", "hiring", "인사 평가", "인사 관리", "worker", "근로자", "승진"],
+    "5": ["essential services", "필수 서비스", "credit scor*", "creditworth*", "신용 평가", "신용 점수", "insurance", "보험",
+          "public benefits", "공공 복지", "emergency call", "emergency dispatch", "응급"],
+    "6": ["law enforcement", "법 집행", "police", "경찰", "criminal", "범죄 수사"],
+    "7": ["migration", "이민", "asylum", "망명", "border control", "국경", "visa application", "비자 심사"],
+    "8": ["administration of justice", "사법", "judicial", "법원", "court", "election", "선거", "voting", "투표"]
+}
+
+# 위험 등급 구조를 적용하는 프레임워크
+RISK_TIER_FRAMEWORK = "EU_AI_Act"
+
+def _term_pattern(term):
+    """표현을 단어 경계에서만 찾는 정규식
+
+    영어는 앞뒤가 모두 단어 경계여야 하며(복수형 s 허용), 한국어는 조사가 붙으므로 앞쪽만 경계를 확인합니다.
+    끝의 *는 이어지는 글자를 허용하고, 한국어 표현의 공백은 붙여 쓴 경우도 일치합니다.
+    """
+    term = term.lower()
+    prefix = term.endswith("*")
+    words = [re.escape(word) for word in term.rstrip("*").split()]
+    if re.search("[가-힣]", term):
+        return re.compile(r"(?<![가-힣a-z0-9])" + r"\s*".join(words))
+    tail = r"[a-z0-9-]*" if prefix else r"(?:s|es)?(?![a-z0-9])"
+    return re.compile(r"(?<![a-z0-9])" + r"\s+".join(words).replace(r"\*", r"[a-z]*") + tail)
+
+def _match_terms(terms, text):
+    """텍스트(소문자)에서 단어 경계로 일치하는 표현 목록 (실제로 일치한 텍스트)"""
+    matched = []
+    for term in terms:
+        match = _term_pattern(term).search(text)
+        if match and match.group(0) not in matched:
+            matched.append(match.group(0))
+    return matched
+
+def _clean_text(text):
+    """페이지 머리글/바닥글 줄을 제거합니다."""
+    lines = [line.rstrip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if not any(pattern.match(line.strip()) for pattern in HEADER_PATTERNS))
+
+def _tokens(text):
+    return TOKEN.findall(text.lower())
+
+def _first_line(text):
+    for line in text.splitlines():
+        if line.strip():
+            return line.strip()
+    return ""
+
+def _obligations(body, limit=5):
+    """본문에서 'shall'이 포함된 의무 문장을 추출합니다."""
+    sentences = SENTENCE_SPLIT.split(" ".join(body.split()))
+    obligations = [sentence.strip() for sentence in sentences if " shall " in f" {sentence} "]
+    return [sentence[:400] for sentence in obligations[:limit]]
+
+def _sections(text, heading_pattern, end_pattern=None):
+    """제목 패턴 사이의 본문을 (번호, 제목, 본문, 시작 위치) 목록으로 나눕니다."""
+    matches = list(heading_pattern.finditer(text))
+    sections = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        if end_pattern is not None:
+            boundary = end_pattern.search(text, match.end(), end)
+            if boundary:
+                end = boundary.start()
+        body = text[match.end():end].strip()
+        title = _first_line(body)
+        sections.append((match.group(1), title, body[len(title):].strip(), match.start()))
+    return sections
+
+def extract_framework_kb(pages, framework="EU_AI_Act"):
+    """프레임워크 문서 페이지 텍스트에서 조항, 부록, 의무사항, 위험 등급 구조를 추출합니다."""
+    text = _clean_text("\n".join(pages))
+    chapters = [(match.start(), match.group(1)) for match in CHAPTER_HEADING.finditer(text)]
+
+    def chapter_at(position):
+        current = None
+        for start, number in chapters:
+            if start > position:
+                break
+            current = number
+        return current
+
+    # 본문 조항은 부록 시작 전까지만 사용
+    first_annex = ANNEX_HEADING.search(text)
+    articles_text = text[:first_annex.start()] if first_annex else text
+
+    articles = {}
+    for number, title, body, position in _sections(articles_text, ARTICLE_HEADING):
+        # 같은 번호가 다시 나오면(목차 등) 본문이 더 긴 쪽을 사용
+        if number in articles and len(articles[number]["text"]) >= len(body):
+            continue
+        articles[number] = {
+            "number": number,
+            "title": title,
+            "chapter": chapter_at(position),
+            "obligations": _obligations(body),
+            "text": body[:2000]
+        }
+
+    annexes = {}
+    if first_annex:
+        for number, title, body, _ in _sections(text[first_annex.start():], ANNEX_HEADING):
+            items = []
+            for item_number, item_text in NUMBERED_ITEM.findall(body):
+                # 항목 제목: 첫 쉼표/콜론 앞부분
+                items.append({"number": item_number, "title": re.split(r"[,:]", item_text, 1)[0].strip()})
+            annexes[number] = {
+                "number": number,
+                "title": title,
+                "items": items,
+                "text": body[:3000]
+            }
+
+    # 위험 등급 구조와 부록 III 고위험 영역은 EU AI Act에만 적용
+    tiers = {}
+    annex_iii_categories = []
+    if framework == RISK_TIER_FRAMEWORK:
+        for tier, spec in EU_AI_ACT_RISK_TIERS.items():
+            tiers[tier] = {
+                "label": spec["label"],
+                "articles": [number for number in spec["articles"] if number in articles] or spec["articles"],
+                "annexes": spec["annexes"],
+                "terms": spec["terms"]
+            }
+        annex_iii = annexes.get("III", {})
+        annex_iii_categories = [item for item in annex_iii.get("items", []) if item["number"] in ANNEX_III_TERMS]
+
+    kb = {
+        "framework": framework,
+        "built_at": datetime.now().isoformat(),
+        "articles": articles,
+        "annexes": annexes,
+        "risk_tiers": tiers,
+        "annex_iii_categories": annex_iii_categories
+    }
+    logger.info(f"프레임워크 지식 베이스 추출 완료: 조항 {len(articles)}개, 부록 {len(annexes)}개")
+    return kb
+
+def build_framework_kb(file_path, output_path, framework="EU_AI_Act"):
+    """프레임워크 PDF에서 지식 베이스를 추출하여 JSON으로 저장합니다 (오프라인 사전 계산 단계)."""
+    from .ingestion import iter_page_texts
+
+    logger.info(f"프레임워크 지식 베이스 생성 중: {file_path}")
+    pages = list(iter_page_texts(file_path))
+    kb = extract_framework_kb(pages, framework=framework)
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(kb, f, ensure_ascii=False)
+    logger.info(f"프레임워크 지식 베이스 저장 완료: {output_path}")
+    return output_path
+
+class FrameworkKB:
+    """사전 구축된 프레임워크 지식 베이스에 대한 색인 조회"""
+
+    def __init__(self, data):
+        self.data = data
+        self.framework = data["framework"]
+        self.articles = data["articles"]
+        self.annexes = data["annexes"]
+        # classify가 현재 코드의 표현 목록을 사용하므로 버전(단계 캐시 키)에 표현 목록도 포함
+        versioned = {"data": data, "risk_tiers": EU_AI_ACT_RISK_TIERS, "annex_iii_terms": ANNEX_III_TERMS}
+        self.version = hashlib.sha256(json.dumps(versioned, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+        # 조항 제목/의무사항 토큰 -> 조항 번호 역색인
+        self._index = defaultdict(set)
+        for number, article in self.articles.items():
+            for token in _tokens(article["title"] + " " + " ".join(article["obligations"])):
+                self._index[token].add(number)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def article(self, number):
+        return self.articles.get(str(number))
+
+    def annex(self, number):
+        return self.annexes.get(number)
+
+    def search_articles(self, terms, limit=5):
+        """검색어 토큰이 조항 제목/의무사항에 많이 등장하는 순으로 조항을 반환합니다."""
+        scores = defaultdict(int)
+        for term in terms:
+            for token in _tokens(term):
+                for number in self._index.get(token, ()):
+                    scores[number] += 1
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], int(item[0])))
+        return [self.articles[number] for number, _ in ranked[:limit]]
+
+    def classify(self, service_text):
+        """서비스 설명에 등장하는 표현으로 위험 등급 후보와 근거를 반환합니다 (EU AI Act 외 프레임워크는 빈 목록).
+
+        표현 목록은 지식 베이스에 저장된 값이 아니라 현재 코드의 목록(EU_AI_ACT_RISK_TIERS)을 사용합니다.
+        """
+        risk_tiers = self.data.get("risk_tiers") or {}
+        if self.framework != RISK_TIER_FRAMEWORK or not risk_tiers:
+            return []
+        text = service_text.lower()
+        candidates = []
+        for tier, spec in risk_tiers.items():
+            matched = _match_terms(EU_AI_ACT_RISK_TIERS.get(tier, spec)["terms"], text)
+            if matched:
+                candidates.append({"tier": tier, "label": spec["label"], "matched": matched,
+                                   "articles": spec["articles"], "annexes": spec["annexes"]})
+
+        # 부록 III 고위험 영역
+        annex_iii_titles = {item["number"]: item["title"] for item in self.data.get("annex_iii_categories", [])}
+        matched_areas = []
+        for number, terms in ANNEX_III_TERMS.items():
+            matched = _match_terms(terms, text)
+            if matched:
+                matched_areas.append({"number": number, "title": annex_iii_titles.get(number, ""), "matched": matched})
+        if matched_areas:
+            spec = risk_tiers["high_risk"]
+            candidates.append({"tier": "high_risk", "label": spec["label"], "matched": matched_areas,
+                               "articles": spec["articles"], "annexes": spec["annexes"]})
+
+        if not candidates:
+            spec = risk_tiers["minimal"]
+            candidates.append({"tier": "minimal", "label": spec["label"], "matched": [],
+                               "articles": spec["articles"], "annexes": spec["annexes"]})
+        return candidates
+
+    def tailoring_context(self, service_text, keywords=None, max_articles=6):
+        """기준 검색 에이전트의 맞춤화 호출에 넣을 간결한 규제 지식 요약을 만듭니다."""
+        lines = []
+        article_numbers = []
+        candidates = self.classify(service_text)
+        if candidates:
+            lines.append("[위험 등급 후보]")
+        for candidate in candidates:
+            basis = ", ".join(f"Article {number}" for number in candidate["articles"][:4])
+            if candidate["annexes"]:
+                basis += ", " + ", ".join(f"Annex {number}" for number in candidate["annexes"])
+            matched = candidate["matched"]
+            if matched and isinstance(matched[0], dict):
+                matched = [f"Annex III {area['number']}. {area['title']}" for area in matched]
+            lines.append(f"- {candidate['label']} | 근거: {basis} | 관련 표현: {', '.join(matched) if matched else '없음'}")
+            article_numbers += candidate["articles"][:2]
+
+        categories = self.data.get("annex_iii_categories", [])
+        if categories:
+            lines.append("[Annex III 고위험 영역]")
+            lines += [f"- {item['number']}. {item['title']}" for item in categories]
+
+        related = self.search_articles(list(keywords or []), limit=max_articles)
+        for number in article_numbers:
+            article = self.article(number)
+            if article and article not in related:
+                related.append(article)
+        if related:
+            lines.append("[관련 조항]")
+            for article in related[:max_articles]:
+                obligation = article["obligations"][0] if article["obligations"] else ""
+                lines.append(f"- Article {article['number']} ({article['title']}): {obligation[:200]}")
+        return "\n".join(lines)
+
+def load_framework_kbs(directory="data/framework_kb"):
+    """디렉토리의 프레임워크 지식 베이스(<framework>.json)를 모두 로드합니다."""
+    kbs = {}
+    if not os.path.isdir(directory):
+        logger.warning(f"프레임워크 지식 베이스 디렉토리가 없습니다: {directory}")
+        return kbs
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".json"):
+            kb = FrameworkKB.load(os.path.join(directory, filename))
+            kbs[kb.framework] = kb
+            logger.info(f"프레임워크 지식 베이스 로드: {kb.framework} (조항 {len(kb.articles)}개)")
+    return kbs
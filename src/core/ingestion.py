@@ -0,0 +1,314 @@
+from loguru import logger
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from langchain_community.vectorstores import FAISS
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.schema.document import Document
+import json
+import multiprocessing
+import os
+import shutil
+import time
+
+from .legal_chunker import LegalChunker
+
+# 진행 상황 체크포인트 디렉토리 (인덱스 디렉토리 아래, 완료 시 삭제)
+INGEST_DIR = "_ingest"
+MODEL_FILE = "embedding_model.txt"
+SOURCES_FILE = "sources.json"
+
+def _page_count(file_path):
+    try:
+        import fitz
+    except ImportError:
+        raise ImportError("PDF 수집에는 PyMuPDF 패키지가 필요합니다.")
+    with fitz.open(file_path) as pdf:
+        return pdf.page_count
+
+def _parse_pages(task):
+    """워커 프로세스: PDF의 [start, end) 페이지를 읽어 청크(내용, 메타데이터) 목록을 반환합니다.
+
+    Document 대신 기본 타입으로 반환하여 프로세스 간 전송 비용을 줄입니다.
+    """
+    import fitz
+    file_path, framework, start, end, chunk_size, chunk_overlap = task
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunks = []
+    with fitz.open(file_path) as pdf:
+        for number in range(start, end):
+            text = pdf[number].get_text()
+            if not text.strip():
+                continue
+            metadata = {"source": file_path, "file_path": file_path, "page": number, "total_pages": pdf.page_count, "framework": framework}
+            chunks += [(chunk, metadata) for chunk in splitter.split_text(text)]
+    return chunks
+
+def _page_texts(task):
+    """워커 프로세스: PDF의 [start, end) 페이지 텍스트 목록을 반환합니다."""
+    import fitz
+    file_path, start, end = task
+    with fitz.open(file_path) as pdf:
+        return [pdf[number].get_text() for number in range(start, end)]
+
+def _executor(workers):
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:
+        context = None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+def _ordered(executor, fn, tasks, window):
+    """작업을 최대 window개까지만 동시에 제출하고 제출 순서대로 (작업, 결과)를 내보냅니다 (메모리 상한)."""
+    tasks = iter(tasks)
+    pending = deque()
+    for task in tasks:
+        pending.append((task, executor.submit(fn, task)))
+        if len(pending) >= window:
+            break
+    while pending:
+        task, future = pending.popleft()
+        result = future.result()
+        next_task = next(tasks, None)
+        if next_task is not None:
+            pending.append((next_task, executor.submit(fn, next_task)))
+        yield task, result
+
+def ingest_settings():
+    """수집 설정 (INGEST_WORKERS, INGEST_PAGES_PER_TASK, INGEST_EMBED_BATCH, INGEST_CHECKPOINT_CHUNKS,
+    INGEST_CHUNKING, INGEST_MAX_CHUNK_CHARS 환경 변수)
+
+    청크 분할 방식(chunking)은 structure(조항/부록/전문 경계, 기본값)와 recursive(500자 고정 길이) 중에서 선택합니다.
+    """
+    return {
+        "chunking": os.getenv("INGEST_CHUNKING", "structure"),
+        "max_chunk_chars": int(os.getenv("INGEST_MAX_CHUNK_CHARS", "1200")),
+        "workers": int(os.getenv("INGEST_WORKERS", str(max(1, (os.cpu_count() or 2) - 1)))),
+        "pages_per_task": int(os.getenv("INGEST_PAGES_PER_TASK", "16")),
+        "embed_batch": int(os.getenv("INGEST_EMBED_BATCH", "512")),
+        "checkpoint_chunks": int(os.getenv("INGEST_CHECKPOINT_CHUNKS", "4096"))
+    }
+
+def page_tasks(sources, pages_per_task, chunk_size=500, chunk_overlap=50):
+    """(프레임워크, PDF 경로) 목록을 페이지 구간 작업으로 나눕니다."""
+    tasks = []
+    for framework, file_path in sources:
+        total = _page_count(file_path)
+        for start in range(0, total, pages_per_task):
+            tasks.append((file_path, framework, start, min(start + pages_per_task, total), chunk_size, chunk_overlap))
+    return tasks
+
+def task_key(task):
+    file_path, framework, start, end = task[:4]
+    return f"{framework}:{file_path}:{start}-{end}"
+
+def iter_chunks(sources, workers=None, pages_per_task=None, skip=None, chunking=None):
+    """PDF 페이지를 프로세스 풀에서 파싱/분할하여 (작업 키, 청크 Document 목록)을 페이지 순서대로 내보냅니다.
+
+    동시에 처리 중인 작업 수를 워커 수의 2배로 제한하므로 문서 전체를 메모리에 올리지 않습니다.
+    skip(작업 키 집합)에 포함된 작업은 건너뜁니다. 작업 키는 recursive 분할에서는 페이지 구간,
+    structure 분할에서는 구조 단위(조항, 부록, 전문)입니다.
+    """
+    settings = ingest_settings()
+    workers = workers or settings["workers"]
+    if (chunking or settings["chunking"]) == "structure":
+        yield from _iter_structure_chunks(sources, workers, pages_per_task, skip or set(), settings["max_chunk_chars"])
+        return
+    tasks = [task for task in page_tasks(sources, pages_per_task or settings["pages_per_task"]) if task_key(task) not in (skip or set())]
+    if not tasks:
+        return
+    with _executor(workers) as executor:
+        for task, chunks in _ordered(executor, _parse_pages, tasks, window=workers * 2):
+            yield task_key(task), [Document(page_content=content, metadata=dict(metadata)) for content, metadata in chunks]
+
+def _iter_structure_chunks(sources, workers, pages_per_task, skip, max_chars):
+    """페이지 텍스트는 프로세스 풀에서 추출하고, 구조 경계 인식은 페이지 순서대로 스트리밍 청커에서 수행합니다.
+
+    조항이 페이지 구간을 넘어 이어지므로 구조 인식은 한 프로세스에서 순서대로 처리하며,
+    재개 시에는 텍스트 추출만 다시 하고 이미 임베딩한 구조 단위는 건너뜁니다.
+    """
+    def units(chunker, file_path):
+        for page, text in enumerate(iter_page_texts(file_path, workers=workers, pages_per_task=pages_per_task)):
+            yield from chunker.feed(page, text)
+        yield from chunker.finish()
+
+    for framework, file_path in sources:
+        chunker = LegalChunker(framework, file_path, max_chars=max_chars)
+        for key, chunks in units(chunker, file_path):
+            if key not in skip:
+                yield key, [Document(page_content=content, metadata=metadata) for content, metadata in chunks]
+
+def iter_page_texts(file_path, workers=None, pages_per_task=None):
+    """PDF 페이지 텍스트를 프로세스 풀에서 추출하여 페이지 순서대로 내보냅니다."""
+    settings = ingest_settings()
+    workers = workers or settings["workers"]
+    pages_per_task = pages_per_task or settings["pages_per_task"]
+    total = _page_count(file_path)
+    tasks = [(file_path, start, min(start + pages_per_task, total)) for start in range(0, total, pages_per_task)]
+    with _executor(workers) as executor:
+        for _, texts in _ordered(executor, _page_texts, tasks, window=workers * 2):
+            yield from texts
+
+def sources_signature(sources):
+    """원본 문서 목록과 청크 분할 설정 서명 (경로, 크기, 수정 시각, 분할 방식) - 바뀌면 인덱스를 다시 생성"""
+    settings = ingest_settings()
+    chunking = settings["chunking"] if settings["chunking"] != "structure" else f"structure:{settings['max_chunk_chars']}"
+    return [
+        {"framework": framework, "path": file_path, "size": os.path.getsize(file_path), "mtime": int(os.path.getmtime(file_path)), "chunking": chunking}
+        for framework, file_path in sources
+    ]
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def index_is_current(persist_directory, model_name, sources):
+    """완성된 인덱스가 있고 같은 임베딩 모델, 같은 원본 문서와 청크 분할 방식으로 만들어졌는지 확인합니다.
+
+    원본 목록 파일(sources.json)이 없는 이전 버전 인덱스는 분할 방식을 알 수 없으므로 다시 생성합니다.
+    원본 문서가 없어 다시 생성할 수 없으면 경고 후 기존 인덱스를 사용합니다.
+    """
+    if not os.path.exists(os.path.join(persist_directory, "index.faiss")):
+        return False
+    model_file = os.path.join(persist_directory, MODEL_FILE)
+    if model_name and os.path.exists(model_file):
+        with open(model_file, "r", encoding="utf-8") as f:
+            built_with = f.read().strip()
+        if built_with != model_name:
+            logger.warning(f"FAISS 인덱스 임베딩 모델({built_with})과 현재 임베딩 모델({model_name})이 달라 다시 생성합니다: {persist_directory}")
+            return False
+    missing = [file_path for _, file_path in sources if not os.path.exists(file_path)]
+    if missing:
+        logger.warning(f"원본 문서가 없어 다시 생성할 수 없으므로 기존 FAISS 인덱스를 사용합니다: {', '.join(missing)}")
+        return True
+    built_from = _read_json(os.path.join(persist_directory, SOURCES_FILE))
+    if built_from is None:
+        logger.warning(f"원본 문서와 청크 분할 방식 기록이 없는 이전 버전 FAISS 인덱스이므로 다시 생성합니다: {persist_directory}")
+        return False
+    if built_from != sources_signature(sources):
+        logger.warning(f"원본 문서 또는 청크 분할 방식이 바뀌어 FAISS 인덱스를 다시 생성합니다: {persist_directory}")
+        return False
+    return True
+
+class IngestCheckpoint:
+    """수집 진행 상황 체크포인트 (부분 인덱스와 완료한 페이지 구간)
+
+    부분 인덱스와 진행 상황을 임시 디렉토리에 모두 쓴 뒤 디렉토리를 교체하므로,
+    중단되어도 마지막으로 교체된 체크포인트는 항상 인덱스와 진행 상황이 일치합니다.
+    """
+
+    def __init__(self, persist_directory, model_name, sources):
+        self.directory = os.path.join(persist_directory, INGEST_DIR)
+        self.model_name = model_name
+        self.signature = sources_signature(sources)
+
+    @property
+    def _current(self):
+        return os.path.join(self.directory, "current")
+
+    def load(self, embeddings):
+        """같은 모델/원본의 체크포인트가 있으면 (부분 인덱스, 완료 작업 키 집합, 청크 수)를 반환합니다."""
+        for path in (self._current, f"{self._current}.old"):
+            progress = _read_json(os.path.join(path, "progress.json"))
+            if progress is None:
+                continue
+            if progress.get("embedding_model") != self.model_name or progress.get("sources") != self.signature:
+                logger.info("임베딩 모델 또는 원본 문서가 달라 이전 수집 체크포인트를 사용하지 않습니다.")
+                return None, set(), 0
+            vector_db = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+            return vector_db, set(progress["done"]), progress["chunks"]
+        return None, set(), 0
+
+    def save(self, vector_db, done, chunks):
+        os.makedirs(self.directory, exist_ok=True)
+        staging = os.path.join(self.directory, "staging")
+        shutil.rmtree(staging, ignore_errors=True)
+        vector_db.save_local(staging)
+        _write_json(os.path.join(staging, "progress.json"), {
+            "embedding_model": self.model_name,
+            "sources": self.signature,
+            "done": sorted(done),
+            "chunks": chunks,
+            "saved_at": time.time()
+        })
+        old = f"{self._current}.old"
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.exists(self._current):
+            os.rename(self._current, old)
+        os.rename(staging, self._current)
+        shutil.rmtree(old, ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def build_faiss_index(sources, embeddings, persist_directory, workers=None, pages_per_task=None, embed_batch=None, checkpoint_chunks=None):
+    """PDF 문서들을 스트리밍으로 파싱, 분할, 임베딩하여 FAISS 인덱스를 생성합니다.
+
+    - 페이지 구간 단위로 프로세스 풀에서 파싱/분할하고, 청크는 생성기로 받아 embed_batch개씩 모아 임베딩
+    - checkpoint_chunks개마다 부분 인덱스와 완료한 페이지 구간을 저장하여, 중단 후 다시 실행하면 이어서 수집
+    sources는 (프레임워크 이름, PDF 경로) 목록입니다.
+    """
+    settings = ingest_settings()
+    embed_batch = embed_batch or settings["embed_batch"]
+    checkpoint_chunks = checkpoint_chunks or settings["checkpoint_chunks"]
+    model_name = getattr(embeddings, "model_name", None)
+    checkpoint = IngestCheckpoint(persist_directory, model_name, sources)
+
+    vector_db, done, total_chunks = checkpoint.load(embeddings)
+    if done:
+        logger.info(f"수집 체크포인트에서 재개: 완료 구간 {len(done)}개, 청크 {total_chunks}개")
+
+    started = time.perf_counter()
+    buffer, buffer_keys = [], []
+    since_checkpoint = 0
+
+    def flush():
+        """버퍼의 청크를 한 번에 임베딩하여 인덱스에 추가합니다 (페이지 구간 경계에서만 호출)."""
+        nonlocal vector_db
+        texts = [doc.page_content for doc in buffer]
+        vectors = embeddings.embed_documents(texts)
+        pairs = list(zip(texts, vectors))
+        metadatas = [doc.metadata for doc in buffer]
+        if vector_db is None:
+            vector_db = FAISS.from_embeddings(pairs, embeddings, metadatas=metadatas)
+        else:
+            vector_db.add_embeddings(pairs, metadatas=metadatas)
+        done.update(buffer_keys)
+        buffer.clear()
+        buffer_keys.clear()
+
+    for key, chunks in iter_chunks(sources, workers=workers, pages_per_task=pages_per_task, skip=done):
+        buffer += chunks
+        buffer_keys.append(key)
+        if len(buffer) < embed_batch:
+            continue
+        count = len(buffer)
+        flush()
+        total_chunks += count
+        since_checkpoint += count
+        if since_checkpoint >= checkpoint_chunks:
+            checkpoint.save(vector_db, done, total_chunks)
+            since_checkpoint = 0
+            logger.info(f"수집 체크포인트 저장: 청크 {total_chunks}개 ({time.perf_counter() - started:.1f}초)")
+    if buffer:
+        total_chunks += len(buffer)
+        flush()
+    if vector_db is None:
+        raise ValueError(f"수집할 텍스트가 없습니다: {[file_path for _, file_path in sources]}")
+
+    vector_db.save_local(persist_directory)
+    if model_name:
+        with open(os.path.join(persist_directory, MODEL_FILE), "w", encoding="utf-8") as f:
+            f.write(model_name)
+    _write_json(os.path.join(persist_directory, SOURCES_FILE), sources_signature(sources))
+    checkpoint.clear()
+    logger.info(f"FAISS 인덱스 생성 완료: 청크 {total_chunks}개, {time.perf_counter() - started:.1f}초 ({persist_directory})")
+    return vector_db
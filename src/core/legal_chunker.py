@@ -0,0 +1,166 @@
+import re
+
+from .framework_kb import HEADER_PATTERNS, ARTICLE_HEADING, ANNEX_HEADING, CHAPTER_HEADING, SENTENCE_SPLIT
+
+# 전문(Recital) 번호: "(27) ..." 형식으로 시작하는 줄 (첫 조항 이전에만 인식)
+RECITAL_START = re.compile(r"^\((\d+)\)\s+\S")
+# 조항 본문의 번호 항(paragraph)과 부록 항목: "1. ..." 형식으로 시작하는 줄
+PARAGRAPH_START = re.compile(r"^(\d+)\.\s+\S")
+SECTION_HEADING = re.compile(r"^SECTION\s+\d+\s*$")
+# 머리말을 뺀 청크 본문의 최소 길이와 머리말 최대 길이 (제목이 비정상적으로 길어도 본문 폭이 0 이하가 되지 않도록)
+MIN_BODY_CHARS = 200
+MAX_HEADING_CHARS = 200
+
+def _split_long(text, max_chars):
+    """max_chars보다 긴 항은 문장 경계에서 나눕니다."""
+    max_chars = max(1, max_chars)
+    pieces, current = [], ""
+    for sentence in SENTENCE_SPLIT.split(text):
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {sentence}".strip() if current else sentence
+        while len(current) > max_chars:
+            pieces.append(current[:max_chars])
+            current = current[max_chars:]
+    if current:
+        pieces.append(current)
+    return pieces
+
+class LegalChunker:
+    """법령 구조(전문 Recital, 조항 Article, 부록 Annex) 경계에서 청크를 나누는 스트리밍 청커
+
+    페이지 텍스트를 순서대로 받아(feed) 구조 단위가 끝날 때마다 (단위 키, 청크 목록)을 내보내므로
+    문서 전체를 메모리에 올리지 않습니다. 조항/부록이 max_chars보다 길면 번호 항(1., 2., ...) 단위로 묶어 나누고,
+    모든 청크 앞에 "Article 6 - 제목" 형식의 머리말을 붙이며 article/annex/recital, paragraphs, chapter, page 메타데이터를 기록합니다.
+    구조 단위 밖의 본문(text)은 페이지마다 내보내므로 조항 제목이 없는 문서(OECD, UNESCO 등)도 페이지 단위로 스트리밍/재개됩니다.
+    청크는 (내용, 메타데이터) 튜플입니다.
+    """
+
+    def __init__(self, framework, source, max_chars=1200):
+        self.framework = framework
+        self.source = source
+        self.max_chars = max_chars
+        self.chapter = None
+        self.seen_article = False
+        self.seen_annex = False
+        self.units = 0
+        self._unit = None
+
+    def _start(self, kind, number, page, first_line=None):
+        self._unit = {"kind": kind, "number": number, "title": None, "page": page, "lines": []}
+        if first_line:
+            self._unit["lines"].append(first_line)
+
+    def _flush(self):
+        """현재 구조 단위를 청크로 나누어 (단위 키, 청크 목록)을 반환합니다."""
+        unit, self._unit = self._unit, None
+        if unit is None or not any(line.strip() for line in unit["lines"]):
+            return None
+        self.units += 1
+        key = f"{self.framework}:{self.source}:{self.units}"
+        return key, self._chunks(unit)
+
+    def _chunks(self, unit):
+        kind, number, title = unit["kind"], unit["number"], unit["title"]
+        if kind == "article":
+            heading = f"Article {number}" + (f" - {title}" if title else "")
+        elif kind == "annex":
+            heading = f"ANNEX {number}" + (f" - {title}" if title else "")
+        elif kind == "recital":
+            heading = f"Recital {number}"
+        else:
+            heading = self.framework
+        heading = heading[:MAX_HEADING_CHARS]
+        width = max(self.max_chars - len(heading) - 1, MIN_BODY_CHARS)
+
+        # 번호 항 단위로 나눈 뒤 max_chars 안에서 연속된 항을 묶음
+        paragraphs = []
+        for line in unit["lines"]:
+            match = PARAGRAPH_START.match(line) if kind in ("article", "annex") else None
+            if match or not paragraphs:
+                paragraphs.append([match.group(1) if match else None, line])
+            else:
+                paragraphs[-1][1] += " " + line
+        groups = []
+        for label, text in paragraphs:
+            text = " ".join(text.split())
+            for piece in _split_long(text, width):
+                if groups and len(groups[-1][1]) + len(piece) + 1 <= width:
+                    groups[-1][0].append(label)
+                    groups[-1][1] += "\n" + piece
+                else:
+                    groups.append([[label], piece])
+
+        chunks = []
+        for labels, body in groups:
+            labels = [label for label in labels if label]
+            metadata = {
+                "source": self.source,
+                "framework": self.framework,
+                "page": unit["page"],
+                "unit": kind,
+                "heading": heading
+            }
+            if kind in ("article", "annex", "recital"):
+                metadata[kind] = number
+            if title:
+                metadata["title"] = title
+            if self.chapter and kind == "article":
+                metadata["chapter"] = self.chapter
+            if labels:
+                metadata["paragraphs"] = labels[0] if len(labels) == 1 else f"{labels[0]}-{labels[-1]}"
+            chunks.append((f"{heading}\n{body}", metadata))
+        return chunks
+
+    def feed(self, page, text):
+        """페이지 텍스트를 받아 끝난 구조 단위의 (단위 키, 청크 목록)을 내보냅니다."""
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or any(pattern.match(line) for pattern in HEADER_PATTERNS):
+                continue
+            chapter = CHAPTER_HEADING.match(line)
+            article = ARTICLE_HEADING.match(line) if not self.seen_annex else None
+            annex = ANNEX_HEADING.match(line)
+            recital = RECITAL_START.match(line) if not self.seen_article else None
+            if chapter or SECTION_HEADING.match(line):
+                flushed = self._flush()
+                if flushed:
+                    yield flushed
+                if chapter:
+                    self.chapter = chapter.group(1)
+                continue
+            if article or annex or recital:
+                flushed = self._flush()
+                if flushed:
+                    yield flushed
+                if article:
+                    self.seen_article = True
+                    self._start("article", article.group(1), page)
+                elif annex:
+                    self.seen_annex = True
+                    self._start("annex", annex.group(1), page)
+                else:
+                    self._start("recital", recital.group(1), page, first_line=line)
+                continue
+            if self._unit is None:
+                # 구조 단위 밖의 본문 (전문 도입부, 장 제목 등)
+                if self.chapter or self.seen_article or self.seen_annex:
+                    continue  # 장/절 제목은 다음 조항의 chapter 메타데이터로만 사용
+                self._start("text", None, page)
+            if self._unit["kind"] in ("article", "annex") and self._unit["title"] is None and not self._unit["lines"]:
+                # 조항/부록 번호 다음 줄은 제목
+                self._unit["title"] = line
+                continue
+            self._unit["lines"].append(line)
+        if self._unit is not None and self._unit["kind"] == "text":
+            # 구조 제목이 없는 본문은 문서 끝까지 모으지 않고 페이지마다 내보냄
+            flushed = self._flush()
+            if flushed:
+                yield flushed
+
+    def finish(self):
+        """마지막 구조 단위를 내보냅니다."""
+        flushed = self._flush()
+        if flushed:
+            yield flushed
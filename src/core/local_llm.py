@@ -0,0 +1,214 @@
+from loguru import logger
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from typing import Any, List, Optional
+import os
+import queue
+import threading
+import time
+
+# 로컬 모델 지정 형식: local:<backend>:<모델 경로 또는 이름>
+LOCAL_PREFIX = "local:"
+LOCAL_BACKENDS = ("llama.cpp", "seq2seq")
+
+def is_local_model(spec):
+    return bool(spec) and spec.startswith(LOCAL_PREFIX)
+
+def parse_local_model(spec):
+    """'local:llama.cpp:/models/model.gguf' 또는 'local:seq2seq:google/flan-t5-base'를 (backend, 경로)로 분리합니다."""
+    backend, _, path = spec[len(LOCAL_PREFIX):].partition(":")
+    if backend not in LOCAL_BACKENDS or not path:
+        raise ValueError(f"로컬 모델 지정 형식이 올바르지 않습니다: {spec} (예: local:llama.cpp:/models/model.gguf)")
+    return backend, path
+
+def _role(message):
+    if isinstance(message, SystemMessage):
+        return "system"
+    if isinstance(message, AIMessage):
+        return "assistant"
+    return "user"
+
+class LlamaCppGenerator:
+    """llama.cpp(GGUF) 모델로 채팅 응답을 생성합니다 (llama-cpp-python 필요)."""
+
+    def __init__(self, model_path, threads, context_size):
+        try:
+            from llama_cpp import Llama
+        except ImportError:
+            raise ImportError("로컬 llama.cpp 모델을 사용하려면 llama-cpp-python 패키지를 설치하세요.")
+        self.model = Llama(model_path=model_path, n_threads=threads, n_ctx=context_size, verbose=False)
+
+    def generate(self, conversations, max_tokens, temperature):
+        # llama.cpp 컨텍스트는 한 번에 한 시퀀스만 처리하므로 배치 안에서 순서대로 생성 (모델 로드와 스레드는 공유)
+        outputs = []
+        for messages in conversations:
+            response = self.model.create_chat_completion(
+                messages=[{"role": _role(message), "content": message.content} for message in messages],
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            outputs.append(response["choices"][0]["message"]["content"])
+        return outputs
+
+class Seq2SeqGenerator:
+    """작은 seq2seq 모델(예: flan-t5)로 배치 생성합니다 (transformers, torch 필요)."""
+
+    def __init__(self, model_name, threads, context_size):
+        try:
+            import torch
+            from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+        except ImportError:
+            raise ImportError("로컬 seq2seq 모델을 사용하려면 transformers와 torch 패키지를 설치하세요.")
+        torch.set_num_threads(threads)
+        self.torch = torch
+        self.context_size = context_size
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name).eval()
+
+    def generate(self, conversations, max_tokens, temperature):
+        prompts = ["\n\n".join(message.content for message in messages) for messages in conversations]
+        inputs = self.tokenizer(prompts, return_tensors="pt", padding=True, truncation=True, max_length=self.context_size)
+        with self.torch.no_grad():
+            output_ids = self.model.generate(
+                **inputs,
+                max_new_tokens=max_tokens,
+                do_sample=temperature > 0,
+                temperature=temperature if temperature > 0 else None
+            )
+        return self.tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+
+GENERATORS = {"llama.cpp": LlamaCppGenerator, "seq2seq": Seq2SeqGenerator}
+
+class LocalBatcher:
+    """동시에 들어온 생성 요청을 짧은 대기 시간 동안 모아 한 번에 생성하는 단일 워커
+
+    모델은 워커 스레드 하나가 독점하므로 CPU 스레드가 요청 수만큼 늘어나지 않습니다.
+    """
+
+    def __init__(self, generator, max_batch_size=8, batch_wait=0.02):
+        self.generator = generator
+        self.max_batch_size = max_batch_size
+        self.batch_wait = batch_wait
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="local-llm-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, messages, max_tokens, temperature):
+        future = Future()
+        self._queue.put((messages, max_tokens, temperature, future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # 생성 설정이 같은 요청끼리 한 번에 생성
+            groups = {}
+            for messages, max_tokens, temperature, future in batch:
+                groups.setdefault((max_tokens, temperature), []).append((messages, future))
+            for (max_tokens, temperature), items in groups.items():
+                started = time.perf_counter()
+                try:
+                    outputs = self.generator.generate([messages for messages, _ in items], max_tokens, temperature)
+                    for (_, future), output in zip(items, outputs):
+                        # 시간 초과로 호출자가 취소한 요청은 건너뜀
+                        if not future.done():
+                            future.set_result(output)
+                    logger.debug(f"로컬 LLM 배치 생성: {len(items)}건, {time.perf_counter() - started:.2f}초")
+                except Exception as e:
+                    for _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                # 생성기가 입력보다 적은 결과를 반환하면 남은 요청이 영원히 대기하지 않도록 실패 처리
+                unresolved = [future for _, future in items if not future.done()]
+                if unresolved:
+                    logger.error(f"로컬 LLM 배치 생성 결과 부족: {len(items)}건 중 {len(unresolved)}건 누락")
+                    for future in unresolved:
+                        future.set_exception(RuntimeError("로컬 LLM이 이 요청의 생성 결과를 반환하지 않았습니다."))
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+def get_local_batcher(backend, model_path, threads=None, context_size=None):
+    """모델별 배치 워커를 반환합니다. 모델 가중치는 프로세스에서 한 번만 로드하여 재사용합니다.
+
+    LOCAL_LLM_THREADS, LOCAL_LLM_CONTEXT, LOCAL_LLM_BATCH_SIZE, LOCAL_LLM_BATCH_WAIT_MS 환경 변수로 조정합니다.
+    """
+    threads = threads or int(os.getenv("LOCAL_LLM_THREADS", str(max(1, (os.cpu_count() or 2) // 2))))
+    context_size = context_size or int(os.getenv("LOCAL_LLM_CONTEXT", "4096"))
+    key = (backend, model_path, threads, context_size)
+    with _batchers_lock:
+        if key not in _batchers:
+            started = time.perf_counter()
+            generator = GENERATORS[backend](model_path, threads, context_size)
+            logger.info(f"로컬 LLM 로드 완료: {backend} {model_path} (스레드 {threads}개, {time.perf_counter() - started:.1f}초)")
+            _batchers[key] = LocalBatcher(
+                generator,
+                max_batch_size=int(os.getenv("LOCAL_LLM_BATCH_SIZE", "8")),
+                batch_wait=float(os.getenv("LOCAL_LLM_BATCH_WAIT_MS", "20")) / 1000
+            )
+        return _batchers[key]
+
+class LocalChatModel(BaseChatModel):
+    """로컬 CPU 모델(llama.cpp GGUF 또는 seq2seq)을 사용하는 채팅 모델
+
+    get_llm이 반환하는 모델과 같은 채팅 모델 인터페이스(invoke, ainvoke, 프롬프트 체이닝)를 제공하며,
+    네트워크 호출 없이 같은 프로세스의 배치 워커에서 생성합니다.
+    """
+    backend: str = "llama.cpp"
+    model_path: str
+    max_tokens: int = 512
+    temperature: float = 0.0
+    threads: Optional[int] = None
+    timeout: Optional[float] = None
+
+    @property
+    def _llm_type(self):
+        return f"local-{self.backend}"
+
+    @property
+    def model_name(self):
+        return f"{LOCAL_PREFIX}{self.backend}:{os.path.basename(self.model_path.rstrip('/'))}"
+
+    def _generate(self, messages: List[Any], stop=None, run_manager=None, **kwargs):
+        batcher = get_local_batcher(self.backend, self.model_path, self.threads)
+        future = batcher.submit(
+            messages,
+            kwargs.get("max_tokens", self.max_tokens),
+            kwargs.get("temperature", self.temperature)
+        )
+        try:
+            text = future.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"로컬 LLM 생성이 {self.timeout:.0f}초 안에 끝나지 않았습니다.")
+        if stop:
+            for token in stop:
+                text = text.split(token)[0]
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text.strip()))])
+
+def get_local_llm(spec, temperature=0.0):
+    """'local:<backend>:<경로>' 지정으로 로컬 채팅 모델을 초기화합니다 (가중치는 첫 호출 시 로드)."""
+    backend, model_path = parse_local_model(spec)
+    logger.info(f"로컬 LLM 모델 초기화: {backend} {model_path}")
+    return LocalChatModel(
+        backend=backend,
+        model_path=model_path,
+        max_tokens=int(os.getenv("LOCAL_LLM_MAX_TOKENS", "512")),
+        temperature=temperature,
+        timeout=float(os.getenv("LOCAL_LLM_TIMEOUT", "600")) or None
+    )
@@ -3,20 +3,67 @@ from langchain_community.embeddings import HuggingFaceEmbeddings
 from loguru import logger
 import os
 
-def get_llm(model_name="gpt-4o", temperature=0.0):
-    """LLM 모델을 초기화합니다."""
+from ..utils.resilience import ResilientChatModel, get_provider_guard
+from ..utils.http_client import get_http_client, get_async_http_client
+from ..utils.model_router import ModelRouter, parse_task_tiers
+from .local_llm import is_local_model, get_local_llm
+
+def get_llm(model_name="gpt-4o", temperature=0.0, resilient=True):
+    """LLM 모델을 초기화합니다.
+    
+    resilient=True이면 OpenAI 공급자 공유 보호 계층(적응형 속도 제한, 지터 지수 백오프 재시도,
+    회로 차단)으로 감싸며, 재시도는 보호 계층이 담당하므로 클라이언트 자체 재시도는 끕니다.
+    HTTP 연결은 동기(invoke), 비동기(ainvoke) 호출 모두 웹 검색 도구와 같은 프로세스 전역 연결 풀을 사용합니다.
+    """
     try:
         logger.info(f"LLM 모델 초기화: {model_name}")
         llm = ChatOpenAI(
             model=model_name,
             temperature=temperature,
-            api_key=os.getenv("OPENAI_API_KEY")
+            api_key=os.getenv("OPENAI_API_KEY"),
+            max_retries=0 if resilient else 2,
+            include_response_headers=resilient,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
         )
+        if resilient:
+            return ResilientChatModel(llm, get_provider_guard("openai"))
         return llm
     except Exception as e:
         logger.error(f"LLM 모델 초기화 실패: {e}")
         raise
 
+def get_chat_model(model_name, temperature=0.0):
+    """모델 지정에 맞는 채팅 모델을 초기화합니다 ('local:<backend>:<경로>'는 로컬 CPU 모델, 그 밖에는 OpenAI 모델)."""
+    if is_local_model(model_name):
+        return get_local_llm(model_name, temperature=temperature)
+    return get_llm(model_name=model_name, temperature=temperature)
+
+def get_model_router(large_model=None, small_model=None, temperature=0.0):
+    """작업 유형별 모델 등급 라우터를 초기화합니다.
+    
+    - large: 서비스 분석, 기준 분석, 윤리 평가, 보고서 작성 (LLM_MODEL, 기본 gpt-4o)
+    - small: 번역, 쿼리 생성/리라이팅, 키워드 추출 (LLM_SMALL_MODEL, 기본 gpt-4o-mini)
+    작업 유형 -> 등급 배정은 LLM_TASK_TIERS(예: "rewrite=large"), 등급별 동시 호출 수는
+    LLM_LARGE_CONCURRENCY, LLM_SMALL_CONCURRENCY 환경 변수로 조정합니다.
+    모델 이름을 'local:llama.cpp:/models/model.gguf'처럼 지정하면 해당 등급은 로컬 CPU 모델을 사용합니다.
+    """
+    large_model = large_model or os.getenv("LLM_MODEL", "gpt-4o")
+    small_model = small_model or os.getenv("LLM_SMALL_MODEL", "gpt-4o-mini")
+    large = get_chat_model(large_model, temperature=temperature)
+    tiers = {
+        "large": large,
+        "small": large if small_model == large_model else get_chat_model(small_model, temperature=temperature)
+    }
+    return ModelRouter(
+        tiers,
+        task_tiers=parse_task_tiers(os.getenv("LLM_TASK_TIERS")),
+        concurrency={
+            "large": int(os.getenv("LLM_LARGE_CONCURRENCY", "4")),
+            "small": int(os.getenv("LLM_SMALL_CONCURRENCY", "16"))
+        }
+    )
+
 def get_embeddings(model_name="BAAI/bge-m3"):
     """임베딩 모델을 초기화합니다."""
     try:
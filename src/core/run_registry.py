@@ -0,0 +1,253 @@
+from loguru import logger
+import gzip
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+from ..utils.artifacts import get_artifact_manager, RETENTION_KINDS
+
+RUN_COLUMNS = (
+    "workflow_id", "ai_service", "criteria", "status", "started_at", "finished_at",
+    "duration_seconds", "service_score", "criteria_score", "risk_score",
+    "report_path", "pdf_path", "state_path", "journal_path", "error"
+)
+
+# 직렬화된 상태(체크포인트, 단계 캐시, 저널, 상태 파일)에 기록된 blob 참조
+BLOB_REF = re.compile(r'"blob":\s*"([0-9a-f]{64})"')
+
+def _referenced_blobs(manager):
+    """체크포인트, 단계 결과 캐시, 남아 있는 저널과 상태 파일이 참조하는 blob 목록"""
+    refs = set()
+    databases = (
+        (os.getenv("CHECKPOINT_DB_PATH") or os.path.join(manager.root, "checkpoints", "checkpoints.db"), "SELECT state FROM checkpoints"),
+        (os.getenv("STAGE_CACHE_DB_PATH") or os.path.join(manager.root, "cache", "stage_cache.db"), "SELECT payload FROM stage_cache")
+    )
+    for db_path, query in databases:
+        if not os.path.exists(db_path):
+            continue
+        try:
+            conn = sqlite3.connect(db_path)
+            try:
+                for (text,) in conn.execute(query):
+                    refs.update(BLOB_REF.findall(text))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"blob 참조 확인 실패: {db_path} ({e})")
+    directories = [os.path.join(manager.root, "journals"), os.path.join(manager.root, "states"), os.getenv("STATE_JOURNAL_DIR")]
+    for base in filter(None, directories):
+        for directory, _, filenames in os.walk(base):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    opener = gzip.open if filename.endswith(".gz") else open
+                    with opener(path, "rt", encoding="utf-8") as f:
+                        refs.update(BLOB_REF.findall(f.read()))
+                except (OSError, UnicodeDecodeError) as e:
+                    logger.warning(f"blob 참조 확인 실패: {path} ({e})")
+    return refs
+
+def cleanup_artifacts(retention_days=None, db_path=None):
+    """보존 기간이 지난 산출물을 삭제하고, 실행 이력에서 삭제된 산출물 경로를 지웁니다. 삭제한 파일 수를 반환합니다.
+
+    blob은 다른 산출물을 정리한 뒤, 체크포인트, 단계 결과 캐시, 남아 있는 저널과 상태 파일이 참조하지 않는 것만 삭제합니다.
+    """
+    manager = get_artifact_manager()
+    removed = manager.cleanup(retention_days=retention_days, kinds=[kind for kind in RETENTION_KINDS if kind != "blobs"])
+    referenced = None
+
+    def still_referenced(kind, filepath):
+        nonlocal referenced
+        # 보존 기간이 지난 blob이 있을 때만 참조 목록을 한 번 계산
+        if referenced is None:
+            referenced = _referenced_blobs(manager)
+        return os.path.basename(filepath).split(".", 1)[0] in referenced
+
+    removed += manager.cleanup(retention_days=retention_days, kinds=("blobs",), keep=still_referenced)
+    if removed:
+        registry = RunRegistry(db_path or os.getenv("RUN_REGISTRY_DB_PATH"))
+        try:
+            registry.prune_missing_artifacts()
+        finally:
+            registry.close()
+    return removed
+
+class RunRegistry:
+    """과거 분석 실행을 인덱싱하는 SQLite 기반 실행 이력 저장소"""
+
+    def __init__(self, db_path=None):
+        db_path = db_path or get_artifact_manager().path("runs", "runs.db")
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    workflow_id TEXT PRIMARY KEY,
+                    ai_service TEXT NOT NULL COLLATE NOCASE,
+                    criteria TEXT NOT NULL COLLATE NOCASE,
+                    status TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT,
+                    duration_seconds REAL,
+                    service_score INTEGER,
+                    criteria_score INTEGER,
+                    risk_score INTEGER,
+                    report_path TEXT,
+                    pdf_path TEXT,
+                    state_path TEXT,
+                    journal_path TEXT,
+                    error TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_runs_service_criteria ON runs (ai_service, criteria, started_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_runs_status ON runs (status, started_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at DESC);
+
+                CREATE TABLE IF NOT EXISTS run_keywords (
+                    workflow_id TEXT NOT NULL,
+                    keyword TEXT NOT NULL COLLATE NOCASE,
+                    PRIMARY KEY (workflow_id, keyword)
+                );
+                CREATE INDEX IF NOT EXISTS idx_run_keywords_keyword ON run_keywords (keyword);
+
+                CREATE TABLE IF NOT EXISTS run_timings (
+                    workflow_id TEXT NOT NULL,
+                    node TEXT NOT NULL,
+                    seconds REAL NOT NULL,
+                    recorded_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_run_timings_workflow ON run_timings (workflow_id);
+                """
+            )
+
+    def start_run(self, state, journal_path=None):
+        """실행 시작을 기록합니다. 재개 실행이면 기존 행의 상태만 갱신합니다."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO runs (workflow_id, ai_service, criteria, status, started_at, journal_path)
+                VALUES (?, ?, ?, 'processing', ?, ?)
+                ON CONFLICT(workflow_id) DO UPDATE SET status = 'processing', finished_at = NULL, error = NULL,
+                    journal_path = COALESCE(excluded.journal_path, runs.journal_path)
+                """,
+                (state.workflow_id, state.ai_service, state.criteria, datetime.now().isoformat(), journal_path)
+            )
+        logger.info(f"실행 이력 등록: {state.workflow_id} ({state.ai_service}, {state.criteria})")
+
+    def record_node(self, workflow_id, node, seconds):
+        """노드 실행 시간을 기록합니다."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO run_timings (workflow_id, node, seconds, recorded_at) VALUES (?, ?, ?, ?)",
+                (workflow_id, node, seconds, datetime.now().isoformat())
+            )
+
+    def finish_run(self, state, status, pdf_path=None, state_path=None, error=None):
+        """실행 종료 시 상태, 점수, 키워드, 산출물 경로를 기록합니다."""
+        finished_at = datetime.now()
+        scores = list(state.state_score or []) + [None, None, None]
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT started_at FROM runs WHERE workflow_id = ?", (state.workflow_id,)
+            ).fetchone()
+            duration = None
+            if row is not None:
+                duration = (finished_at - datetime.fromisoformat(row["started_at"])).total_seconds()
+            self._conn.execute(
+                """
+                UPDATE runs SET status = ?, finished_at = ?, duration_seconds = ?,
+                    service_score = ?, criteria_score = ?, risk_score = ?,
+                    report_path = ?, pdf_path = ?, state_path = COALESCE(?, state_path), error = ?
+                WHERE workflow_id = ?
+                """,
+                (status, finished_at.isoformat(), duration, scores[0], scores[1], scores[2],
+                 state.report_path, pdf_path, state_path, error, state.workflow_id)
+            )
+            self._conn.execute("DELETE FROM run_keywords WHERE workflow_id = ?", (state.workflow_id,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO run_keywords (workflow_id, keyword) VALUES (?, ?)",
+                [(state.workflow_id, keyword) for keyword in (state.ethical_risk_keywords or [])]
+            )
+        logger.info(f"실행 이력 갱신: {state.workflow_id} ({status})")
+
+    def list_runs(self, service=None, criteria=None, status=None, keyword=None, limit=20):
+        """조건에 맞는 실행을 최신순으로 반환합니다."""
+        query = "SELECT runs.* FROM runs"
+        conditions = []
+        params = []
+        if keyword:
+            query += " JOIN run_keywords ON run_keywords.workflow_id = runs.workflow_id"
+            conditions.append("run_keywords.keyword = ?")
+            params.append(keyword)
+        if service:
+            conditions.append("runs.ai_service = ?")
+            params.append(service)
+        if criteria:
+            conditions.append("runs.criteria = ?")
+            params.append(criteria)
+        if status:
+            conditions.append("runs.status = ?")
+            params.append(status)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY runs.started_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_run(self, service, criteria=None, status="completed"):
+        """서비스(와 기준)의 가장 최근 실행을 반환합니다."""
+        runs = self.list_runs(service=service, criteria=criteria, status=status, limit=1)
+        return runs[0] if runs else None
+
+    def get_run(self, workflow_id):
+        """실행 1건을 키워드, 노드별 실행 시간과 함께 반환합니다."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM runs WHERE workflow_id = ?", (workflow_id,)).fetchone()
+            if row is None:
+                return None
+            keywords = self._conn.execute(
+                "SELECT keyword FROM run_keywords WHERE workflow_id = ? ORDER BY keyword", (workflow_id,)
+            ).fetchall()
+            timings = self._conn.execute(
+                "SELECT node, seconds FROM run_timings WHERE workflow_id = ? ORDER BY recorded_at", (workflow_id,)
+            ).fetchall()
+        run = dict(row)
+        run["keywords"] = [keyword["keyword"] for keyword in keywords]
+        run["timings"] = [(timing["node"], timing["seconds"]) for timing in timings]
+        return run
+
+    def prune_missing_artifacts(self):
+        """삭제된 산출물(보고서, PDF, 상태, 저널)을 가리키는 경로를 실행 이력에서 지우고 갱신한 행 수를 반환합니다."""
+        path_columns = ("report_path", "pdf_path", "state_path", "journal_path")
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT workflow_id, {', '.join(path_columns)} FROM runs WHERE "
+                + " OR ".join(f"{column} IS NOT NULL" for column in path_columns)
+            ).fetchall()
+            updated = 0
+            for row in rows:
+                missing = [column for column in path_columns if row[column] and not os.path.exists(row[column])]
+                if not missing:
+                    continue
+                self._conn.execute(
+                    f"UPDATE runs SET {', '.join(f'{column} = NULL' for column in missing)} WHERE workflow_id = ?",
+                    (row["workflow_id"],)
+                )
+                updated += 1
+        if updated:
+            logger.info(f"삭제된 산출물 경로를 실행 이력에서 제거: {updated}건")
+        return updated
+
+    def close(self):
+        """SQLite 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
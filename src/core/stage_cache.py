@@ -0,0 +1,217 @@
+from loguru import logger
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .state import serialize_message, deserialize_message
+from ..utils.artifacts import get_artifact_manager
+
+# 실패/재시도 신호로 쓰이는 메시지는 캐시하지 않음
+FAILURE_MARKERS = ("오류가 발생했습니다", "에러:", "관련 정보 없음", "분석할 수 없는 서비스")
+
+def prompt_fingerprint(*parts):
+    """프롬프트 템플릿과 에이전트 코드(인라인 프롬프트 포함)의 해시를 계산합니다."""
+    texts = []
+    for part in parts:
+        messages = getattr(part, "messages", None)
+        if messages is not None:
+            # ChatPromptTemplate: 각 메시지 템플릿 문자열 사용
+            for message in messages:
+                texts.append(getattr(getattr(message, "prompt", None), "template", str(message)))
+        elif callable(part):
+            # 에이전트 팩토리: 소스 코드에 포함된 인라인 프롬프트까지 반영
+            try:
+                texts.append(inspect.getsource(part))
+            except (OSError, TypeError):
+                texts.append(f"{part.__module__}.{part.__qualname__}")
+        else:
+            texts.append(str(part))
+    return hashlib.sha256("\n".join(texts).encode("utf-8")).hexdigest()[:16]
+
+def _serialize_value(value):
+    """메시지 객체를 포함한 값을 JSON 직렬화 가능한 형태로 변환합니다."""
+    if hasattr(value, "content") and hasattr(value, "type"):
+        return {"__message__": serialize_message(value)}
+    return value
+
+def _deserialize_value(value):
+    if isinstance(value, dict) and "__message__" in value:
+        return deserialize_message(value["__message__"])
+    return value
+
+def is_cacheable(result):
+    """노드 결과가 정상 결과인지(실패/재시도 신호가 아닌지) 확인합니다."""
+    if not result:
+        return False
+    # 기준 검색 재시도 신호 (criteria_info 없이 query_attempt만 증가)
+    if result.get("query_attempt"):
+        return False
+    for value in result.values():
+        content = getattr(value, "content", None)
+        if isinstance(content, str) and any(marker in content for marker in FAILURE_MARKERS):
+            return False
+    return True
+
+class StageCache:
+    """노드 이름, 입력 필드, 프롬프트 버전, 모델로 키를 만드는 실행 간 단계 결과 캐시
+
+    프롬프트 버전은 키에만 반영하므로 설정이 다른 워크플로우(중간 산출물 언어, 임베딩 인덱스, 모델 등급)가
+    번갈아 실행되어도 서로의 항목을 지우지 않습니다. 더 이상 적중하지 않는 이전 버전 항목은
+    시작 시 정리(cleanup)에서 TTL과 최대 항목 수(오래된 항목부터) 기준으로 삭제됩니다.
+    """
+
+    def __init__(self, db_path=None, ttl_seconds=None, max_entries=None):
+        db_path = db_path or get_artifact_manager().path("cache", "stage_cache.db")
+        self.db_path = db_path
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("STAGE_CACHE_TTL_HOURS", "24")) * 3600
+        self.ttl_seconds = ttl_seconds
+        if max_entries is None:
+            max_entries = int(os.getenv("STAGE_CACHE_MAX_ENTRIES", "2000"))
+        self.max_entries = max_entries
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS stage_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    node TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_stage_cache_node ON stage_cache (node)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_stage_cache_created_at ON stage_cache (created_at)")
+        logger.info(f"단계 결과 캐시 초기화: {db_path} (TTL {self.ttl_seconds / 3600:.1f}시간, 최대 {self.max_entries}개)")
+        self.cleanup()
+
+    @staticmethod
+    def make_key(node, inputs, prompt_version, model):
+        """캐시 키를 계산합니다. inputs는 노드 결과에 영향을 주는 상태 필드만 포함해야 합니다."""
+        raw = json.dumps(
+            {
+                "node": node,
+                "inputs": {key: _serialize_value(value) for key, value in sorted(inputs.items())},
+                "prompt_version": prompt_version,
+                "model": model
+            },
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """캐시된 노드 결과를 반환합니다. 없거나 TTL이 지난 경우 None을 반환합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM stage_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[1] > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM stage_cache WHERE cache_key = ?", (key,))
+                return None
+        return {field: _deserialize_value(value) for field, value in json.loads(row[0]).items()}
+
+    def put(self, key, node, prompt_version, model, result):
+        """노드 결과를 캐시에 저장합니다."""
+        payload = json.dumps(
+            {field: _serialize_value(value) for field, value in result.items()},
+            ensure_ascii=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stage_cache (cache_key, node, prompt_version, model, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, node, prompt_version, model, payload, time.time())
+            )
+
+    def invalidate(self, node=None, prompt_version=None):
+        """노드(또는 특정 프롬프트 버전이 아닌 항목)의 캐시를 삭제합니다."""
+        query = "DELETE FROM stage_cache WHERE 1 = 1"
+        params = []
+        if node is not None:
+            query += " AND node = ?"
+            params.append(node)
+        if prompt_version is not None:
+            query += " AND prompt_version != ?"
+            params.append(prompt_version)
+        with self._lock, self._conn:
+            deleted = self._conn.execute(query, params).rowcount
+        logger.info(f"단계 결과 캐시 삭제: {deleted}건 (node={node})")
+        return deleted
+
+    def purge_expired(self):
+        """TTL이 지난 캐시 항목을 삭제합니다."""
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM stage_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+        return deleted
+
+    def evict_oldest(self):
+        """최대 항목 수를 넘는 가장 오래된 항목을 삭제합니다."""
+        if not self.max_entries or self.max_entries <= 0:
+            return 0
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM stage_cache WHERE cache_key IN (SELECT cache_key FROM stage_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+        return deleted
+
+    def cleanup(self):
+        """TTL이 지난 항목과 최대 항목 수를 넘는 오래된 항목(이전 프롬프트 버전 포함)을 삭제합니다."""
+        try:
+            expired = self.purge_expired()
+            evicted = self.evict_oldest()
+        except sqlite3.Error as e:
+            logger.error(f"단계 결과 캐시 정리 실패: {e}")
+            return 0
+        if expired or evicted:
+            logger.info(f"단계 결과 캐시 정리: 만료 {expired}건, 용량 초과 {evicted}건 삭제")
+        return expired + evicted
+
+    def wrap(self, node_name, node_fn, input_fields, prompt_version, model):
+        """캐시 적중 시 노드 실행을 건너뛰고 저장된 결과를 반환하는 래퍼를 만듭니다.
+
+        조회 키에 프롬프트 버전이 포함되므로 다른 버전의 항목은 지우지 않고 그대로 둡니다.
+        """
+        def run(state):
+            inputs = {field: getattr(state, field, None) for field in input_fields}
+            key = self.make_key(node_name, inputs, prompt_version, model)
+            try:
+                cached = self.get(key)
+            except Exception as e:
+                logger.error(f"단계 결과 캐시 조회 실패 ({node_name}): {e}")
+                cached = None
+            if cached is not None:
+                logger.info(f"단계 결과 캐시 적중: {node_name} - 노드 실행을 건너뜁니다.")
+                return cached
+
+            result = node_fn(state)
+            if is_cacheable(result):
+                try:
+                    self.put(key, node_name, prompt_version, model, result)
+                    logger.info(f"단계 결과 캐시 저장: {node_name}")
+                except Exception as e:
+                    logger.error(f"단계 결과 캐시 저장 실패 ({node_name}): {e}")
+            return result
+        return run
+
+    def close(self):
+        """SQLite 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
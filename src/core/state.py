@@ -1,14 +1,87 @@
-from typing import Dict, List, Optional, Union, Any
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Any
+from pydantic import BaseModel, Field, field_validator
 from loguru import logger
 from langchain_core.messages import AIMessage, HumanMessage
+from dataclasses import dataclass
 import json
 import os
 import uuid
 from datetime import datetime
 
-# 메시지 유형 정의
-MessageType = Union[AIMessage, HumanMessage]
+from .blob_store import get_blob_store
+from ..utils.logger import log_payload
+from ..utils.artifacts import get_artifact_manager
+
+# 메시지 객체를 저장하는 상태 필드
+MESSAGE_FIELDS = ("service_info", "criteria_info", "risk_message")
+
+# 이 길이(문자 수)를 넘는 메시지 내용은 blob 저장소에 저장하고 참조만 보관
+INLINE_LIMIT = int(os.getenv("STATE_INLINE_LIMIT", "2048"))
+
+@dataclass(slots=True)
+class MessageRecord:
+    """상태에 저장하는 경량 메시지 표현
+
+    LangChain 메시지 객체 대신 메시지 유형과 내용만 보관하며, 긴 내용은 blob 저장소 참조로 대체합니다.
+    에이전트는 기존과 같이 .content로 내용을 읽습니다.
+    """
+    type: str = "AIMessage"
+    text: Optional[str] = None
+    blob: Optional[str] = None
+    length: int = 0
+
+    @classmethod
+    def from_text(cls, content, type="AIMessage"):
+        content = content if isinstance(content, str) else str(content)
+        if len(content) > INLINE_LIMIT:
+            return cls(type=type, blob=get_blob_store().put(content), length=len(content))
+        return cls(type=type, text=content, length=len(content))
+
+    @property
+    def content(self):
+        if self.blob is not None:
+            return get_blob_store().get(self.blob)
+        return self.text or ""
+
+    def to_message(self):
+        """LangChain 메시지 객체로 변환합니다."""
+        if self.type == "HumanMessage":
+            return HumanMessage(content=self.content)
+        return AIMessage(content=self.content)
+
+# LangGraph 체크포인터가 그래프 채널 값(MessageRecord)을 msgpack으로 복원할 수 있도록 등록할 타입
+MSGPACK_ALLOWLIST = [(MessageRecord.__module__, MessageRecord.__name__)]
+
+def to_message_record(value):
+    """메시지 객체, 직렬화된 딕셔너리({"type", "content"} 또는 {"type", "blob", "length"}), 문자열을 MessageRecord로 변환합니다."""
+    if value is None or isinstance(value, MessageRecord):
+        return value
+    if isinstance(value, dict):
+        if "content" in value:
+            return MessageRecord.from_text(value["content"], value.get("type", "AIMessage"))
+        return MessageRecord(**value)
+    if isinstance(value, str):
+        return MessageRecord.from_text(value)
+    return MessageRecord.from_text(value.content, value.__class__.__name__)
+
+def serialize_message(message):
+    """메시지 객체(또는 MessageRecord)를 JSON 직렬화 가능한 딕셔너리로 변환합니다.
+
+    INLINE_LIMIT 이하의 내용은 {"type", "content"}로 인라인하고, 긴 내용은 blob을 다시 읽지 않고
+    {"type", "blob", "length"} 참조만 기록합니다 (체크포인트, 저널, 상태 파일, 단계 캐시가 같은 blob을 공유).
+    """
+    if message is None:
+        return None
+    record = to_message_record(message)
+    if record.blob is not None:
+        return {"type": record.type, "blob": record.blob, "length": record.length}
+    return {"type": record.type, "content": record.text or ""}
+
+def deserialize_message(data):
+    """serialize_message로 변환된 딕셔너리를 MessageRecord로 복원합니다 (blob 참조는 읽을 때 해석)."""
+    if not data or not isinstance(data, dict):
+        return data
+    return to_message_record(data)
 
 class EthicsState(BaseModel):
     """AI 윤리성 리스크 진단 시스템의 상태를 관리하는 클래스"""
@@ -18,14 +91,19 @@ class EthicsState(BaseModel):
     criteria: str = Field(default="", description="선택된 윤리 기준 (예: EU AI Act)")
     
     # 에이전트 관련 상태
-    service_info: Optional[MessageType] = Field(default=None, description="서비스 입력 에이전트가 생성한 서비스 설명")
+    service_info: Optional[MessageRecord] = Field(default=None, description="서비스 입력 에이전트가 생성한 서비스 설명")
     ethical_risk_keywords: Optional[List[str]] = Field(default=None, description="서비스 입력 에이전트가 식별한 윤리적 리스크 키워드 목록")
-    criteria_info: Optional[MessageType] = Field(default=None, description="기준 검색 에이전트가 생성한 관련 윤리 기준")
-    risk_message: Optional[MessageType] = Field(default=None, description="윤리 평가 에이전트가 생성한 리스크 분석")
+    criteria_info: Optional[MessageRecord] = Field(default=None, description="기준 검색 에이전트가 생성한 관련 윤리 기준")
+    risk_message: Optional[MessageRecord] = Field(default=None, description="윤리 평가 에이전트가 생성한 리스크 분석")
     
     # 검색 관련 상태
     query_attempt: int = Field(default=0, description="쿼리 시도 횟수")
     last_query: Optional[str] = Field(default=None, description="마지막 실행된 검색 쿼리")
+    tried_queries: List[str] = Field(default_factory=list, description="기준 검색 재시도 중 이미 실행한 쿼리 (정규화, 웹 검색은 'web:' 접두어)")
+    evidence_pool: List[Dict[str, Any]] = Field(default_factory=list, description="기준 검색 재시도 간 누적된 근거")
+    search_keywords: Optional[List[str]] = Field(default=None, description="기준 검색용 영어 키워드 (재시도 시 재사용)")
+    search_elapsed: float = Field(default=0.0, description="기준 검색 재시도 루프에서 사용한 시간(초)")
+    english_keywords: Optional[List[str]] = Field(default=None, description="기준 검색에 사용한 영어 리스크 키워드 (키워드 x 조항 매핑, 영어 중간 산출물 모드의 윤리 평가에 사용)")
     
     # 상태 점수 (품질 평가)
     state_score: List[int] = Field(default=[0, 0, 0], description="각 상태의 품질 점수 [service_info, criteria_info, risk_message]")
@@ -41,27 +119,27 @@ class EthicsState(BaseModel):
     created_at: str = Field(default_factory=lambda: datetime.now().isoformat(), description="워크플로우 생성 시간")
     updated_at: str = Field(default_factory=lambda: datetime.now().isoformat(), description="워크플로우 업데이트 시간")
     
+    @field_validator(*MESSAGE_FIELDS, mode="before")
+    @classmethod
+    def _compact_message(cls, value):
+        """노드가 반환한 메시지 객체를 경량 MessageRecord로 변환합니다."""
+        return to_message_record(value)
+    
     def update_state(self, **kwargs):
         """상태를 업데이트합니다."""
         for key, value in kwargs.items():
             if hasattr(self, key):
+                if key in MESSAGE_FIELDS:
+                    value = to_message_record(value)
                 setattr(self, key, value)
                 
-                # 메시지 내용 로그 출력
-                if key in ["service_info", "criteria_info", "risk_message"] and value is not None:
-                    logger.info(f"======= {key.upper()} 생성 결과 =======")
-                    logger.info(f"{value.content[:500]}...")
-                    logger.info(f"================================")
-                    print(f"\n======= {key.upper()} 생성 결과 =======")
-                    print(f"{value.content[:500]}...")
-                    print(f"================================\n")
+                # 메시지 생성 결과 로그 출력 (내용 미리보기는 샘플링)
+                if key in MESSAGE_FIELDS and value is not None and value.blob is None:
+                    log_payload(f"{key.upper()} 생성 결과", value.content)
+                elif key in MESSAGE_FIELDS and value is not None:
+                    logger.info(f"{key.upper()} 생성 결과 ({value.length} 자, blob {value.blob[:12]})")
                 elif key == "ethical_risk_keywords" and value is not None:
-                    logger.info(f"======= 윤리적 리스크 키워드 =======")
-                    logger.info(f"{value}")
-                    logger.info(f"================================")
-                    print(f"\n======= 윤리적 리스크 키워드 =======")
-                    print(f"{value}")
-                    print(f"================================\n")
+                    logger.info(f"윤리적 리스크 키워드: {value}")
         
         # 업데이트 시간 갱신
         self.updated_at = datetime.now().isoformat()
@@ -76,76 +154,62 @@ class EthicsState(BaseModel):
             logger.error(f"유효하지 않은 상태 점수 인덱스: {index}")
     
     def log_current_state(self):
-        """현재 상태를 로그로 출력합니다."""
+        """현재 상태 요약을 구조화된 로그 레코드 1개로 출력합니다 (debug 레벨)."""
         try:
-            logger.info(f"====== 현재 워크플로우 상태 ======")
-            logger.info(f"서비스: {self.ai_service}")
-            logger.info(f"윤리 기준: {self.criteria}")
-            logger.info(f"워크플로우 상태: {self.workflow_status}")
-            
-            if self.service_info:
-                logger.info(f"서비스 정보: 생성됨 ({len(self.service_info.content)} 자)")
-            
-            if self.ethical_risk_keywords:
-                # 너무 길면 로그가 깨질 수 있으므로 키워드 수만 표시
-                if len(self.ethical_risk_keywords) > 5:
-                    logger.info(f"윤리적 리스크 키워드: {len(self.ethical_risk_keywords)}개 (첫 5개: {self.ethical_risk_keywords[:5]})")
-                else:
-                    logger.info(f"윤리적 리스크 키워드: {self.ethical_risk_keywords}")
-            
-            if self.criteria_info:
-                logger.info(f"윤리 기준 정보: 생성됨 ({len(self.criteria_info.content)} 자)")
-            
-            if self.risk_message:
-                logger.info(f"리스크 분석: 생성됨 ({len(self.risk_message.content)} 자)")
-            
-            if self.report_path:
-                logger.info(f"보고서 경로: {self.report_path}")
-            
-            logger.info(f"쿼리 시도 횟수: {self.query_attempt}")
-            
-            if self.last_query:
-                # 쿼리가 너무 길면 로그가 깨질 수 있으므로 길이 제한
-                if len(self.last_query) > 50:
-                    logger.info(f"마지막 쿼리: {self.last_query[:50]}...")
-                else:
-                    logger.info(f"마지막 쿼리: {self.last_query}")
-            
-            logger.info(f"================================")
+            summary = {
+                "ai_service": self.ai_service,
+                "criteria": self.criteria,
+                "workflow_status": self.workflow_status,
+                "service_info_chars": self.service_info.length if self.service_info else 0,
+                "keywords": len(self.ethical_risk_keywords or []),
+                "criteria_info_chars": self.criteria_info.length if self.criteria_info else 0,
+                "risk_message_chars": self.risk_message.length if self.risk_message else 0,
+                "report_path": self.report_path,
+                "query_attempt": self.query_attempt,
+                "evidence_pool": len(self.evidence_pool)
+            }
+            logger.bind(state=summary).debug(f"현재 워크플로우 상태: {summary}")
         except Exception as e:
             logger.error(f"상태 로깅 중 오류 발생: {e}")
     
-    def save_state(self, directory="ai_agent/outputs/states"):
-        """현재 상태를 JSON 파일로 저장합니다."""
+    def to_dict(self):
+        """메시지를 포함한 상태를 JSON 직렬화 가능한 딕셔너리로 변환합니다."""
+        data = self.model_dump(exclude=set(MESSAGE_FIELDS))
+        for key in MESSAGE_FIELDS:
+            data[key] = serialize_message(getattr(self, key))
+        return data
+    
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict로 직렬화된 딕셔너리에서 상태를 복원합니다."""
+        data = dict(data)
+        for key in MESSAGE_FIELDS:
+            if key in data:
+                data[key] = deserialize_message(data[key])
+        return cls(**data)
+    
+    def apply(self, updates):
+        """노드 출력(updates)을 반영한 새 상태를 반환합니다."""
+        updates = {key: value for key, value in (updates or {}).items() if key in type(self).model_fields}
+        # model_copy(update=...)는 검증기를 거치지 않으므로 메시지 필드는 직접 변환
+        for key in MESSAGE_FIELDS:
+            if key in updates:
+                updates[key] = to_message_record(updates[key])
+        return self.model_copy(update=updates)
+    
+    def save_state(self, directory=None):
+        """현재 상태를 JSON 파일로 저장합니다 (기본 경로: 산출물 루트의 날짜/실행 ID별 states 디렉토리)."""
+        artifacts = get_artifact_manager()
+        directory = directory or artifacts.shard_dir("states", self.workflow_id)
         os.makedirs(directory, exist_ok=True)
         filename = f"state_{self.workflow_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         filepath = os.path.join(directory, filename)
         
         # 직렬화 가능한 데이터로 변환
-        serializable_data = self.dict(exclude={"service_info", "criteria_info", "risk_message"})
-        
-        # 메시지 직렬화
-        if self.service_info:
-            serializable_data["service_info"] = {
-                "type": self.service_info.__class__.__name__,
-                "content": self.service_info.content
-            }
-        
-        if self.criteria_info:
-            serializable_data["criteria_info"] = {
-                "type": self.criteria_info.__class__.__name__,
-                "content": self.criteria_info.content
-            }
-        
-        if self.risk_message:
-            serializable_data["risk_message"] = {
-                "type": self.risk_message.__class__.__name__,
-                "content": self.risk_message.content
-            }
+        serializable_data = self.to_dict()
         
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(serializable_data, f, ensure_ascii=False, indent=2)
+            artifacts.write_json(filepath, serializable_data)
             logger.info(f"상태 저장 완료: {filepath}")
             return filepath
         except Exception as e:
@@ -159,32 +223,7 @@ class EthicsState(BaseModel):
             with open(filepath, "r", encoding="utf-8") as f:
                 data = json.load(f)
             
-            # 메시지 객체 복원
-            if "service_info" in data and data["service_info"]:
-                msg_type = data["service_info"]["type"]
-                msg_content = data["service_info"]["content"]
-                if msg_type == "AIMessage":
-                    data["service_info"] = AIMessage(content=msg_content)
-                elif msg_type == "HumanMessage":
-                    data["service_info"] = HumanMessage(content=msg_content)
-            
-            if "criteria_info" in data and data["criteria_info"]:
-                msg_type = data["criteria_info"]["type"]
-                msg_content = data["criteria_info"]["content"]
-                if msg_type == "AIMessage":
-                    data["criteria_info"] = AIMessage(content=msg_content)
-                elif msg_type == "HumanMessage":
-                    data["criteria_info"] = HumanMessage(content=msg_content)
-            
-            if "risk_message" in data and data["risk_message"]:
-                msg_type = data["risk_message"]["type"]
-                msg_content = data["risk_message"]["content"]
-                if msg_type == "AIMessage":
-                    data["risk_message"] = AIMessage(content=msg_content)
-                elif msg_type == "HumanMessage":
-                    data["risk_message"] = HumanMessage(content=msg_content)
-            
-            state = cls(**data)
+            state = cls.from_dict(data)
             logger.info(f"상태 로드 완료: {filepath}")
             return state
         except Exception as e:
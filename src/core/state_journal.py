@@ -0,0 +1,84 @@
+from loguru import logger
+import gzip
+import json
+import os
+from datetime import datetime
+
+from .state import EthicsState
+from ..utils.artifacts import get_artifact_manager
+
+def _open_journal(path, mode):
+    """압축 여부(.gz 확장자)에 맞게 저널 파일을 엽니다."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def iter_journal(path):
+    """저널 레코드를 기록 순서대로 반환합니다."""
+    with _open_journal(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def replay_journal(path, step=None):
+    """저널을 재생하여 step 시점(기본값: 마지막)의 상태 딕셔너리와 step 번호를 반환합니다."""
+    data = {}
+    last_step = -1
+    for record in iter_journal(path):
+        if step is not None and record["step"] > step:
+            break
+        data.update(record["changes"])
+        last_step = record["step"]
+    return data, last_step
+
+def load_journal_state(path, step=None):
+    """저널에서 특정 step(기본값: 마지막)의 EthicsState를 복원합니다."""
+    data, last_step = replay_journal(path, step)
+    if last_step < 0:
+        raise ValueError(f"저널에 복원할 레코드가 없습니다: {path}")
+    state = EthicsState.from_dict(data)
+    logger.info(f"저널에서 상태 복원 완료: {path} (step={last_step})")
+    return state
+
+class StateJournal:
+    """실행별 append-only 상태 저널. 매 단계마다 변경된 필드만 JSON Lines로 기록합니다."""
+
+    def __init__(self, workflow_id, directory=None, compress=None):
+        if compress is None:
+            compress = os.getenv("STATE_JOURNAL_COMPRESS", "false").lower() in ("1", "true", "yes")
+        # 재개 실행에서 같은 저널을 찾을 수 있도록 날짜 없이 실행 ID 앞 2자리로만 디렉토리 분할
+        directory = directory or get_artifact_manager().shard_dir("journals", workflow_id, dated=False)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{workflow_id}.jsonl" + (".gz" if compress else ""))
+
+        # 기존 저널이 있으면(재개 실행) 마지막 상태에서 이어서 기록
+        self._last = {}
+        self._step = -1
+        if os.path.exists(self.path):
+            self._last, self._step = replay_journal(self.path)
+
+    def append(self, state, node=None):
+        """이전 기록과 달라진 필드만 새 레코드로 추가합니다. 변경이 없으면 기록하지 않습니다."""
+        current = state.to_dict()
+        changes = {key: value for key, value in current.items() if key not in self._last or self._last[key] != value}
+        # updated_at만 바뀐 경우는 기록하지 않음
+        if not set(changes) - {"updated_at"}:
+            return self._step
+
+        self._step += 1
+        record = {
+            "step": self._step,
+            "node": node,
+            "ts": datetime.now().isoformat(),
+            "changes": changes
+        }
+        try:
+            with _open_journal(self.path, "a") as f:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        except Exception as e:
+            logger.error(f"상태 저널 기록 실패: {e}")
+            raise
+        self._last.update(changes)
+        logger.info(f"상태 저널 기록: {self.path} step={self._step} ({node}) 변경 필드: {list(changes.keys())}")
+        return self._step
@@ -1,18 +1,51 @@
 from loguru import logger
 from langgraph.graph import StateGraph, END
 from typing import Dict, Any, Tuple, List, Literal
-from .state import EthicsState
+from .state import EthicsState, MESSAGE_FIELDS, MSGPACK_ALLOWLIST, to_message_record
+from .stage_cache import prompt_fingerprint, is_cacheable
 from langchain_core.messages import AIMessage
+import os
+import time
 from ..agents import (
     create_service_input_agent,
     create_criteria_search_agent,
     create_ethics_evaluation_agent,
     create_report_generation_agent
 )
+from ..prompts import service_input_prompt, criteria_search_prompt, criteria_analysis_en_prompt
+from ..tools.ethics_retriever import get_vector_db_embeddings, is_multilingual_embeddings
+from ..tools.keyword_relevance import KeywordArticleRelevance
+from ..tools.quality import QualityScorer, updated_scores
+from ..tools.keyword_extractor import KeywordExtractor
+
+# 품질 점수(state_score)를 매기는 단계와 평가 대상 필드
+SCORED_STAGES = {
+    "service_input": "service_info",
+    "criteria_search": "criteria_info",
+    "ethics_evaluation": "risk_message"
+}
+
+# 중간 산출물 언어 (ko: 단계마다 한국어로 작성, en: 기준 정보와 윤리 평가는 영어로 두고 보고서만 한국어로 작성)
+INTERMEDIATE_LANGUAGES = ("ko", "en")
+
+# 영어 중간 산출물 모드에서 영어로 작성되는 상태 필드
+ENGLISH_FIELDS = ("criteria_info", "risk_message")
+
+# 실행 간 캐시 대상 단계: 결과에 영향을 주는 입력 필드와 프롬프트 버전 구성 요소
+CACHEABLE_STAGES = {
+    "service_input": {
+        "input_fields": ("ai_service",),
+        "prompt_parts": (service_input_prompt, create_service_input_agent)
+    },
+    "criteria_search": {
+        "input_fields": ("ai_service", "criteria", "service_info", "ethical_risk_keywords"),
+        "prompt_parts": (criteria_search_prompt, criteria_analysis_en_prompt, create_criteria_search_agent)
+    }
+}
 
 def router(state: EthicsState) -> Literal["service_input", "criteria_search", "ethics_evaluation", "report_generation", "end"]:
     """각 상태에서 다음 단계를 결정하는 라우터"""
-    print(f"라우터 실행 중, 상태: {state.workflow_status}")
+    logger.debug(f"라우터 실행 중, 상태: {state.workflow_status}")
     
     # 현재 상태 로깅
     state.log_current_state()
@@ -45,15 +78,146 @@ def router(state: EthicsState) -> Literal["service_input", "criteria_search", "e
     logger.info("워크플로우 완료")
     return "end"
 
-def create_ethics_workflow(llm, vector_db):
-    """AI 윤리성 리스크 진단 워크플로우를 생성합니다."""
+def route_after_criteria_search(state: EthicsState) -> Literal["criteria_search", "ethics_evaluation"]:
+    """기준 검색 노드가 근거 부족으로 재시도를 요청했으면(criteria_info 없음) 기준 검색을 다시 실행합니다."""
+    if state.criteria_info is None and state.query_attempt > 0:
+        logger.info(f"다음 단계: 기준 검색 재시도 ({state.query_attempt}회차, 누적 근거 {len(state.evidence_pool)}개)")
+        return "criteria_search"
+    return "ethics_evaluation"
+
+def create_ethics_workflow(llm, vector_db, checkpoint_store=None, checkpointer=None, stage_cache=None, run_registry=None, single_flight=None, framework_kbs=None, intermediate_language=None):
+    """AI 윤리성 리스크 진단 워크플로우를 생성합니다.
+    
+    checkpoint_store가 주어지면 각 노드가 예외 없이 끝날 때마다 상태를 저장하고,
+    checkpointer(LangGraph 체크포인터)가 주어지면 컴파일된 그래프에 연결합니다.
+    stage_cache가 주어지면 CACHEABLE_STAGES 노드는 캐시 적중 시 실행을 건너뜁니다.
+    run_registry가 주어지면 노드별 실행 시간을 실행 이력에 기록합니다.
+    single_flight가 주어지면 CACHEABLE_STAGES 노드의 동시 동일 요청(같은 입력 필드)을 한 번만 실행합니다.
+    framework_kbs(프레임워크 이름 -> FrameworkKB)가 주어지면 기준 검색 에이전트가 사전 구축된 규제 지식을 조회하고,
+    윤리 평가 에이전트가 키워드 x 조항 유사도 행렬로 키워드별 근거 조항을 선택합니다.
+    SCORED_STAGES 노드의 결과는 로컬 품질 평가(QualityScorer)로 state_score에 기록되며,
+    윤리 평가와 보고서 생성의 검증 호출은 품질이 기준에 못 미칠 때만 수행됩니다.
+    벡터 DB가 다국어 임베딩 모델(예: BAAI/bge-m3)로 구축되었으면 기준 검색은 쿼리 번역 호출 없이 한국어로 검색합니다.
+    intermediate_language(기본값: INTERMEDIATE_LANGUAGE 환경 변수, ko)가 "en"이면 기준 정보와 윤리 평가를 간결한 영어로
+    작성하고, 한국어는 보고서 생성 단계에서만 작성합니다.
+    """
     logger.info("AI 윤리성 리스크 진단 워크플로우 생성 중...")
+    intermediate_language = intermediate_language or os.getenv("INTERMEDIATE_LANGUAGE", "ko")
+    if intermediate_language not in INTERMEDIATE_LANGUAGES:
+        logger.warning(f"알 수 없는 중간 산출물 언어 {intermediate_language}, ko를 사용합니다.")
+        intermediate_language = "ko"
+    logger.info(f"중간 산출물 언어: {intermediate_language}")
+    model_name = getattr(llm, "model_name", None) or getattr(llm, "model", None) or llm.__class__.__name__
+    embeddings = get_vector_db_embeddings(vector_db)
+    embedding_model = getattr(embeddings, "model_name", None) or embeddings.__class__.__name__
+    multilingual = is_multilingual_embeddings(embeddings)
+    
+    def stage_version(node_name):
+        """단계 프롬프트 버전 (기준 검색은 사용하는 지식 베이스 버전, 임베딩 모델, 중간 산출물 언어도 포함)"""
+        parts = list(CACHEABLE_STAGES[node_name]["prompt_parts"])
+        if node_name == "criteria_search":
+            parts.append(f"embeddings:{embedding_model}")
+            parts.append(f"language:{intermediate_language}")
+            if framework_kbs:
+                parts += sorted(f"{name}:{kb.version}" for name, kb in framework_kbs.items())
+        return prompt_fingerprint(*parts)
+    
+    def memoized(node_name, node_fn):
+        """실행 간 단계 결과 캐시를 적용하는 래퍼"""
+        if stage_cache is None or node_name not in CACHEABLE_STAGES:
+            return node_fn
+        spec = CACHEABLE_STAGES[node_name]
+        return stage_cache.wrap(
+            node_name,
+            node_fn,
+            input_fields=spec["input_fields"],
+            prompt_version=stage_version(node_name),
+            model=str(model_name)
+        )
+    
+    def deduplicated(node_name, node_fn):
+        """동시에 실행되는 동일 입력의 노드 실행을 하나로 합치는 래퍼"""
+        if single_flight is None or node_name not in CACHEABLE_STAGES:
+            return node_fn
+        spec = CACHEABLE_STAGES[node_name]
+        prompt_version = stage_version(node_name)
+        
+        def run(state):
+            inputs = {field: getattr(state, field, None) for field in spec["input_fields"]}
+            key = single_flight.make_key(node_name, prompt_version, str(model_name), inputs)
+            return single_flight.do(key, node_fn, state, share_result=is_cacheable)
+        return run
+    
+    def timed(node_name, node_fn):
+        """노드 실행 시간을 실행 이력에 기록하는 래퍼"""
+        if run_registry is None:
+            return node_fn
+        
+        def run(state):
+            started = time.perf_counter()
+            result = node_fn(state)
+            try:
+                run_registry.record_node(state.workflow_id, node_name, time.perf_counter() - started)
+            except Exception as e:
+                logger.error(f"노드 실행 시간 기록 실패 ({node_name}): {e}")
+            return result
+        return run
+    
+    def scored(node_name, node_fn):
+        """노드 결과의 품질 점수를 state_score에 기록하는 래퍼 (캐시된 결과도 현재 실행 기준으로 평가)"""
+        field = SCORED_STAGES.get(node_name)
+        if field is None:
+            return node_fn
+        
+        def run(state):
+            result = node_fn(state)
+            message = (result or {}).get(field)
+            if message is None:
+                return result
+            try:
+                keywords = result.get("ethical_risk_keywords", state.ethical_risk_keywords)
+                language = "ko"
+                if intermediate_language == "en" and field in ENGLISH_FIELDS:
+                    # 영어 산출물은 영어 섹션 구성과 영어 키워드로 평가
+                    language = "en"
+                    keywords = result.get("english_keywords", state.english_keywords) or keywords
+                quality = quality_scorer.score(field, message.content, keywords, language)
+                if not quality.passed:
+                    logger.warning(f"품질 기준 미달 ({node_name}): {quality.feedback()}")
+                result = dict(result, state_score=updated_scores(state.state_score, field, quality.score))
+            except Exception as e:
+                logger.error(f"품질 평가 실패 ({node_name}): {e}")
+            return result
+        return run
+    
+    def instrumented(node_name, node_fn):
+        """single-flight, 캐시, 품질 평가, 실행 시간 기록, 체크포인트 래퍼를 순서대로 적용합니다."""
+        return checkpointed(node_name, timed(node_name, scored(node_name, memoized(node_name, deduplicated(node_name, node_fn)))))
+    
+    def checkpointed(node_name, node_fn):
+        """노드 실행이 성공하면 결과가 반영된 상태를 체크포인트로 저장하는 래퍼 (실패 메시지 결과는 저장소가 건너뜀)"""
+        if checkpoint_store is None:
+            return node_fn
+        
+        def run(state):
+            result = node_fn(state)
+            try:
+                checkpoint_store.save(state.apply(result), node_name)
+            except Exception as e:
+                logger.error(f"체크포인트 저장 실패 ({node_name}): {e}")
+            return result
+        return run
+    
+    # 로컬 품질 평가기와 키워드 추출기 (벡터 DB와 같은 임베딩 모델 재사용)
+    quality_scorer = QualityScorer(embeddings)
+    keyword_extractor = KeywordExtractor(embeddings) if embeddings is not None else None
     
     # 에이전트 생성
-    service_input_node = create_service_input_agent(llm)
-    criteria_search_node = create_criteria_search_agent(llm, vector_db)
-    ethics_evaluation_node = create_ethics_evaluation_agent(llm)
-    report_generation_node = create_report_generation_agent(llm)
+    service_input_node = instrumented("service_input", create_service_input_agent(llm, keyword_extractor=keyword_extractor))
+    criteria_search_node = instrumented("criteria_search", create_criteria_search_agent(llm, vector_db, framework_kbs=framework_kbs, translate_queries=not multilingual, intermediate_language=intermediate_language))
+    keyword_relevance = KeywordArticleRelevance(embeddings, framework_kbs) if framework_kbs else None
+    ethics_evaluation_node = instrumented("ethics_evaluation", create_ethics_evaluation_agent(llm, keyword_relevance=keyword_relevance, quality_scorer=quality_scorer, intermediate_language=intermediate_language))
+    report_generation_node = instrumented("report_generation", create_report_generation_agent(llm, quality_scorer=quality_scorer, intermediate_language=intermediate_language))
     
     # 상태 변경 후 로깅 처리하는 래퍼 함수 생성
     def log_after_service_input(state_dict):
@@ -73,7 +237,9 @@ def create_ethics_workflow(llm, vector_db):
         try:
             result = criteria_search_node(state_dict)
             # 결과 검증
-            if result and "criteria_info" in result:
+            if result and result.get("criteria_info") is None and result.get("query_attempt"):
+                logger.info(f"기준 검색 에이전트 실행 완료: 근거 부족으로 재시도 요청 ({result['query_attempt']}회차)")
+            elif result and "criteria_info" in result:
                 logger.info(f"기준 검색 에이전트 실행 완료: 기준 정보 생성됨")
             else:
                 logger.warning(f"기준 검색 에이전트 실행 결과 불완전: {result.keys() if result else None}")
@@ -108,34 +274,58 @@ def create_ethics_workflow(llm, vector_db):
             logger.error(f"보고서 생성 에이전트 오류: {e}")
             return {"report_path": None}
     
+    def compacted(node_fn):
+        """노드 출력의 메시지 객체를 경량 MessageRecord로 바꿔 그래프 채널에 전체 메시지가 남지 않게 하는 래퍼"""
+        def run(state):
+            result = node_fn(state)
+            if result:
+                result = {key: to_message_record(value) if key in MESSAGE_FIELDS else value for key, value in result.items()}
+            return result
+        return run
+    
     # 워크플로우 상태 그래프 생성
     workflow = StateGraph(EthicsState)
     
     # 노드 추가 (로깅 기능 포함)
-    workflow.add_node("service_input", log_after_service_input)
-    workflow.add_node("criteria_search", log_after_criteria_search)
-    workflow.add_node("ethics_evaluation", log_after_ethics_evaluation)
-    workflow.add_node("report_generation", log_after_report_generation)
+    workflow.add_node("service_input", compacted(log_after_service_input))
+    workflow.add_node("criteria_search", compacted(log_after_criteria_search))
+    workflow.add_node("ethics_evaluation", compacted(log_after_ethics_evaluation))
+    workflow.add_node("report_generation", compacted(log_after_report_generation))
     workflow.add_node("end", lambda x: {"workflow_status": "completed"})
 
     
     # 엣지 설정을 이렇게 수정
     workflow.add_edge("service_input", "criteria_search")
-    workflow.add_edge("criteria_search", "ethics_evaluation")
+    # 기준 검색은 근거가 부족하면 누적 근거 풀을 이어받아 재시도 (재시도 횟수와 시간 예산은 에이전트가 제한)
+    workflow.add_conditional_edges(
+        "criteria_search",
+        route_after_criteria_search,
+        {"criteria_search": "criteria_search", "ethics_evaluation": "ethics_evaluation"}
+    )
     workflow.add_edge("ethics_evaluation", "report_generation")
     workflow.add_edge("report_generation", "end")
     
     # 조건부 엣지를 사용하려면 이렇게 설정
     # workflow.add_conditional_edges("service_input", router)
-    # workflow.add_conditional_edges("criteria_search", router)
     # workflow.add_conditional_edges("ethics_evaluation", router)
     # workflow.add_conditional_edges("report_generation", router)
     
-    # 엔트리 포인트 설정
-    workflow.set_entry_point("service_input")
+    # 엔트리 포인트 설정 - 복원된 상태라면 router가 첫 번째 미완료 노드부터 시작
+    workflow.set_conditional_entry_point(
+        router,
+        {
+            "service_input": "service_input",
+            "criteria_search": "criteria_search",
+            "ethics_evaluation": "ethics_evaluation",
+            "report_generation": "report_generation",
+            "end": "end"
+        }
+    )
     
-    # 그래프 컴파일
-    ethics_workflow = workflow.compile()
+    # 그래프 컴파일 (체크포인터에는 채널 값 타입 MessageRecord를 msgpack 허용 목록으로 등록)
+    if checkpointer is not None and hasattr(checkpointer, "with_allowlist"):
+        checkpointer = checkpointer.with_allowlist(MSGPACK_ALLOWLIST)
+    ethics_workflow = workflow.compile(checkpointer=checkpointer)
     
     logger.info("AI 윤리성 리스크 진단 워크플로우 생성 완료")
     return ethics_workflow 
\ No newline at end of file
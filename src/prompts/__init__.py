@@ -1,11 +1,14 @@
 from .service_input_prompt import service_input_prompt
-from .criteria_search_prompt import criteria_search_prompt
-from .ethics_evaluation_prompt import ethics_evaluation_prompt
-from .report_generation_prompt import report_generation_prompt
+from .criteria_search_prompt import criteria_search_prompt, criteria_analysis_en_prompt
+from .ethics_evaluation_prompt import ethics_evaluation_prompt, ethics_evaluation_en_prompt
+from .report_generation_prompt import report_generation_prompt, report_from_english_prompt
 
 __all__ = [
     "service_input_prompt",
     "criteria_search_prompt",
+    "criteria_analysis_en_prompt",
     "ethics_evaluation_prompt",
-    "report_generation_prompt"
+    "ethics_evaluation_en_prompt",
+    "report_generation_prompt",
+    "report_from_english_prompt"
 ] 
\ No newline at end of file
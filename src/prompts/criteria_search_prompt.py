@@ -64,4 +64,49 @@ CRITERIA_SEARCH_HUMAN_PROMPT = """분석할 AI 서비스는 '{ai_service}'이며
 criteria_search_prompt = ChatPromptTemplate.from_messages([
     ("system", CRITERIA_SEARCH_SYSTEM_PROMPT),
     ("human", CRITERIA_SEARCH_HUMAN_PROMPT)
-]) 
\ No newline at end of file
+]) 
+
+# 영어 중간 산출물 모드: 검색 근거를 번역하지 않고 간결한 구조화 영어 근거로 정리 (한국어는 최종 보고서에서만 작성)
+CRITERIA_ANALYSIS_EN_SYSTEM_PROMPT = """You are the criteria search agent of an AI ethics risk assessment system.
+Condense the retrieved regulatory evidence into compact, structured English notes that later agents will reason over.
+
+Rules:
+1. Write in English only. Do not translate the evidence into any other language.
+2. Use terse bullet points (at most 25 words each). No introductions, no summaries, no repetition.
+3. Every bullet must cite its provision (e.g. "Article 6(2)", "Annex III 4(a)", "Recital 27") or "web search".
+4. Keep short verbatim quotes only where the exact wording matters.
+5. Use only the evidence provided. Write "none found" for a section with no supporting evidence.
+
+Output format:
+
+### Classification
+- Risk tier: [prohibited | high-risk | limited risk | minimal risk] - [basis] ([provision])
+
+### Applicable Provisions
+- [Article/Annex number]: [scope in one line]
+
+### Obligations
+- [obligation] ([provision])
+
+### Technical Requirements
+- [requirement] ([provision])
+
+### Documentation & Transparency
+- [requirement] ([provision])
+
+### Assessment & Oversight
+- [requirement] ([provision])
+"""
+
+CRITERIA_ANALYSIS_EN_HUMAN_PROMPT = """AI service: {ai_service}
+Ethics framework: {criteria}
+
+Retrieved evidence ({source}):
+{evidence}
+{kb_context}
+Write the structured notes for this service."""
+
+criteria_analysis_en_prompt = ChatPromptTemplate.from_messages([
+    ("system", CRITERIA_ANALYSIS_EN_SYSTEM_PROMPT),
+    ("human", CRITERIA_ANALYSIS_EN_HUMAN_PROMPT)
+])
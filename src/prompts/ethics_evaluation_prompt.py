@@ -61,12 +61,76 @@ ETHICS_EVALUATION_HUMAN_PROMPT = """분석할 AI 서비스는 '{ai_service}'이
 식별된 윤리적 리스크 키워드:
 {ethical_risk_keywords}
 
+키워드별 근거 조항 (임베딩 유사도 기준 상위 조항):
+{keyword_evidence}
+
 적용 가능한 윤리 기준:
 {criteria_info}
 
-위 정보를 바탕으로, 특히 식별된 윤리적 리스크 키워드에 중점을 두고 서비스의 윤리적 리스크를 평가해주세요. 각 키워드가 관련된 윤리 기준과 어떻게 연결되는지 명확히 분석해주세요."""
+위 정보를 바탕으로, 특히 식별된 윤리적 리스크 키워드에 중점을 두고 서비스의 윤리적 리스크를 평가해주세요. 각 키워드가 관련된 윤리 기준과 어떻게 연결되는지 명확히 분석해주세요. 모든 키워드를 빠짐없이 다루고, 키워드별 근거 조항을 인용해주세요."""
 
 ethics_evaluation_prompt = ChatPromptTemplate.from_messages([
     ("system", ETHICS_EVALUATION_SYSTEM_PROMPT),
     ("human", ETHICS_EVALUATION_HUMAN_PROMPT)
-]) 
\ No newline at end of file
+]) 
+
+# 영어 중간 산출물 모드: 영어 기준 정보로 간결한 구조화 영어 평가를 작성 (한국어는 최종 보고서에서만 작성)
+ETHICS_EVALUATION_EN_SYSTEM_PROMPT = """You are the ethics evaluation agent of an AI ethics risk assessment system.
+Evaluate the ethical risks of the AI service against the framework notes and write compact, structured English findings
+that the report agent will turn into the final report.
+
+Rules:
+1. Write in English only, in terse bullet points. No introductions or filler.
+2. Cover every ethical risk keyword and link each finding to a specific provision (e.g. "Article 10(2)", "Annex III 4(a)").
+3. Rate each risk area high, medium or low and give the reason in one line.
+4. Use only the provided service information and framework notes. Do not invent provisions.
+5. Include the positive aspects of the service for a balanced assessment.
+
+Output format:
+
+### Summary
+[2-3 sentences on the overall risk and the main keywords]
+
+### Key Risk Areas
+- **[risk]** [keyword] - severity: [high/medium/low] ([provision])
+
+### Detailed Analysis
+#### [risk] [keyword]
+- Provision: [provision] - "[short quote]"
+- Analysis: [service-specific analysis]
+- Severity basis: [reason]
+
+### Potential Impact
+- [impact on individuals, society or environment] ([provision])
+
+### Recommendations
+- [action] - priority: [high/medium/low] ([provision])
+
+### Positive Aspects
+- [aspect]
+
+### Overall Assessment
+[overall risk level and sustainability in 2-3 sentences]
+"""
+
+ETHICS_EVALUATION_EN_HUMAN_PROMPT = """AI service: {ai_service}
+Ethics framework: {criteria}
+
+Service information:
+{service_info}
+
+Ethical risk keywords:
+{ethical_risk_keywords}
+
+Top matching provisions per keyword (embedding similarity):
+{keyword_evidence}
+
+Framework notes:
+{criteria_info}
+
+Evaluate the service, covering every keyword and citing the matching provisions."""
+
+ethics_evaluation_en_prompt = ChatPromptTemplate.from_messages([
+    ("system", ETHICS_EVALUATION_EN_SYSTEM_PROMPT),
+    ("human", ETHICS_EVALUATION_EN_HUMAN_PROMPT)
+])
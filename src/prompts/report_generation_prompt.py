@@ -106,4 +106,30 @@ REPORT_GENERATION_HUMAN_PROMPT = """AI 윤리성 리스크 진단 보고서를 
 report_generation_prompt = ChatPromptTemplate.from_messages([
     ("system", REPORT_GENERATION_SYSTEM_PROMPT),
     ("human", REPORT_GENERATION_HUMAN_PROMPT)
-]) 
\ No newline at end of file
+]) 
+
+# 영어 중간 산출물 모드: 영어로 작성된 기준 정보와 평가 결과로 한국어 보고서를 한 번에 작성
+REPORT_FROM_ENGLISH_HUMAN_PROMPT = """AI 윤리성 리스크 진단 보고서를 생성해주세요.
+날짜: {timestamp}
+분석된 AI 서비스: {ai_service}
+적용된 윤리 기준: {criteria}
+식별된 윤리적 리스크 키워드: {ethical_risk_keywords}
+
+서비스 정보:
+{service_info}
+
+적용 가능한 윤리 기준 (영어 요약):
+{criteria_info}
+
+윤리 평가 결과 (영어 요약):
+{risk_message}
+
+윤리 기준과 윤리 평가 결과는 간결한 영어 요약으로 제공됩니다. 이 내용을 한국어로 옮겨 종합적인 AI 윤리성 리스크 진단 보고서를 작성해 주세요.
+조항 번호는 "EU AI Act 제6조 2항"처럼 한국어로 표기하고, 직접 인용하는 조항 원문은 영어 원문을 그대로 인용한 뒤 한국어 설명을 덧붙여주세요.
+각 분석과 권고사항에 관련된 윤리 기준의 구체적인 조항 번호와 출처를 반드시 명시해주세요.
+식별된 윤리적 리스크 키워드를 중심으로 서비스 특성에 맞는 맞춤형 보고서를 작성해주세요."""
+
+report_from_english_prompt = ChatPromptTemplate.from_messages([
+    ("system", REPORT_GENERATION_SYSTEM_PROMPT),
+    ("human", REPORT_FROM_ENGLISH_HUMAN_PROMPT)
+])
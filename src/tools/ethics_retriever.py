@@ -1,10 +1,16 @@
 from loguru import logger
 import os
+import asyncio
+import hashlib
+import numpy as np
 from langgraph.prebuilt import ToolNode
 from langchain_core.messages import AIMessage
 from langchain.retrievers import ContextualCompressionRetriever
 from langchain.retrievers.document_compressors import LLMChainExtractor
 
+from ..utils.single_flight import get_single_flight
+from ..utils.progress import atrack_tool
+
 # 윤리 기준 검색 도구 설명
 ETHICS_RETRIEVER_DESCRIPTION = """
 다음과 같은 경우에 이 도구를 사용하세요:
@@ -15,11 +21,256 @@ ETHICS_RETRIEVER_DESCRIPTION = """
 검색어를 구체적으로 작성할수록 더 관련성 높은 정보를 얻을 수 있습니다.
 """
 
+def _is_successful(message):
+    """오류 메시지가 아닌 검색 결과인지 확인합니다 (오류 결과는 다른 프로세스와 공유하지 않음)."""
+    return "오류가 발생했습니다" not in message.content
+
+# 구조 단위 메타데이터 키와 인용 표기
+STRUCTURE_UNITS = {"article": "Article", "annex": "Annex", "recital": "Recital"}
+
+def citation(metadata, paragraphs=True):
+    """청크 메타데이터의 인용 표기 ("EU_AI_Act Article 6(1-2)", "EU_AI_Act Annex III")
+
+    구조 단위 메타데이터가 없는 청크(고정 길이 분할)는 페이지 번호로 표기합니다.
+    """
+    framework = metadata.get("framework", "Unknown")
+    for unit, name in STRUCTURE_UNITS.items():
+        number = metadata.get(unit)
+        if number:
+            label = f"{framework} {name} {number}"
+            if paragraphs and unit == "article" and metadata.get("paragraphs"):
+                label += f"({metadata['paragraphs']})"
+            return label
+    return f"{framework} - 페이지 {metadata.get('page', 'Unknown')}"
+
+def parent_key(metadata):
+    """청크가 속한 구조 단위(조항, 부록, 전문) 키 - 구조 단위 메타데이터가 없으면 None"""
+    for unit in STRUCTURE_UNITS:
+        if metadata.get(unit):
+            return f"{metadata.get('framework', 'Unknown')}:{unit}:{metadata[unit]}"
+    return None
+
+def format_documents(docs):
+    """검색된 문서를 출처 헤더가 붙은 결과 텍스트로 변환합니다."""
+    results = []
+    for i, doc in enumerate(docs, 1):
+        results.append(f"### 결과 {i} ({citation(doc.metadata)})\n{doc.page_content}\n")
+    return "\n".join(results)
+
+def get_vector_db_embeddings(vector_db):
+    """벡터 DB가 사용하는 임베딩 모델(또는 임베딩 함수)을 반환합니다."""
+    embeddings = getattr(vector_db, "embeddings", None)
+    if embeddings is None:
+        embeddings = getattr(vector_db, "embedding_function", None)
+    return embeddings
+
+# 한국어 쿼리로 영어 문서를 검색할 수 있는 다국어 임베딩 모델
+MULTILINGUAL_EMBEDDING_MODELS = {
+    "BAAI/bge-m3",
+    "intfloat/multilingual-e5-small",
+    "intfloat/multilingual-e5-base",
+    "intfloat/multilingual-e5-large",
+    "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+    "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+}
+
+def is_multilingual_embeddings(embeddings):
+    """임베딩 모델이 다국어 모델인지(한국어 쿼리 -> 영어 문서 검색 가능) 확인합니다."""
+    model_name = getattr(embeddings, "model_name", None) or ""
+    return model_name in MULTILINGUAL_EMBEDDING_MODELS or "multilingual" in model_name.lower()
+
+def embed_texts(embeddings, texts):
+    """텍스트 목록을 한 번의 배치 호출로 임베딩하여 float32 행렬로 반환합니다."""
+    if hasattr(embeddings, "embed_documents"):
+        vectors = embeddings.embed_documents(list(texts))
+    else:
+        vectors = [embeddings(text) for text in texts]
+    return np.asarray(vectors, dtype=np.float32)
+
+def multi_query_search(vector_db, queries, k=8, fetch_k=10, rrf_k=60):
+    """여러 쿼리를 한 번에 임베딩하고 한 번의 배치 index.search로 검색한 뒤,
+    Reciprocal Rank Fusion으로 결합하고 중복 청크를 제거합니다.
+    
+    반환값: [(문서, RRF 점수, 쿼리 중 최고 유사도)] (RRF 점수 내림차순)
+    """
+    # 프로세스 풀 프록시 등 자체 구현이 있으면 위임
+    if hasattr(vector_db, "multi_query_search"):
+        return vector_db.multi_query_search(queries, k=k, fetch_k=fetch_k, rrf_k=rrf_k)
+    
+    queries = list(dict.fromkeys(query.strip() for query in queries if query and query.strip()))
+    if not queries:
+        return []
+    
+    vectors = embed_texts(get_vector_db_embeddings(vector_db), queries)
+    if getattr(vector_db, "_normalize_L2", False):
+        import faiss
+        faiss.normalize_L2(vectors)
+    distances, indices = vector_db.index.search(vectors, fetch_k)
+    
+    try:
+        relevance_fn = vector_db._select_relevance_score_fn()
+    except (AttributeError, NotImplementedError, ValueError):
+        relevance_fn = lambda distance: 1.0 / (1.0 + distance)
+    
+    fused = {}
+    for row_distances, row_indices in zip(distances, indices):
+        for rank, (distance, index) in enumerate(zip(row_distances, row_indices)):
+            if index == -1:
+                continue
+            docstore_id = vector_db.index_to_docstore_id[index]
+            doc = vector_db.docstore.search(docstore_id)
+            if isinstance(doc, str):  # docstore에서 찾지 못한 경우
+                continue
+            # 같은 내용의 청크(중복 적재, 겹침 구간)는 하나로 합침
+            content_key = hashlib.sha1(doc.page_content.strip().encode("utf-8")).hexdigest()
+            entry = fused.setdefault(content_key, [doc, 0.0, 0.0])
+            entry[1] += 1.0 / (rrf_k + rank + 1)
+            entry[2] = max(entry[2], float(relevance_fn(float(distance))))
+    
+    ranked = sorted(fused.values(), key=lambda entry: entry[1], reverse=True)[:k]
+    return [tuple(entry) for entry in ranked]
+
+def create_multi_query_retriever_tool(vector_db):
+    """여러 쿼리의 근거를 한 번의 배치 벡터 검색으로 가져오는 도구를 생성합니다."""
+    
+    async def multi_query_retriever_function(queries, framework: str = "all", k: int = 8):
+        """다중 쿼리 윤리 기준 검색 함수 (같은 쿼리 묶음의 동시 검색은 한 번만 수행)"""
+        single_flight = get_single_flight()
+        key = single_flight.make_key("multi_query_retriever", list(queries), framework, k)
+        return await atrack_tool(
+            "multi_query_retriever",
+            {"queries": list(queries), "framework": framework},
+            single_flight.ado(key, _multi_query_retrieve, list(queries), framework, k, share_result=_is_successful)
+        )
+    
+    async def _multi_query_retrieve(queries, framework, k):
+        try:
+            logger.info(f"다중 쿼리 윤리 기준 검색: {len(queries)}개 쿼리 (프레임워크: {framework})")
+            # 임베딩과 FAISS 검색은 CPU 작업이므로 스레드에서 실행
+            results = await asyncio.to_thread(multi_query_search, vector_db, queries, k)
+            
+            if not results:
+                logger.warning("다중 쿼리 윤리 기준 검색 결과 없음")
+                return AIMessage(
+                    content="관련 윤리 기준을 찾을 수 없습니다.",
+                    response_metadata={"num_documents": 0, "similarities": [], "queries": queries, "passages": []}
+                )
+            
+            docs = [doc for doc, _, _ in results]
+            logger.info(f"다중 쿼리 윤리 기준 검색 완료: {len(docs)}개 결과")
+            return AIMessage(
+                content=format_documents(docs),
+                response_metadata={
+                    "num_documents": len(docs),
+                    "similarities": [similarity for _, _, similarity in results],
+                    "queries": queries,
+                    # 실행 간 근거 풀에 문서 단위로 누적할 수 있도록 개별 근거도 함께 반환
+                    "passages": [
+                        {
+                            "source": "vector",
+                            "label": citation(doc.metadata),
+                            "content": doc.page_content,
+                            "similarity": similarity,
+                            "parent": parent_key(doc.metadata)
+                        }
+                        for doc, _, similarity in results
+                    ]
+                }
+            )
+        except Exception as e:
+            logger.error(f"다중 쿼리 윤리 기준 검색 실패: {e}")
+            return AIMessage(content=f"윤리 기준 검색 중 오류가 발생했습니다: {e}")
+    
+    return multi_query_retriever_function
+
+def create_parent_fetch_tool(vector_db, max_chars=6000):
+    """검색된 청크를 소속 조항/부록/전문 전체로 확장하는 도구를 생성합니다 (LLM 호출 없이 docstore에서 조회).
+
+    구조 단위별 청크 목록은 첫 호출 시 docstore를 색인 순서대로 한 번 훑어 만들어 두며(부모 프로세스에서 조회,
+    프로세스 풀 프록시는 docstore와 index_to_docstore_id를 원본 벡터 DB에 위임하므로 그대로 확장됨),
+    docstore가 없는 벡터 DB에서는 확장하지 않습니다.
+    """
+    parents = None
+
+    def build_parents():
+        index = {}
+        docstore = getattr(vector_db, "docstore", None)
+        index_to_docstore_id = getattr(vector_db, "index_to_docstore_id", None)
+        if docstore is None or index_to_docstore_id is None:
+            logger.warning("docstore가 없는 벡터 DB이므로 상위 조항 확장을 사용하지 않습니다.")
+            return index
+        for position in sorted(index_to_docstore_id):
+            doc = docstore.search(index_to_docstore_id[position])
+            if isinstance(doc, str):
+                continue
+            key = parent_key(doc.metadata)
+            if key:
+                index.setdefault(key, []).append(doc)
+        logger.info(f"상위 조항 색인 생성: 구조 단위 {len(index)}개")
+        return index
+
+    def parent_content(docs):
+        """청크마다 반복된 머리말을 한 번만 남기고 본문을 이어 붙임 (max_chars까지)"""
+        heading = docs[0].metadata.get("heading")
+        bodies = []
+        for doc in docs:
+            content = doc.page_content
+            if heading and content.startswith(heading + "\n"):
+                content = content[len(heading) + 1:]
+            bodies.append(content)
+        content = "\n".join(([heading] if heading else []) + bodies)
+        return content[:max_chars]
+
+    def fetch_parents(entries, limit=3):
+        """근거 항목(유사도 내림차순) 중 상위 limit개 구조 단위의 전체 본문을 근거 항목으로 반환합니다."""
+        nonlocal parents
+        keys = []
+        similarities = {}
+        for entry in sorted(entries, key=lambda entry: entry.get("similarity") or 0.0, reverse=True):
+            key = entry.get("parent")
+            if not key:
+                continue
+            similarities[key] = max(similarities.get(key, 0.0), entry.get("similarity") or 0.0)
+            if key not in keys:
+                keys.append(key)
+        keys = keys[:limit]
+        if not keys:
+            return []
+        if parents is None:
+            parents = build_parents()
+
+        results = []
+        for key in keys:
+            docs = parents.get(key)
+            if not docs:
+                continue
+            results.append({
+                "source": "vector",
+                "label": citation(docs[0].metadata, paragraphs=False) + " (전체 조문)",
+                "content": parent_content(docs),
+                "similarity": similarities[key],
+                "parent": key,
+                "expanded": True
+            })
+        logger.info(f"상위 조항 확장: {', '.join(entry['label'] for entry in results) or '없음'}")
+        return results
+
+    return fetch_parents
+
 def create_ethics_retriever_tool(vector_db, llm):
     """윤리 기준 검색 도구를 생성합니다."""
     
     async def ethics_retriever_function(query: str, framework: str = "all"):
-        """윤리 기준 검색 함수"""
+        """윤리 기준 검색 함수 (같은 쿼리의 동시 검색은 한 번만 수행)"""
+        single_flight = get_single_flight()
+        key = single_flight.make_key("ethics_retriever", query, framework)
+        return await atrack_tool(
+            "ethics_retriever",
+            {"query": query, "framework": framework},
+            single_flight.ado(key, _ethics_retrieve, query, framework, share_result=_is_successful)
+        )
+    
+    async def _ethics_retrieve(query: str, framework: str = "all"):
         try:
             logger.info(f"윤리 기준 검색: {query} (프레임워크: {framework})")
             
@@ -43,13 +294,7 @@ def create_ethics_retriever_tool(vector_db, llm):
                 logger.warning(f"윤리 기준 검색 결과 없음: {query}")
                 return AIMessage(content=f"'{query}'에 대한 관련 윤리 기준을 찾을 수 없습니다.")
             
-            results = []
-            for i, doc in enumerate(docs, 1):
-                source = doc.metadata.get("framework", "Unknown")
-                page = doc.metadata.get("page", "Unknown")
-                results.append(f"### 결과 {i} ({source} - 페이지 {page})\n{doc.page_content}\n")
-            
-            content = "\n".join(results)
+            content = format_documents(docs)
             logger.info(f"윤리 기준 검색 완료: {len(docs)}개 결과")
             
             return AIMessage(content=content)
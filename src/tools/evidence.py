@@ -0,0 +1,140 @@
+from loguru import logger
+from pydantic import BaseModel, Field
+from typing import List, Optional
+import hashlib
+import os
+import re
+
+TOKEN = re.compile(r"[a-z0-9가-힣]{3,}")
+
+class EvidenceThresholds(BaseModel):
+    """근거 충분성 판단 기준"""
+    min_chars: int = Field(default=1500, description="충분하다고 볼 근거 텍스트 총 길이(문자 수)")
+    min_web_chars: int = Field(default=600, description="충분하다고 볼 웹 검색 결과 총 길이(검색 요약이므로 더 짧음)")
+    min_similarity: float = Field(default=0.35, description="충분하다고 볼 상위 3개 근거의 평균 검색 유사도")
+    min_keyword_coverage: float = Field(default=0.5, description="충분하다고 볼 리스크 키워드 포함 비율")
+    min_score: float = Field(default=0.7, description="충분성 점수(0~1) 기준값")
+
+    @classmethod
+    def from_env(cls):
+        """EVIDENCE_MIN_CHARS, EVIDENCE_MIN_WEB_CHARS, EVIDENCE_MIN_SIMILARITY, EVIDENCE_MIN_COVERAGE, EVIDENCE_MIN_SCORE 환경 변수로 기준을 만듭니다."""
+        defaults = cls()
+        return cls(
+            min_chars=int(os.getenv("EVIDENCE_MIN_CHARS", defaults.min_chars)),
+            min_web_chars=int(os.getenv("EVIDENCE_MIN_WEB_CHARS", defaults.min_web_chars)),
+            min_similarity=float(os.getenv("EVIDENCE_MIN_SIMILARITY", defaults.min_similarity)),
+            min_keyword_coverage=float(os.getenv("EVIDENCE_MIN_COVERAGE", defaults.min_keyword_coverage)),
+            min_score=float(os.getenv("EVIDENCE_MIN_SCORE", defaults.min_score))
+        )
+
+class EvidenceScore(BaseModel):
+    """근거 충분성 평가 결과"""
+    score: float
+    sufficient: bool
+    chars: int
+    similarity: Optional[float] = None
+    keyword_coverage: Optional[float] = None
+    missing_keywords: List[str] = Field(default_factory=list)
+
+    def summary(self):
+        similarity = f"{self.similarity:.2f}" if self.similarity is not None else "-"
+        coverage = f"{self.keyword_coverage:.0%}" if self.keyword_coverage is not None else "-"
+        return f"점수 {self.score:.2f} (길이 {self.chars}자, 유사도 {similarity}, 키워드 포함 {coverage})"
+
+def _keyword_covered(keyword, tokens):
+    """키워드를 이루는 단어의 절반 이상이 근거에 등장하면 포함된 것으로 봅니다."""
+    words = TOKEN.findall(keyword.lower())
+    if not words:
+        return True
+    return sum(word in tokens for word in words) * 2 >= len(words)
+
+def score_evidence(texts, keywords=None, similarities=None, thresholds=None, min_chars=None):
+    """근거 텍스트 길이, 검색 유사도, 키워드 포함 비율로 근거 충분성을 평가합니다 (LLM 호출 없음).
+
+    각 항목은 기준값 대비 비율(최대 1)로 환산하여 가중 평균하며, 값이 없는 항목(예: 웹 검색 결과의 유사도)은 제외합니다.
+    """
+    thresholds = thresholds or EvidenceThresholds()
+    min_chars = min_chars or thresholds.min_chars
+    texts = [text for text in texts or [] if text and text.strip()]
+    chars = sum(len(text.strip()) for text in texts)
+    components = [(0.3, min(1.0, chars / max(1, min_chars)))]
+
+    similarity = None
+    if similarities:
+        top = sorted(similarities, reverse=True)[:3]
+        similarity = sum(top) / len(top)
+        components.append((0.4, min(1.0, similarity / max(1e-6, thresholds.min_similarity))))
+
+    coverage = None
+    missing = []
+    keywords = [keyword for keyword in keywords or [] if keyword and keyword.strip()]
+    if keywords:
+        tokens = set(TOKEN.findall(" ".join(texts).lower()))
+        missing = [keyword for keyword in keywords if not _keyword_covered(keyword, tokens)]
+        coverage = 1 - len(missing) / len(keywords)
+        components.append((0.3, min(1.0, coverage / max(1e-6, thresholds.min_keyword_coverage))))
+
+    score = sum(weight * value for weight, value in components) / sum(weight for weight, _ in components)
+    result = EvidenceScore(
+        score=round(score, 3),
+        sufficient=chars > 0 and score >= thresholds.min_score,
+        chars=chars,
+        similarity=similarity,
+        keyword_coverage=coverage,
+        missing_keywords=missing
+    )
+    logger.info(f"근거 충분성 평가: {result.summary()} - {'충분' if result.sufficient else '부족'}")
+    return result
+
+def normalize_query(query):
+    """이미 시도한 쿼리인지 비교하기 위해 대소문자, 따옴표, 공백을 정규화합니다."""
+    return " ".join(query.lower().replace('"', " ").replace("'", " ").split())
+
+def _truncate(entries, max_entries):
+    """출처(vector, web)별로 자리를 고르게 나눈 뒤(출처마다 max_entries / 출처 수) 남은 자리를 순위가 높은 근거로 채웁니다.
+
+    같은 출처 안에서는 검색 유사도가 높은 근거를, 유사도가 없는 웹 검색 결과는 최근에 추가된 근거를 우선하므로
+    근거 부족을 메우려고 가져온 웹 검색 결과가 유사도가 없다는 이유로 먼저 버려지지 않습니다. 남는 근거는 추가된 순서를 유지합니다.
+    """
+    by_source = {}
+    for position, entry in enumerate(entries):
+        by_source.setdefault(entry.get("source"), []).append((entry.get("similarity") or 0.0, position))
+    for ranked in by_source.values():
+        ranked.sort(reverse=True)
+    share = max_entries // len(by_source)
+    keep = set()
+    for ranked in by_source.values():
+        keep.update(position for _, position in ranked[:share])
+    rest = sorted((item for ranked in by_source.values() for item in ranked[share:]), reverse=True)
+    keep.update(position for _, position in rest[:max_entries - len(keep)])
+    return [entries[position] for position in sorted(keep)]
+
+def merge_evidence(pool, entries, max_entries=40):
+    """근거 풀에 새 근거를 추가합니다 (같은 내용은 한 번만, 출처별로 자리를 나누어 최대 max_entries개).
+
+    근거 항목: {"source": "vector" | "web", "label": 출처 표시, "content": 내용, "similarity": 검색 유사도 또는 None}
+    반환값: (새 근거 풀, 실제로 추가된 근거 수)
+    """
+    seen = {hashlib.sha1(entry["content"].strip().encode("utf-8")).hexdigest() for entry in pool}
+    merged = list(pool)
+    added = 0
+    for entry in entries:
+        content = (entry.get("content") or "").strip()
+        if not content:
+            continue
+        key = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(dict(entry, content=content))
+        added += 1
+    if len(merged) > max_entries:
+        merged = _truncate(merged, max_entries)
+    return merged, added
+
+def format_evidence(entries):
+    """근거 풀 항목을 출처 헤더가 붙은 프롬프트용 텍스트로 변환합니다."""
+    return "\n".join(
+        f"### 결과 {i} ({entry.get('label', 'Unknown')})\n{entry['content']}\n"
+        for i, entry in enumerate(entries, 1)
+    )
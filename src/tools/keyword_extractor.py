@@ -0,0 +1,130 @@
+from loguru import logger
+from collections import Counter
+import re
+import threading
+import time
+import numpy as np
+
+from .keyword_relevance import embed_in_batches
+
+# 윤리적 리스크 어휘 (중심 벡터 계산용)
+RISK_VOCABULARY = (
+    "알고리즘 편향", "차별", "공정성", "개인정보 침해", "프라이버시", "데이터 보호", "동의 없는 데이터 수집",
+    "투명성 부족", "설명 가능성", "책임성", "인간 감독", "자동화된 의사결정", "프로파일링", "감시",
+    "생체 인식", "얼굴 인식", "감정 인식", "딥페이크", "허위 정보", "조작", "저작권 침해", "오용",
+    "안전성", "보안 취약점", "정확성", "신뢰성", "아동 보호", "취약 계층", "고용 차별", "신용 평가",
+    "algorithmic bias", "discrimination", "privacy", "data protection", "transparency", "accountability",
+    "human oversight", "surveillance", "biometric identification", "misinformation", "manipulation"
+)
+
+# 후보 구문에서 제외할 일반 단어
+STOPWORDS = {
+    "ai", "the", "and", "for", "with", "this", "that", "are", "from", "서비스", "기능", "사용자", "사용", "경우",
+    "관련", "통해", "대한", "위한", "있는", "있습니다", "합니다", "등의", "또한", "그리고", "하는", "되는", "수", "것",
+    "정보", "제공", "기반", "다양한", "주요", "분야", "내용", "설명", "출처"
+}
+
+# 구문 끝의 조사/어미 (가장 긴 것부터 제거)
+PARTICLES = sorted(
+    ("으로부터", "에서는", "에게서", "으로서", "으로써", "에서", "에게", "으로", "까지", "부터", "처럼",
+     "에는", "과의", "와의", "이며", "이고", "하는", "하여", "되는", "된", "한", "은", "는", "이", "가",
+     "을", "를", "의", "에", "로", "과", "와", "도", "만"),
+    key=len, reverse=True
+)
+
+# 서술어 어미로 끝나는 단어 (후보 구문에서 제외)
+VERB_ENDING = re.compile(r"(?:니다|하며|하고|되며|되고|하여|있음|없음|한다|된다|있다|없다|해야|할)$")
+
+WORD = re.compile(r"[A-Za-z][A-Za-z\-]+|[가-힣]+|\d+")
+SENTENCE_BREAK = re.compile(r"[.,;:!?()\[\]\"'“”‘’/\n·•*#|]+")
+
+def _strip_particle(word):
+    if not re.fullmatch(r"[가-힣]+", word):
+        return word
+    for particle in PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= 2:
+            return word[:-len(particle)]
+    return word
+
+def normalize_keywords(keywords, limit=None):
+    """키워드의 불릿, 번호, 강조 표시, 따옴표를 제거하고 대소문자/공백 차이를 무시하여 순서를 유지한 채 중복을 제거합니다."""
+    normalized = []
+    seen = set()
+    for keyword in keywords or []:
+        keyword = re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", str(keyword))
+        keyword = re.sub(r"[*_`\"'“”‘’]", "", keyword)
+        keyword = re.sub(r"\s*\([^)]*\)\s*$", "", keyword)
+        keyword = " ".join(keyword.split()).strip(" .,:;")
+        key = keyword.lower().replace(" ", "")
+        if len(keyword) <= 1 or key in seen:
+            continue
+        seen.add(key)
+        normalized.append(keyword)
+    return normalized[:limit] if limit else normalized
+
+def candidate_phrases(text, max_ngram=3, max_candidates=300):
+    """문장 구간 안에서 연속된 1~max_ngram 단어 구문을 후보로 만들고 빈도순 상위 max_candidates개를 반환합니다."""
+    counts = Counter()
+    for segment in SENTENCE_BREAK.split(text):
+        words = [_strip_particle(word) for word in WORD.findall(segment)]
+        for n in range(1, max_ngram + 1):
+            for i in range(len(words) - n + 1):
+                gram = words[i:i + n]
+                # 구문의 처음과 끝이 불용어나 한 글자 단어이거나 서술어를 포함하면 제외
+                if any(word.lower() in STOPWORDS or len(word) < 2 for word in (gram[0], gram[-1])):
+                    continue
+                if any(VERB_ENDING.search(word) for word in gram):
+                    continue
+                phrase = " ".join(gram)
+                if len(phrase.replace(" ", "")) >= 2 and not phrase.isdigit():
+                    counts[phrase] += 1
+    return [phrase for phrase, _ in counts.most_common(max_candidates)]
+
+def mmr(relevance, similarity, top_n, diversity=0.5):
+    """Maximal Marginal Relevance로 관련성이 높으면서 서로 겹치지 않는 후보 인덱스를 고릅니다."""
+    selected = [int(np.argmax(relevance))]
+    remaining = set(range(len(relevance))) - set(selected)
+    while remaining and len(selected) < top_n:
+        candidates = list(remaining)
+        redundancy = similarity[np.ix_(candidates, selected)].max(axis=1)
+        scores = (1 - diversity) * relevance[candidates] - diversity * redundancy
+        best = candidates[int(np.argmax(scores))]
+        selected.append(best)
+        remaining.discard(best)
+    return selected
+
+class KeywordExtractor:
+    """서비스 설명에서 윤리적 리스크 키워드를 LLM 호출 없이 추출합니다.
+
+    후보 구문과 윤리적 리스크 어휘 중심 벡터의 유사도로 관련성을 계산하고,
+    MMR로 비슷한 구문이 중복 선택되지 않게 합니다. 임베딩은 벡터 DB와 같은 모델을 재사용합니다.
+    """
+
+    def __init__(self, embeddings, vocabulary=RISK_VOCABULARY, diversity=0.5, batch_size=64):
+        self.embeddings = embeddings
+        self.vocabulary = list(vocabulary)
+        self.diversity = diversity
+        self.batch_size = batch_size
+        self._centroid = None
+        self._lock = threading.Lock()
+
+    def _risk_centroid(self):
+        """리스크 어휘 임베딩의 정규화된 중심 벡터 (한 번만 계산)"""
+        with self._lock:
+            if self._centroid is None:
+                centroid = embed_in_batches(self.embeddings, self.vocabulary, self.batch_size).mean(axis=0)
+                self._centroid = centroid / max(float(np.linalg.norm(centroid)), 1e-12)
+            return self._centroid
+
+    def extract(self, text, top_n=12):
+        """텍스트에서 윤리적 리스크 키워드 최대 top_n개를 관련성 순으로 반환합니다."""
+        started = time.perf_counter()
+        candidates = candidate_phrases(text or "")
+        if not candidates:
+            return []
+        matrix = embed_in_batches(self.embeddings, candidates, self.batch_size)
+        relevance = matrix @ self._risk_centroid()
+        selected = mmr(relevance, matrix @ matrix.T, min(top_n, len(candidates)), self.diversity)
+        keywords = normalize_keywords([candidates[index] for index in selected])
+        logger.info(f"임베딩 기반 키워드 추출: 후보 {len(candidates)}개 중 {len(keywords)}개 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        return keywords
@@ -0,0 +1,88 @@
+from loguru import logger
+import threading
+import numpy as np
+
+from .ethics_retriever import embed_texts, is_multilingual_embeddings
+
+# 윤리 기준 이름 -> 프레임워크 지식 베이스 이름
+FRAMEWORK_KEYS = {
+    "EU AI Act": "EU_AI_Act",
+    "UNESCO AI Ethics": "UNESCO_AI_Ethics",
+    "OECD AI Principles": "OECD_AI_Principles"
+}
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+def embed_in_batches(embeddings, texts, batch_size=64):
+    """텍스트를 batch_size 단위로 임베딩하여 정규화된 float32 행렬로 반환합니다."""
+    batches = [embed_texts(embeddings, texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)]
+    return _normalize(np.vstack(batches)) if batches else np.zeros((0, 0), dtype=np.float32)
+
+def _article_text(article):
+    return f"Article {article['number']} {article['title']}. " + " ".join(article["obligations"][:3])
+
+class KeywordArticleRelevance:
+    """윤리적 리스크 키워드 x 프레임워크 조항 유사도 행렬로 키워드별 근거 조항을 선택합니다.
+
+    조항 임베딩은 프레임워크별로 한 번만 계산하여 재사용하고,
+    실행마다 키워드만 배치 임베딩한 뒤 NumPy 행렬 곱으로 유사도를 구합니다.
+    조항은 영어이므로 영어 전용 임베딩 모델에서는 영어 키워드만 매핑해야 합니다 (multilingual이 True일 때만 한국어 키워드 사용 가능).
+    """
+
+    def __init__(self, embeddings, framework_kbs, batch_size=64):
+        self.embeddings = embeddings
+        self.framework_kbs = framework_kbs or {}
+        self.batch_size = batch_size
+        self.multilingual = is_multilingual_embeddings(embeddings)
+        self._matrices = {}
+        self._lock = threading.Lock()
+
+    def _article_matrix(self, framework):
+        """프레임워크 조항 번호 목록과 정규화된 조항 임베딩 행렬을 반환합니다."""
+        with self._lock:
+            if framework not in self._matrices:
+                articles = list(self.framework_kbs[framework].articles.values())
+                matrix = embed_in_batches(self.embeddings, [_article_text(article) for article in articles], self.batch_size)
+                self._matrices[framework] = (articles, matrix)
+                logger.info(f"조항 임베딩 행렬 생성: {framework} ({matrix.shape[0]}개 조항)")
+            return self._matrices[framework]
+
+    def keyword_evidence(self, criteria, keywords, top_k=3):
+        """키워드마다 유사도 상위 top_k 조항을 반환합니다: {키워드: [(조항, 유사도)]}"""
+        framework = FRAMEWORK_KEYS.get(criteria, criteria)
+        keywords = list(dict.fromkeys(keyword.strip() for keyword in keywords or [] if keyword and keyword.strip()))
+        if framework not in self.framework_kbs or not keywords:
+            return {}
+
+        articles, article_matrix = self._article_matrix(framework)
+        if not articles:
+            return {}
+        keyword_matrix = embed_in_batches(self.embeddings, keywords, self.batch_size)
+        similarities = keyword_matrix @ article_matrix.T
+
+        top_k = min(top_k, len(articles))
+        top_indices = np.argpartition(-similarities, top_k - 1, axis=1)[:, :top_k]
+        evidence = {}
+        for row, keyword in enumerate(keywords):
+            ranked = sorted(top_indices[row], key=lambda index: -similarities[row, index])
+            evidence[keyword] = [(articles[index], float(similarities[row, index])) for index in ranked]
+        return evidence
+
+def format_keyword_evidence(evidence):
+    """키워드별 근거 조항 매핑을 프롬프트용 간결한 텍스트로 변환합니다."""
+    if not evidence:
+        return "키워드별 근거 조항 없음 (적용 가능한 윤리 기준을 참고하세요)"
+    lines = []
+    for keyword, matches in evidence.items():
+        lines.append(f"- {keyword}")
+        for article, score in matches:
+            obligation = article["obligations"][0][:160] if article["obligations"] else ""
+            lines.append(f"  - Article {article['number']} ({article['title']}, 유사도 {score:.2f}): {obligation}")
+    return "\n".join(lines)
+
+def missing_keywords(text, keywords):
+    """응답 텍스트에 언급되지 않은 키워드 목록을 반환합니다."""
+    lowered = text.lower()
+    return [keyword for keyword in keywords or [] if keyword.strip() and keyword.strip().lower() not in lowered]
@@ -0,0 +1,162 @@
+from loguru import logger
+from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import List, Optional
+import os
+import re
+
+from .keyword_relevance import embed_in_batches, missing_keywords
+
+# state_score 순서와 같은 품질 점수 대상 상태 필드
+SCORED_FIELDS = ("service_info", "criteria_info", "risk_message")
+
+# 단계별 필수 섹션(제목에 포함되어야 하는 문구)과 최소 인용 수
+STAGE_SPECS = {
+    "service_info": {
+        "sections": ("서비스 개요", "관련 분류", "핵심 AI 기술", "데이터 처리", "주요 기능", "적용 분야", "인간 감독", "윤리적 고려사항", "윤리적 리스크 키워드", "출처"),
+        "min_citations": 1
+    },
+    "criteria_info": {
+        "sections": ("AI 서비스 분류", "적용 조항 및 부록", "주요 의무사항", "기술적 요구사항", "문서화 및 투명성", "평가 및 감독"),
+        "min_citations": 4
+    },
+    "risk_message": {
+        "sections": ("윤리 평가 요약", "주요 리스크 영역", "상세 리스크 분석", "잠재적 영향", "권고사항", "긍정적 측면", "종합 평가"),
+        "min_citations": 4
+    },
+    "report": {
+        "sections": ("AI 윤리성 리스크 진단 보고서", "요약", "서비스 개요", "윤리적 리스크 키워드", "적용된 윤리 기준", "윤리적 리스크 평가", "권고사항", "결론", "참고 문헌"),
+        "min_citations": 6
+    }
+}
+
+# 영어 중간 산출물 모드(INTERMEDIATE_LANGUAGE=en)의 기준 정보와 윤리 평가 섹션
+ENGLISH_STAGE_SPECS = {
+    "criteria_info": {
+        "sections": ("Classification", "Applicable Provisions", "Obligations", "Technical Requirements", "Documentation", "Assessment"),
+        "min_citations": 4
+    },
+    "risk_message": {
+        "sections": ("Summary", "Key Risk Areas", "Detailed Analysis", "Potential Impact", "Recommendations", "Positive Aspects", "Overall Assessment"),
+        "min_citations": 4
+    }
+}
+
+def stage_spec(stage, language="ko"):
+    """단계 결과 언어에 맞는 필수 섹션과 최소 인용 수"""
+    if language == "en" and stage in ENGLISH_STAGE_SPECS:
+        return ENGLISH_STAGE_SPECS[stage]
+    return STAGE_SPECS[stage]
+
+# 조항/부록/원칙 번호와 출처 표기
+CITATION_PATTERN = re.compile(
+    r"제\s*\d+\s*조|Article\s+\d+|부록\s*[IVX\d]+|Annex\s+[IVX\d]+|Recital\s+\d+|원칙\s*\d+|Principle\s+\d+|출처\s*:",
+    re.IGNORECASE
+)
+HEADING_PATTERN = re.compile(r"^\s*#{1,6}\s*(.+?)\s*$", re.MULTILINE)
+
+class QualityScore(BaseModel):
+    """단계 결과 품질 평가 결과"""
+    stage: str
+    language: str = "ko"
+    score: int = Field(description="품질 점수 (0~100)")
+    passed: bool
+    missing_sections: List[str] = Field(default_factory=list)
+    citations: int = 0
+    keyword_coverage: Optional[float] = None
+    missing_keywords: List[str] = Field(default_factory=list)
+
+    def summary(self):
+        coverage = f"{self.keyword_coverage:.0%}" if self.keyword_coverage is not None else "-"
+        return f"{self.stage} 점수 {self.score} (누락 섹션 {len(self.missing_sections)}개, 인용 {self.citations}개, 키워드 포함 {coverage})"
+
+    def feedback(self):
+        """검증 프롬프트에 넣을 부족한 점 목록"""
+        lines = []
+        if self.missing_sections:
+            lines.append(f"- 누락된 섹션: {', '.join(self.missing_sections)}")
+        if self.citations < stage_spec(self.stage, self.language)["min_citations"]:
+            lines.append(f"- 조항/부록 번호와 출처 인용이 부족합니다 (현재 {self.citations}개)")
+        if self.missing_keywords:
+            lines.append(f"- 다루어지지 않은 윤리적 리스크 키워드: {', '.join(self.missing_keywords)}")
+        return "\n".join(lines) or "- 없음"
+
+def updated_scores(state_score, field, score):
+    """state_score에서 field에 해당하는 점수만 바꾼 새 목록을 반환합니다."""
+    scores = list(state_score or [0] * len(SCORED_FIELDS))
+    scores += [0] * (len(SCORED_FIELDS) - len(scores))
+    scores[SCORED_FIELDS.index(field)] = score
+    return scores
+
+def _chunks(text, max_chunks):
+    """임베딩 비교용 문단 목록 (너무 짧은 줄은 제외)"""
+    paragraphs = [paragraph.strip() for paragraph in re.split(r"\n\s*\n|\n(?=\s*[-*#])", text)]
+    return [paragraph for paragraph in paragraphs if len(paragraph) >= 20][:max_chunks]
+
+class QualityScorer:
+    """섹션 구조, 인용 수, 키워드 포함 비율로 단계 결과 품질을 LLM 호출 없이 평가합니다.
+
+    키워드는 먼저 문자열 포함 여부로 확인하고, 누락된 키워드만 임베딩(주어진 경우)으로 문단과의 유사도를 계산하여
+    의미상 다루어졌는지 판단합니다. 같은 내용의 평가 결과는 캐시하여 재사용합니다.
+    """
+
+    def __init__(self, embeddings=None, min_score=None, keyword_similarity=None, max_chunks=48, cache_size=32):
+        self.embeddings = embeddings
+        self.min_score = min_score if min_score is not None else int(os.getenv("QUALITY_MIN_SCORE", "80"))
+        self.keyword_similarity = keyword_similarity if keyword_similarity is not None else float(os.getenv("QUALITY_KEYWORD_SIMILARITY", "0.55"))
+        self.max_chunks = max_chunks
+        self._score = lru_cache(maxsize=cache_size)(self._compute)
+
+    def score(self, stage, text, keywords=None, language="ko"):
+        """stage(service_info, criteria_info, risk_message, report) 결과 text의 품질을 평가합니다.
+        
+        language="en"이면 영어 중간 산출물의 섹션 구성(ENGLISH_STAGE_SPECS)으로 평가합니다.
+        """
+        keywords = tuple(dict.fromkeys(keyword.strip() for keyword in keywords or [] if keyword and keyword.strip()))
+        quality = self._score(stage, text or "", keywords, language)
+        logger.info(f"품질 평가: {quality.summary()} - {'통과' if quality.passed else '미달'}")
+        return quality
+
+    def _semantic_missing(self, text, keywords):
+        """문단 임베딩과의 최대 유사도가 기준에 못 미치는 키워드 목록을 반환합니다."""
+        chunks = _chunks(text, self.max_chunks)
+        if self.embeddings is None or not chunks:
+            return list(keywords)
+        try:
+            matrix = embed_in_batches(self.embeddings, list(keywords) + chunks)
+        except Exception as e:
+            logger.error(f"키워드 임베딩 비교 실패: {e}")
+            return list(keywords)
+        best = (matrix[:len(keywords)] @ matrix[len(keywords):].T).max(axis=1)
+        return [keyword for keyword, similarity in zip(keywords, best) if similarity < self.keyword_similarity]
+
+    def _compute(self, stage, text, keywords, language):
+        spec = stage_spec(stage, language)
+        headings = " ".join(HEADING_PATTERN.findall(text))
+        missing_sections = [section for section in spec["sections"] if section not in headings]
+        citations = len(CITATION_PATTERN.findall(text))
+
+        components = [
+            (0.4, 1 - len(missing_sections) / len(spec["sections"])),
+            (0.3, min(1.0, citations / spec["min_citations"]))
+        ]
+        coverage = None
+        missing = []
+        if keywords:
+            missing = missing_keywords(text, keywords)
+            if missing:
+                missing = self._semantic_missing(text, tuple(missing))
+            coverage = 1 - len(missing) / len(keywords)
+            components.append((0.3, coverage))
+
+        score = round(100 * sum(weight * value for weight, value in components) / sum(weight for weight, _ in components))
+        return QualityScore(
+            stage=stage,
+            language=language,
+            score=score,
+            passed=bool(text.strip()) and score >= self.min_score,
+            missing_sections=missing_sections,
+            citations=citations,
+            keyword_coverage=coverage,
+            missing_keywords=missing
+        )
@@ -3,6 +3,14 @@ import os
 from langchain_core.tools import Tool
 from langchain_core.messages import AIMessage
 import json
+import asyncio
+
+from ..utils.single_flight import get_single_flight
+from ..utils.resilience import get_provider_guard
+from ..utils.http_client import get_http_client
+from ..utils.progress import atrack_tool
+
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
 
 # 웹 검색 도구 설명
 WEB_SEARCH_DESCRIPTION = """
@@ -14,6 +22,53 @@ WEB_SEARCH_DESCRIPTION = """
 검색어를 구체적으로 작성할수록 더 관련성 높은 정보를 얻을 수 있습니다.
 """
 
+def _is_successful(message):
+    """오류 메시지가 아닌 검색 결과인지 확인합니다 (오류 결과는 다른 프로세스와 공유하지 않음)."""
+    return "오류가 발생했습니다" not in message.content
+
+def parse_serper_results(results, limit):
+    """Serper 검색 응답(JSON)에서 답변 상자, 지식 그래프, 상위 검색 결과의 요약문을 모아 문자열로 반환합니다."""
+    answer_box = results.get("answerBox") or {}
+    if answer_box.get("answer"):
+        return answer_box["answer"]
+    if answer_box.get("snippet"):
+        return answer_box["snippet"].replace("\n", " ")
+    if answer_box.get("snippetHighlighted"):
+        return " ".join(answer_box["snippetHighlighted"])
+    
+    snippets = []
+    knowledge_graph = results.get("knowledgeGraph") or {}
+    if knowledge_graph:
+        title = knowledge_graph.get("title")
+        if knowledge_graph.get("type"):
+            snippets.append(f"{title}: {knowledge_graph['type']}.")
+        if knowledge_graph.get("description"):
+            snippets.append(knowledge_graph["description"])
+        for attribute, value in (knowledge_graph.get("attributes") or {}).items():
+            snippets.append(f"{title} {attribute}: {value}.")
+    
+    for result in (results.get("organic") or [])[:limit]:
+        if "snippet" in result:
+            snippets.append(result["snippet"])
+        for attribute, value in (result.get("attributes") or {}).items():
+            snippets.append(f"{attribute}: {value}.")
+    
+    return " ".join(snippets) if snippets else "No good Google Search Result was found"
+
+def serper_search(query, serper_key):
+    """공유 연결 풀 HTTP 클라이언트로 Serper 검색을 수행하고 결과를 문자열로 반환합니다.
+    
+    검색 지역/언어/결과 수는 SERPER_GL, SERPER_HL, SERPER_NUM 환경 변수로 조정합니다 (기본 us, en, 10).
+    """
+    num = int(os.getenv("SERPER_NUM", "10"))
+    response = get_http_client().post(
+        SERPER_SEARCH_URL,
+        headers={"X-API-KEY": serper_key, "Content-Type": "application/json"},
+        json={"q": query, "gl": os.getenv("SERPER_GL", "us"), "hl": os.getenv("SERPER_HL", "en"), "num": num}
+    )
+    response.raise_for_status()
+    return parse_serper_results(response.json(), num)
+
 class WebSearchTool(Tool):
     """Serper를 사용하여 웹 검색을 수행하는 도구"""
     
@@ -31,15 +86,10 @@ class WebSearchTool(Tool):
     
     async def _arun(self, query: str) -> str:
         """비동기적으로 웹 검색을 수행합니다."""
-        from langchain_community.utilities import GoogleSerperAPIWrapper
-        
         try:
             logger.info(f"웹 검색 수행: {query}")
-            # Serper 래퍼 초기화
-            search = GoogleSerperAPIWrapper(serper_api_key=self.serper_key)
-            
-            # 검색 수행
-            results = search.run(query)
+            # 검색 수행 (공유 연결 풀, 속도 제한, 재시도, 회로 차단 적용)
+            results = await asyncio.to_thread(get_provider_guard("serper").call, serper_search, query, self.serper_key)
             
             logger.info(f"웹 검색 완료: {len(results)} 자 결과")
             return results
@@ -51,7 +101,16 @@ def create_web_search_tool():
     """웹 검색 도구를 생성합니다."""
     
     async def web_search_function(query: str):
-        """웹 검색 함수"""
+        """웹 검색 함수 (같은 쿼리의 동시 검색은 한 번만 수행)"""
+        single_flight = get_single_flight()
+        key = single_flight.make_key("web_search", query)
+        return await atrack_tool(
+            "web_search",
+            {"query": query},
+            single_flight.ado(key, _web_search, query, share_result=_is_successful)
+        )
+    
+    async def _web_search(query: str):
         try:
             # SerpAPI 키 확인
             serper_key = os.getenv("SERPER_API_KEY")
@@ -59,13 +118,9 @@ def create_web_search_tool():
                 logger.error("SERPER_API_KEY 환경 변수가 설정되지 않았습니다.")
                 return AIMessage(content="SERPER_API_KEY 환경 변수가 설정되지 않았습니다.")
             
-            # SerpAPI 래퍼 초기화
-            from langchain_community.utilities import GoogleSerperAPIWrapper
-            search = GoogleSerperAPIWrapper(serper_api_key=serper_key)
-            
-            # 검색 수행
+            # 검색 수행 (공유 연결 풀, 속도 제한, 재시도, 회로 차단 적용)
             logger.info(f"웹 검색 수행: {query}")
-            results = search.run(query)
+            results = await asyncio.to_thread(get_provider_guard("serper").call, serper_search, query, serper_key)
             
             logger.info(f"웹 검색 완료: {len(results)} 자 결과")
             return AIMessage(content=results)
@@ -1,5 +1,8 @@
-from .logger import setup_logger
+from .logger import setup_logger, console, run_context, log_payload
 from .config import load_config
 from .file_utils import save_json, load_json, save_report
+from .single_flight import SingleFlight, get_single_flight
+from .http_client import get_http_client, get_async_http_client, get_pool_metrics
+from .artifacts import ArtifactManager, get_artifact_manager
 
-__all__ = ["setup_logger", "load_config", "save_json", "load_json", "save_report"] 
\ No newline at end of file
+__all__ = ["setup_logger", "console", "run_context", "log_payload", "load_config", "save_json", "load_json", "save_report", "SingleFlight", "get_single_flight", "get_http_client", "get_async_http_client", "get_pool_metrics", "ArtifactManager", "get_artifact_manager"] 
\ No newline at end of file
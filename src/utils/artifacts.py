@@ -0,0 +1,120 @@
+from loguru import logger
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import json
+import os
+import tempfile
+import threading
+import time
+
+# 보존 기간 정리 대상 산출물 종류 (DB, 캐시는 제외)
+# locks: 비정상 종료한 프로세스가 남긴 single-flight 잠금/대기 표시/결과 파일
+# blobs: 상태 메시지 blob (마지막으로 쓰거나 읽은 시각 기준)
+RETENTION_KINDS = ("reports", "states", "journals", "logs", "locks", "blobs")
+
+# 환경 변수로 루트 밖의 디렉토리를 지정할 수 있는 산출물 종류
+RETENTION_DIR_ENV = {"locks": "SINGLE_FLIGHT_LOCK_DIR", "blobs": "STATE_BLOB_DIR"}
+
+class ArtifactManager:
+    """로그, 보고서, 상태 등 산출물 경로를 한 곳에서 관리합니다.
+
+    - 루트 디렉토리 설정 (ARTIFACT_ROOT)
+    - 실행별 산출물은 날짜/실행 ID 앞 2자리로 디렉토리를 나누어 한 디렉토리의 파일 수를 제한
+    - 임시 파일에 쓴 뒤 이름 변경(atomic write)
+    - 보존 기간(ARTIFACT_RETENTION_DAYS)이 지난 산출물 정리
+    """
+
+    def __init__(self, root="outputs", retention_days=0):
+        self.root = root
+        self.retention_days = retention_days
+
+    def path(self, kind, *parts):
+        """산출물 종류별 경로를 반환합니다 (상위 디렉토리는 생성)."""
+        path = os.path.join(self.root, kind, *parts)
+        os.makedirs(os.path.dirname(path) if parts else path, exist_ok=True)
+        return path
+
+    def shard_dir(self, kind, run_id, dated=True, when=None):
+        """실행별 산출물 디렉토리: <root>/<kind>/[YYYY-MM-DD/]<run_id 앞 2자리>/"""
+        parts = [self.root, kind]
+        if dated:
+            parts.append((when or datetime.now()).strftime("%Y-%m-%d"))
+        parts.append(run_id[:2] or "_")
+        directory = os.path.join(*parts)
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    @contextmanager
+    def atomic_path(self, path):
+        """같은 디렉토리의 임시 경로를 제공하고, 블록이 정상 종료되면 대상 경로로 이름을 바꿉니다."""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        os.close(fd)
+        try:
+            yield tmp_path
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def write_text(self, path, text):
+        """텍스트 파일을 원자적으로 저장합니다."""
+        with self.atomic_path(path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return path
+
+    def write_json(self, path, data):
+        """JSON 파일을 원자적으로 저장합니다."""
+        return self.write_text(path, json.dumps(data, ensure_ascii=False, indent=2))
+
+    def cleanup(self, retention_days=None, kinds=RETENTION_KINDS, keep=None):
+        """보존 기간이 지난 산출물 파일과 빈 디렉토리를 삭제하고 삭제한 파일 수를 반환합니다.
+
+        keep(kind, filepath)가 True를 반환하는 파일은 보존 기간이 지나도 삭제하지 않습니다 (아직 참조 중인 blob 등).
+        """
+        retention_days = self.retention_days if retention_days is None else retention_days
+        if not retention_days or retention_days <= 0:
+            return 0
+
+        cutoff = time.time() - timedelta(days=retention_days).total_seconds()
+        removed = 0
+        for kind in kinds:
+            base = os.getenv(RETENTION_DIR_ENV.get(kind, ""), "") or os.path.join(self.root, kind)
+            if not os.path.isdir(base):
+                continue
+            for directory, _, filenames in os.walk(base, topdown=False):
+                for filename in filenames:
+                    filepath = os.path.join(directory, filename)
+                    try:
+                        if os.path.getmtime(filepath) < cutoff and not (keep and keep(kind, filepath)):
+                            os.remove(filepath)
+                            removed += 1
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        logger.warning(f"산출물 삭제 실패: {filepath} ({e})")
+                if directory != base:
+                    # 다른 작업이 확인과 삭제 사이에 파일을 쓰면 디렉토리가 비어 있지 않으므로 그대로 둠
+                    try:
+                        if not os.listdir(directory):
+                            os.rmdir(directory)
+                    except OSError:
+                        pass
+        logger.info(f"보존 기간({retention_days}일)이 지난 산출물 {removed}개 삭제")
+        return removed
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_artifact_manager():
+    """프로세스 전역 산출물 관리자를 반환합니다 (ARTIFACT_ROOT, ARTIFACT_RETENTION_DAYS 환경 변수)."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ArtifactManager(
+                root=os.getenv("ARTIFACT_ROOT", "outputs"),
+                retention_days=int(os.getenv("ARTIFACT_RETENTION_DAYS", "0"))
+            )
+        return _manager
@@ -1,18 +1,38 @@
 import os
 import json
 import markdown
-from weasyprint import HTML, CSS
 from datetime import datetime
 from loguru import logger
 
-def save_json(data, filename, directory="outputs/states"):
+from .artifacts import get_artifact_manager
+
+# PDF 렌더링을 위임할 실행기 (배치 모드에서 프로세스 풀 지정, None이면 현재 프로세스에서 렌더링)
+_pdf_executor = None
+
+def set_pdf_executor(executor):
+    """PDF 렌더링(CPU 작업)을 실행할 실행기를 설정합니다."""
+    global _pdf_executor
+    _pdf_executor = executor
+
+def render_pdf(html, pdf_filepath):
+    """HTML을 PDF 파일로 렌더링합니다 (임시 파일에 렌더링한 뒤 이름 변경).
+
+    WeasyPrint는 시스템 라이브러리(Pango)가 없으면 import 시 OSError를 내므로 PDF를 만들 때만 불러옵니다.
+    """
+    from weasyprint import HTML
+    with get_artifact_manager().atomic_path(pdf_filepath) as tmp_path:
+        HTML(string=html).write_pdf(tmp_path)
+    return pdf_filepath
+
+def save_json(data, filename, directory=None):
     """JSON 데이터를 파일로 저장합니다."""
+    artifacts = get_artifact_manager()
+    directory = directory or artifacts.path("states")
     os.makedirs(directory, exist_ok=True)
     filepath = os.path.join(directory, filename)
     
     try:
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        artifacts.write_json(filepath, data)
         logger.info(f"JSON 파일 저장 완료: {filepath}")
         return filepath
     except Exception as e:
@@ -30,13 +50,19 @@ def load_json(filepath):
         logger.error(f"JSON 파일 로드 실패: {e}")
         raise
 
-def save_report(content, service_name, criteria, directory="outputs/reports"):
-    """보고서를 TXT 파일과 PDF 파일로 저장합니다."""
+def save_report(content, service_name, criteria, directory=None, run_id=None):
+    """보고서를 TXT 파일과 PDF 파일로 저장합니다.
+    
+    directory를 지정하지 않으면 산출물 루트의 날짜/실행 ID별 reports 디렉토리에 저장합니다.
+    """
     try:
         # 디렉토리 생성
+        artifacts = get_artifact_manager()
+        if directory is None:
+            directory = artifacts.shard_dir("reports", run_id) if run_id else artifacts.path("reports")
         os.makedirs(directory, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_filename = f"{service_name}_{criteria}_{timestamp}"
+        base_filename = f"{service_name}_{criteria}_{timestamp}" + (f"_{run_id[:8]}" if run_id else "")
         
         # TXT 파일 저장 경로
         txt_filename = f"{base_filename}.txt"
@@ -47,8 +73,7 @@ def save_report(content, service_name, criteria, directory="outputs/reports"):
         pdf_filepath = os.path.join(directory, pdf_filename)
         
         # TXT 파일 저장
-        with open(txt_filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        artifacts.write_text(txt_filepath, content)
         logger.info(f"TXT 보고서 저장 완료: {txt_filepath}")
         
         # 마크다운을 HTML로 변환
@@ -81,7 +106,10 @@ def save_report(content, service_name, criteria, directory="outputs/reports"):
             """
             
             # HTML을 PDF로 변환
-            HTML(string=styled_html).write_pdf(pdf_filepath)
+            if _pdf_executor is not None:
+                _pdf_executor.submit(render_pdf, styled_html, pdf_filepath).result()
+            else:
+                render_pdf(styled_html, pdf_filepath)
             logger.info(f"PDF 보고서 저장 완료: {pdf_filepath}")
         except Exception as pdf_error:
             logger.error(f"PDF 변환 중 오류: {pdf_error}")
@@ -0,0 +1,158 @@
+from loguru import logger
+from collections import defaultdict
+import asyncio
+import httpx
+import os
+import threading
+import time
+
+class PoolMetrics:
+    """공유 HTTP 클라이언트의 요청/연결 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.connections_opened = 0
+        self.total_latency = 0.0
+        self.by_host = defaultdict(int)
+        self.http_versions = defaultdict(int)
+
+    def on_request(self, request):
+        request.extensions["started_at"] = time.perf_counter()
+        # httpcore trace 훅으로 새 TCP 연결 수립 여부를 집계 (keep-alive 재사용률 확인용)
+        request.extensions["trace"] = self._trace
+
+    def on_response(self, response):
+        started_at = response.request.extensions.get("started_at")
+        with self._lock:
+            self.requests += 1
+            self.by_host[response.request.url.host] += 1
+            self.http_versions[response.http_version] += 1
+            if started_at is not None:
+                self.total_latency += time.perf_counter() - started_at
+            if response.status_code >= 400:
+                self.errors += 1
+
+    def _trace(self, event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+
+    # 비동기 클라이언트용 훅 (httpx 비동기 이벤트 훅과 httpcore 비동기 trace는 코루틴이어야 함)
+    async def aon_request(self, request):
+        request.extensions["started_at"] = time.perf_counter()
+        request.extensions["trace"] = self._atrace
+
+    async def aon_response(self, response):
+        self.on_response(response)
+
+    async def _atrace(self, event_name, info):
+        self._trace(event_name, info)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "connections_opened": self.connections_opened,
+                "connection_reuse_ratio": round(1 - self.connections_opened / self.requests, 3) if self.requests else None,
+                "avg_latency_ms": round(self.total_latency / self.requests * 1000, 1) if self.requests else None,
+                "by_host": dict(self.by_host),
+                "http_versions": dict(self.http_versions)
+            }
+
+class _LoopLocalTransport(httpx.AsyncBaseTransport):
+    """이벤트 루프별 연결 풀로 요청을 보내는 비동기 전송 계층
+
+    비동기 연결은 생성한 이벤트 루프에서만 쓸 수 있으므로, 노드 안에서 asyncio.run으로 만든 루프와
+    워크플로우 루프가 같은 클라이언트를 공유해도 루프마다 별도 연결 풀을 사용합니다.
+    """
+
+    def __init__(self, **transport_kwargs):
+        self._transport_kwargs = transport_kwargs
+        self._transports = {}
+        self._lock = threading.Lock()
+
+    def _transport(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # 닫힌 루프의 연결 풀은 버림
+            for closed in [key for key in self._transports if key.is_closed()]:
+                del self._transports[closed]
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self._transport_kwargs)
+            return transport
+
+    async def handle_async_request(self, request):
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self):
+        transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+_metrics = PoolMetrics()
+
+def _limits():
+    return httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "50")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    )
+
+def _timeout():
+    return httpx.Timeout(float(os.getenv("HTTP_TIMEOUT", "60")), connect=10.0)
+
+def _http2_available():
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def get_http_client():
+    """프로세스 전역에서 공유하는 keep-alive 연결 풀 HTTP 클라이언트를 반환합니다 (h2 설치 시 HTTP/2)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            http2 = _http2_available()
+            _client = httpx.Client(
+                http2=http2,
+                limits=_limits(),
+                timeout=_timeout(),
+                event_hooks={"request": [_metrics.on_request], "response": [_metrics.on_response]}
+            )
+            logger.info(f"공유 HTTP 클라이언트 초기화 (HTTP/2: {http2})")
+        return _client
+
+def get_async_http_client():
+    """프로세스 전역에서 공유하는 비동기 HTTP 클라이언트를 반환합니다 (이벤트 루프별 keep-alive 연결 풀, 통계는 동기 클라이언트와 합산)."""
+    global _async_client
+    with _client_lock:
+        if _async_client is None:
+            http2 = _http2_available()
+            _async_client = httpx.AsyncClient(
+                transport=_LoopLocalTransport(http2=http2, limits=_limits()),
+                timeout=_timeout(),
+                event_hooks={"request": [_metrics.aon_request], "response": [_metrics.aon_response]}
+            )
+            logger.info(f"공유 비동기 HTTP 클라이언트 초기화 (HTTP/2: {http2})")
+        return _async_client
+
+def get_pool_metrics():
+    """공유 HTTP 클라이언트의 연결 풀 통계를 반환합니다."""
+    return _metrics.snapshot()
+
+def close_http_client():
+    """공유 HTTP 클라이언트를 닫습니다 (비동기 클라이언트는 참조만 버리며, 연결은 각 이벤트 루프 종료 시 정리됨)."""
+    global _client, _async_client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        _async_client = None
@@ -1,20 +1,85 @@
 from loguru import logger
+import random
 import sys
 import os
 
+from .artifacts import get_artifact_manager
+
+TEXT_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <magenta>{extra[workflow_id]}</magenta> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+FILE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {extra[workflow_id]} | {name}:{function}:{line} - {message}"
+
+# 큰 내용(검색 결과, 생성 결과 등) 로그 샘플링 설정
+_payload_sample_rate = 0.0
+_payload_max_chars = 200
+
+def _env_flag(name, default):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+def _is_console(record):
+    return record["extra"].get("console", False)
+
 # 로그 설정
-def setup_logger():
-    """로그 설정을 초기화합니다."""
-    
+def setup_logger(json_logs=None, enqueue=None, console=None):
+    """로그 설정을 초기화합니다.
+
+    - enqueue: 로그 기록을 큐에 넣고 별도 스레드가 출력 (작업 스레드가 로그 I/O로 막히지 않음, LOG_ENQUEUE)
+    - json_logs: 구조화된 JSON 레코드로 출력 (LOG_FORMAT=json)
+    - console: console()로 출력하는 사용자 메시지를 표준 출력에 표시 (배치/서버 모드에서는 끔, LOG_CONSOLE)
+    """
+    global _payload_sample_rate, _payload_max_chars
+    if json_logs is None:
+        json_logs = os.getenv("LOG_FORMAT", "text").lower() == "json"
+    if enqueue is None:
+        enqueue = _env_flag("LOG_ENQUEUE", "true")
+    if console is None:
+        console = _env_flag("LOG_CONSOLE", "true")
+    _payload_sample_rate = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.1"))
+    _payload_max_chars = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "200"))
+
     # 로그 디렉토리 생성
-    os.makedirs("ai_agent/logs", exist_ok=True)
-    
-    # 콘솔에 로그 출력 설정
+    log_dir = os.getenv("LOG_DIR") or get_artifact_manager().path("logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    # 실행별 컨텍스트(workflow_id) 기본값
     logger.remove()  # 기본 핸들러 제거
-    logger.add(sys.stderr, level="INFO", format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>")
-    
+    logger.configure(extra={"workflow_id": "-"})
+
+    # 콘솔에 로그 출력 설정 (사용자 메시지는 별도 싱크에서 출력)
+    if json_logs:
+        logger.add(sys.stderr, level=os.getenv("LOG_LEVEL", "INFO"), serialize=True, enqueue=enqueue, filter=lambda record: not _is_console(record))
+    else:
+        logger.add(sys.stderr, level=os.getenv("LOG_LEVEL", "INFO"), format=TEXT_FORMAT, enqueue=enqueue, filter=lambda record: not _is_console(record))
+
+    # 사용자 메시지(print 대체) 출력 설정
+    if console:
+        logger.add(sys.stdout, level="INFO", format="{message}", enqueue=enqueue, filter=_is_console)
+
     # 파일에 로그 출력 설정
-    logger.add("ai_agent/logs/ai_ethics.log", rotation="10 MB", level="DEBUG", format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}")
-    
-    logger.info("로거 설정 완료")
-    return logger 
\ No newline at end of file
+    logger.add(
+        os.path.join(log_dir, "ai_ethics.log" if not json_logs else "ai_ethics.jsonl"),
+        rotation="10 MB",
+        level="DEBUG",
+        format=FILE_FORMAT,
+        serialize=json_logs,
+        enqueue=enqueue
+    )
+
+    logger.info(f"로거 설정 완료 (enqueue={enqueue}, json={json_logs}, console={console})")
+    return logger
+
+def console(message):
+    """사용자에게 보여줄 진행 메시지를 출력합니다 (print 대체, LOG_CONSOLE=false이면 로그 파일에만 기록)."""
+    logger.bind(console=True).opt(depth=1).info(message)
+
+def run_context(workflow_id):
+    """블록 안의 모든 로그 레코드에 workflow_id를 붙이는 컨텍스트를 반환합니다."""
+    return logger.contextualize(workflow_id=workflow_id)
+
+def log_payload(label, text, level="DEBUG"):
+    """큰 내용은 길이만 기록하고, LOG_PAYLOAD_SAMPLE_RATE 비율로만 앞부분 미리보기를 기록합니다."""
+    text = text if isinstance(text, str) else str(text)
+    if _payload_sample_rate > 0 and random.random() < _payload_sample_rate:
+        preview = text[:_payload_max_chars] + ("..." if len(text) > _payload_max_chars else "")
+        logger.opt(depth=1).log(level, f"{label} ({len(text)} 자): {preview}")
+    else:
+        logger.opt(depth=1).log(level, f"{label} ({len(text)} 자)")
@@ -0,0 +1,131 @@
+from loguru import logger
+from langchain_core.runnables import Runnable
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 호출 지점별 작업 유형
+TRANSLATE = "translate"  # 키워드/용어 번역
+REWRITE = "rewrite"      # 검색 쿼리 생성과 리라이팅
+EXTRACT = "extract"      # 키워드 추출, 검색 결과 압축
+ANALYSE = "analyse"      # 서비스 분석, 기준 분석, 윤리 평가
+WRITE = "write"          # 보고서 작성과 검증
+TASK_CLASSES = (TRANSLATE, REWRITE, EXTRACT, ANALYSE, WRITE)
+
+# 작업 유형 -> 모델 등급 기본값 (작고 빠른 모델은 보조 호출, 큰 모델은 분석과 보고서 작성)
+DEFAULT_TASK_TIERS = {
+    TRANSLATE: "small",
+    REWRITE: "small",
+    EXTRACT: "small",
+    ANALYSE: "large",
+    WRITE: "large"
+}
+
+def parse_task_tiers(value):
+    """'translate=small,analyse=large' 형식의 설정을 작업 유형 -> 등급 딕셔너리로 변환합니다."""
+    task_tiers = {}
+    for item in (value or "").split(","):
+        if "=" not in item:
+            continue
+        task, tier = (part.strip() for part in item.split("=", 1))
+        if task not in TASK_CLASSES:
+            logger.warning(f"알 수 없는 작업 유형 무시: {task}")
+            continue
+        task_tiers[task] = tier
+    return task_tiers
+
+class ConcurrencyLimitedChatModel(Runnable):
+    """모델 등급별 동시 호출 수를 제한하는 채팅 모델 래퍼
+
+    같은 등급의 모든 작업 유형이 하나의 세마포어를 공유하며(동기/비동기 호출 공통), 그 밖의 속성은 원본 모델에 위임합니다.
+    """
+
+    def __init__(self, llm, tier, max_concurrency):
+        self.llm = llm
+        self.tier = tier
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        # 비동기 호출의 세마포어 대기 전용 스레드 (이벤트 루프와 무관한 Future로 취소 후 획득한 허가를 반환)
+        self._acquirer = ThreadPoolExecutor(thread_name_prefix=f"llm-{tier}-acquire")
+
+    def invoke(self, input, config=None, **kwargs):
+        with self._semaphore:
+            return self.llm.invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        # 스레드 세마포어 대기가 이벤트 루프를 막지 않도록 별도 스레드에서 획득
+        acquiring = self._acquirer.submit(self._semaphore.acquire)
+        try:
+            await asyncio.wrap_future(acquiring)
+        except asyncio.CancelledError:
+            # 대기 중인 작업이 취소되어도 이미 획득 중이던 스레드가 나중에 얻은 허가는 반환
+            acquiring.add_done_callback(self._release_if_acquired)
+            raise
+        try:
+            return await self.llm.ainvoke(input, config, **kwargs)
+        finally:
+            self._semaphore.release()
+
+    def _release_if_acquired(self, acquiring):
+        if not acquiring.cancelled() and acquiring.exception() is None:
+            self._semaphore.release()
+
+    def __getattr__(self, name):
+        if name in ("llm", "tier", "max_concurrency", "_semaphore", "_acquirer"):
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+class ModelRouter(Runnable):
+    """작업 유형별로 모델 등급을 선택하는 채팅 모델 라우터
+
+    에이전트는 for_task(llm, 작업 유형)으로 호출 지점에 맞는 모델을 얻습니다.
+    라우터를 직접 호출하면(llm.invoke) default_task 등급의 모델을 사용하므로 단일 모델과 같은 방식으로도 쓸 수 있습니다.
+    """
+
+    def __init__(self, tiers, task_tiers=None, concurrency=None, default_task=ANALYSE):
+        concurrency = concurrency or {}
+        self.tiers = {
+            tier: ConcurrencyLimitedChatModel(llm, tier, concurrency[tier]) if concurrency.get(tier) else llm
+            for tier, llm in tiers.items()
+        }
+        self.task_tiers = dict(DEFAULT_TASK_TIERS, **(task_tiers or {}))
+        self.default_task = default_task
+        for task, tier in self.task_tiers.items():
+            if tier not in self.tiers:
+                raise ValueError(f"작업 유형 {task}의 모델 등급 {tier}이(가) 설정되지 않았습니다 (등급: {list(self.tiers)})")
+        logger.info(f"모델 라우터 설정: {self.describe()}")
+
+    def for_task(self, task):
+        """작업 유형에 배정된 등급의 모델을 반환합니다."""
+        return self.tiers[self.task_tiers.get(task, self.task_tiers[self.default_task])]
+
+    def describe(self):
+        """작업 유형 -> 등급(모델 이름) 요약"""
+        return ", ".join(
+            f"{task}={tier}({_model_name(self.tiers[tier])})" for task, tier in self.task_tiers.items()
+        )
+
+    @property
+    def model_name(self):
+        """단계 캐시 키에 쓰이는 모델 이름 (등급 구성이 바뀌면 캐시도 무효화됨)"""
+        return "+".join(f"{tier}:{_model_name(llm)}" for tier, llm in sorted(self.tiers.items()))
+
+    def invoke(self, input, config=None, **kwargs):
+        return self.for_task(self.default_task).invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        return await self.for_task(self.default_task).ainvoke(input, config, **kwargs)
+
+    def __getattr__(self, name):
+        if name in ("tiers", "task_tiers", "default_task"):
+            raise AttributeError(name)
+        return getattr(self.for_task(self.default_task), name)
+
+def _model_name(llm):
+    return str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or llm.__class__.__name__)
+
+def for_task(llm, task):
+    """llm이 ModelRouter이면 작업 유형에 맞는 모델을, 단일 모델이면 그대로 반환합니다."""
+    if isinstance(llm, ModelRouter):
+        return llm.for_task(task)
+    return llm
@@ -0,0 +1,35 @@
+from langchain_core.callbacks.manager import adispatch_custom_event, dispatch_custom_event
+import time
+
+# 도구 호출 진행 이벤트 이름 (워크플로우 이벤트 스트림에서 tool_call / tool_end 이벤트로 전달)
+TOOL_CALL_EVENT = "tool_call"
+TOOL_END_EVENT = "tool_end"
+
+def emit_progress(name, data):
+    """실행 중인 워크플로우 이벤트 스트림에 사용자 정의 진행 이벤트를 보냅니다.
+
+    이벤트 스트림 밖(상위 실행 없음)에서 호출되면 아무것도 하지 않습니다.
+    """
+    try:
+        dispatch_custom_event(name, data)
+    except RuntimeError:
+        pass
+
+async def aemit_progress(name, data):
+    """emit_progress의 비동기 버전"""
+    try:
+        await adispatch_custom_event(name, data)
+    except RuntimeError:
+        pass
+
+async def atrack_tool(tool, tool_input, coro):
+    """도구 코루틴을 실행하면서 호출 시작/종료(소요 시간, 결과 길이) 이벤트를 보냅니다."""
+    await aemit_progress(TOOL_CALL_EVENT, {"tool": tool, "input": tool_input})
+    started = time.perf_counter()
+    result = await coro
+    await aemit_progress(TOOL_END_EVENT, {
+        "tool": tool,
+        "duration": round(time.perf_counter() - started, 3),
+        "output_chars": len(getattr(result, "content", "") or "")
+    })
+    return result
@@ -0,0 +1,329 @@
+from loguru import logger
+from langchain_core.runnables import Runnable
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+
+# 재시도 대상 HTTP 상태 코드와 예외 클래스 이름
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_EXCEPTION_NAMES = {
+    "APIConnectionError", "APITimeoutError", "InternalServerError", "RateLimitError",
+    "Timeout", "TimeoutError", "ReadTimeout", "ConnectTimeout", "ConnectionError", "ConnectError"
+}
+
+class CircuitOpenError(RuntimeError):
+    """회로 차단기가 열려 있어 호출을 거부할 때 발생하는 예외"""
+
+def _parse_duration(value):
+    """'1s', '6m0s', '20ms', '0.5' 형식의 시간 문자열을 초 단위로 변환합니다."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", value):
+        matched = True
+        total += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total if matched else None
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _status_code(error):
+    """예외에서 HTTP 상태 코드를 추출합니다."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+def _error_headers(error):
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    return headers or {}
+
+def is_retryable(error):
+    """일시적인 오류(429, 5xx, 타임아웃, 연결 오류)인지 확인합니다."""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return type(error).__name__ in RETRYABLE_EXCEPTION_NAMES
+
+class AdaptiveTokenBucket:
+    """응답 헤더와 429 응답에 따라 속도를 조절하는 토큰 버킷 (AIMD)"""
+
+    def __init__(self, rate, capacity=None, min_rate=0.1, max_rate=None):
+        self.rate = float(rate)
+        self.min_rate = min_rate
+        self.max_rate = float(max_rate or rate * 4)
+        self.capacity = float(capacity or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self):
+        """토큰 1개를 예약하고, 사용 가능해질 때까지 기다려야 하는 시간을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self._paused_until - now)
+            self._tokens -= 1
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def acquire(self):
+        """요청 1건을 보낼 수 있을 때까지 대기합니다."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        """성공 시 속도를 조금씩 올립니다 (additive increase)."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 0.05)
+
+    def on_throttled(self, retry_after=None):
+        """429 응답 시 속도를 절반으로 줄이고 retry-after 동안 요청을 멈춥니다 (multiplicative decrease)."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        logger.warning(f"요청 속도 제한 감지: {self.rate:.2f} req/s로 감속 (retry-after={retry_after})")
+
+    def update_from_headers(self, headers):
+        """x-ratelimit-* 헤더로 지속 가능한 최대 속도를 갱신합니다."""
+        if not headers:
+            return
+        headers = {str(key).lower(): value for key, value in dict(headers).items()}
+        limit = _to_float(headers.get("x-ratelimit-limit-requests"))
+        remaining = _to_float(headers.get("x-ratelimit-remaining-requests"))
+        reset = _parse_duration(headers.get("x-ratelimit-reset-requests"))
+        with self._lock:
+            if limit:
+                # 분당 요청 한도를 초당 상한으로 사용
+                self.max_rate = max(self.min_rate, limit / 60.0)
+                self.rate = min(self.rate, self.max_rate)
+            if remaining is not None and reset and limit and remaining < limit * 0.1:
+                # 한도가 거의 소진되면 남은 요청을 리셋 시간 동안 고르게 분배
+                self.rate = max(self.min_rate, min(self.rate, remaining / reset))
+
+class CircuitBreaker:
+    """연속된 일시적 실패가 임계값을 넘으면 일정 시간 호출을 차단하는 회로 차단기
+
+    차단 시간(recovery_timeout)이 지나면 half_open 상태가 되어 복구 확인 호출 1건만 통과시키고,
+    그 호출이 성공하면 닫히고 일시적 오류로 실패하면 다시 열립니다.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.recovery_timeout:
+            return "half_open"
+        return "open"
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def before_call(self, name):
+        """호출 가능 여부를 확인합니다. half_open 상태에서는 복구 확인 호출 1건만 허용합니다."""
+        with self._lock:
+            state = self._state()
+            if state == "open":
+                raise CircuitOpenError(f"{name} 호출이 일시 차단되었습니다 (연속 실패 {self._failures}회)")
+            if state == "half_open":
+                if self._probing:
+                    raise CircuitOpenError(f"{name} 복구 확인 호출이 진행 중이어서 호출이 일시 차단되었습니다")
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        """일시적 실패(재시도 대상 오류)를 기록합니다. 복구 확인 호출이 실패하면 즉시 다시 엽니다."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release_probe(self):
+        """공급자 상태와 무관한 이유(잘못된 요청, 취소 등)로 끝난 복구 확인 호출의 자리를 반환합니다."""
+        with self._lock:
+            self._probing = False
+
+class ProviderGuard:
+    """공급자(OpenAI, Serper)별 속도 제한, 지터 지수 백오프 재시도, 회로 차단을 묶은 호출 보호 계층"""
+
+    def __init__(self, name, requests_per_second, max_retries=5, base_delay=1.0, max_delay=60.0,
+                 failure_threshold=5, recovery_timeout=30.0):
+        self.name = name
+        self.bucket = AdaptiveTokenBucket(requests_per_second)
+        self.breaker = CircuitBreaker(failure_threshold, recovery_timeout)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def _backoff(self, attempt, error):
+        """retry-after와 full jitter 지수 백오프 중 큰 값을 대기 시간으로 사용합니다."""
+        retry_after = _parse_duration(_error_headers(error).get("retry-after"))
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if _status_code(error) == 429:
+            self.bucket.on_throttled(retry_after)
+        return max(delay, retry_after or 0.0)
+
+    def _on_error(self, attempt, error):
+        """재시도할 경우 대기 시간을, 재시도하지 않을 경우 None을 반환합니다.
+
+        회로 차단기에는 일시적 오류로 재시도를 모두 소진한 호출만 실패 1건으로 기록합니다
+        (400, 인증, 검증 오류는 공급자 장애가 아니며, 호출 하나의 재시도가 회로를 열지 않도록 시도마다 기록하지 않음).
+        """
+        if not is_retryable(error):
+            self.breaker.release_probe()
+            return None
+        if attempt >= self.max_retries:
+            self.breaker.record_failure()
+            return None
+        delay = self._backoff(attempt, error)
+        logger.warning(f"{self.name} 호출 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {error}")
+        return delay
+
+    def _on_success(self, headers=None):
+        self.breaker.record_success()
+        self.bucket.on_success()
+        self.bucket.update_from_headers(headers)
+
+    def _check_breaker(self, attempt, last_error):
+        """첫 시도는 회로 차단기 허용 여부를 확인하고, 재시도 중 다른 호출의 실패로 회로가 열렸으면 원래 오류를 전달합니다."""
+        if attempt == 0:
+            self.breaker.before_call(self.name)
+        elif self.breaker.state == "open":
+            self.breaker.release_probe()
+            raise last_error
+
+    def call(self, fn, *args, headers_of=None, **kwargs):
+        """fn을 보호된 방식으로 호출합니다. headers_of(result)로 응답 헤더를 얻을 수 있으면 속도를 조정합니다."""
+        attempt = 0
+        last_error = None
+        while True:
+            self._check_breaker(attempt, last_error)
+            self.bucket.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_error(attempt, e)
+                if delay is None:
+                    raise
+                last_error = e
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            self._on_success(headers_of(result) if headers_of else None)
+            return result
+
+    async def acall(self, coro_fn, *args, headers_of=None, **kwargs):
+        """call의 비동기 버전"""
+        attempt = 0
+        last_error = None
+        while True:
+            self._check_breaker(attempt, last_error)
+            await self.bucket.aacquire()
+            try:
+                result = await coro_fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_error(attempt, e)
+                if delay is None:
+                    raise
+                last_error = e
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # 취소(CancelledError) 등으로 끝난 복구 확인 호출
+                self.breaker.release_probe()
+                raise
+            self._on_success(headers_of(result) if headers_of else None)
+            return result
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+def get_provider_guard(name):
+    """공급자별 전역 ProviderGuard를 반환합니다. 설정은 <NAME>_RPS, <NAME>_MAX_RETRIES 환경 변수를 사용합니다."""
+    with _guards_lock:
+        if name not in _guards:
+            prefix = name.upper()
+            _guards[name] = ProviderGuard(
+                name,
+                requests_per_second=float(os.getenv(f"{prefix}_RPS", "5")),
+                max_retries=int(os.getenv(f"{prefix}_MAX_RETRIES", "5")),
+                failure_threshold=int(os.getenv(f"{prefix}_CIRCUIT_THRESHOLD", "5")),
+                recovery_timeout=float(os.getenv(f"{prefix}_CIRCUIT_TIMEOUT", "30"))
+            )
+        return _guards[name]
+
+def configure_provider_guard(name, requests_per_second):
+    """공급자의 초당 요청 수를 재설정합니다 (배치 실행 시 자원 제한 적용)."""
+    guard = get_provider_guard(name)
+    guard.bucket = AdaptiveTokenBucket(requests_per_second)
+    logger.info(f"{name} 요청 속도 제한 설정: {requests_per_second} req/s")
+    return guard
+
+def _response_headers(message):
+    return (getattr(message, "response_metadata", None) or {}).get("headers")
+
+class ResilientChatModel(Runnable):
+    """채팅 모델 호출에 ProviderGuard(속도 제한, 재시도, 회로 차단)를 적용하는 래퍼
+
+    llm.invoke(...)와 프롬프트 체이닝(prompt | llm)을 그대로 지원하며,
+    그 밖의 속성(model_name 등)은 원본 모델에 위임합니다.
+    """
+
+    def __init__(self, llm, guard):
+        self.llm = llm
+        self.guard = guard
+
+    def invoke(self, input, config=None, **kwargs):
+        return self.guard.call(self.llm.invoke, input, config, headers_of=_response_headers, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        return await self.guard.acall(self.llm.ainvoke, input, config, headers_of=_response_headers, **kwargs)
+
+    def __getattr__(self, name):
+        if name in ("llm", "guard"):
+            raise AttributeError(name)
+        return getattr(self.llm, name)
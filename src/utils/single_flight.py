@@ -0,0 +1,215 @@
+from loguru import logger
+from concurrent.futures import Future
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import pickle
+import threading
+import uuid
+
+from .artifacts import get_artifact_manager
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 조정 없이 스레드/asyncio 수준만 지원
+    fcntl = None
+
+class SingleFlight:
+    """같은 키의 동시 작업을 하나의 실행으로 합쳐 결과를 공유하는 조정 계층 (진행 중인 작업만 합치며 결과를 캐시하지 않음)
+
+    - 스레드/asyncio 태스크: 프로세스 내 진행 중 작업 테이블(Future)을 공유
+    - 프로세스: lock_dir의 파일 잠금으로 리더를 정하고, 리더가 실행하는 동안 기다린 프로세스만 리더의 결과 파일을 읽음
+      (기다리는 프로세스는 대기 표시 파일을 남기고, 마지막으로 결과를 읽은 프로세스가 잠금/결과 파일을 삭제)
+    """
+
+    def __init__(self, lock_dir=None):
+        self.lock_dir = lock_dir
+        self._lock = threading.Lock()
+        self._calls = {}
+        if lock_dir and fcntl is not None:
+            os.makedirs(lock_dir, exist_ok=True)
+        elif lock_dir:
+            logger.warning("fcntl을 사용할 수 없어 프로세스 간 single-flight 조정을 비활성화합니다.")
+            self.lock_dir = None
+
+    @staticmethod
+    def make_key(*parts):
+        """작업 식별 요소로부터 키를 계산합니다."""
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _join(self, key):
+        """진행 중인 작업이 있으면 그 Future를, 없으면 새 Future를 등록하고 리더 여부를 반환합니다."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _forget(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.lock_dir, f"{key}.{suffix}")
+
+    def _waiters(self, key):
+        return glob.glob(self._path(key, "*.wait"))
+
+    def _acquire_process_lock(self, key):
+        """프로세스 간 잠금을 획득합니다. 다른 프로세스가 같은 작업을 실행 중이면 끝날 때까지 대기합니다.
+
+        반환값: (잠금 파일 핸들, 다른 프로세스의 실행이 끝나기를 기다렸는지 여부)
+        """
+        if not self.lock_dir:
+            return None, False
+        path = self._path(key, "lock")
+        waited = False
+        while True:
+            handle = open(path, "a+")
+            marker = None
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # 진행 중인 리더가 있음: 대기 표시를 남겨 리더가 결과 파일을 지우지 않게 한 뒤 대기
+                marker = self._path(key, f"{os.getpid()}-{uuid.uuid4().hex}.wait")
+                open(marker, "w").close()
+                try:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                finally:
+                    os.remove(marker)
+                waited = True
+            # 대기하는 동안 이전 보유자가 잠금 파일을 삭제했으면 새 파일로 다시 시도
+            try:
+                if os.fstat(handle.fileno()).st_ino == os.stat(path).st_ino:
+                    return handle, waited
+            except FileNotFoundError:
+                pass
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            handle.close()
+
+    def _release_process_lock(self, key, handle):
+        """잠금을 해제합니다. 기다리는 프로세스가 없으면 잠금 파일과 결과 파일을 삭제합니다."""
+        if handle is None:
+            return
+        try:
+            if not self._waiters(key):
+                for suffix in ("result", "lock"):
+                    try:
+                        os.remove(self._path(key, suffix))
+                    except FileNotFoundError:
+                        pass
+        except OSError as e:
+            logger.warning(f"single-flight 잠금 파일 정리 실패: {e}")
+        finally:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            finally:
+                handle.close()
+
+    def _read_shared_result(self, key, waited):
+        """기다린 리더 실행의 결과가 있으면 (True, 결과)를 반환합니다.
+
+        기다리지 않고 잠금을 얻었으면 진행 중인 실행이 없었으므로 남아 있는 결과 파일은 이전 실행의 것이며 삭제합니다.
+        """
+        if not self.lock_dir:
+            return False, None
+        path = self._path(key, "result")
+        try:
+            if not waited:
+                os.remove(path)
+                return False, None
+            with open(path, "rb") as f:
+                return True, pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception as e:
+            logger.warning(f"single-flight 공유 결과 읽기 실패: {e}")
+            return False, None
+
+    def _write_shared_result(self, key, result):
+        """기다리는 프로세스가 있으면 결과를 원자적으로 기록합니다."""
+        if not self.lock_dir or not self._waiters(key):
+            return
+        path = self._path(key, "result")
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                pickle.dump(result, f)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"single-flight 공유 결과 기록 실패: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def do(self, key, fn, *args, share_result=None, **kwargs):
+        """동기 함수 실행. 같은 키의 작업이 진행 중이면 그 결과를 기다려 공유합니다.
+
+        share_result(result)가 False를 반환하면 결과를 다른 프로세스와 공유하지 않습니다(오류 결과 등).
+        """
+        future, leader = self._join(key)
+        if not leader:
+            logger.info(f"single-flight: 진행 중인 동일 작업 결과 대기 ({key[:12]})")
+            return future.result()
+        try:
+            handle, waited = self._acquire_process_lock(key)
+            try:
+                found, result = self._read_shared_result(key, waited)
+                if found:
+                    logger.info(f"single-flight: 다른 프로세스의 결과 재사용 ({key[:12]})")
+                else:
+                    result = fn(*args, **kwargs)
+                    if share_result is None or share_result(result):
+                        self._write_shared_result(key, result)
+            finally:
+                self._release_process_lock(key, handle)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._forget(key)
+
+    async def ado(self, key, coro_fn, *args, share_result=None, **kwargs):
+        """코루틴 실행. 다른 스레드나 이벤트 루프의 동일 작업과도 결과를 공유합니다."""
+        future, leader = self._join(key)
+        if not leader:
+            logger.info(f"single-flight: 진행 중인 동일 작업 결과 대기 ({key[:12]})")
+            return await asyncio.wrap_future(future)
+        try:
+            handle, waited = await asyncio.to_thread(self._acquire_process_lock, key)
+            try:
+                found, result = self._read_shared_result(key, waited)
+                if found:
+                    logger.info(f"single-flight: 다른 프로세스의 결과 재사용 ({key[:12]})")
+                else:
+                    result = await coro_fn(*args, **kwargs)
+                    if share_result is None or share_result(result):
+                        self._write_shared_result(key, result)
+            finally:
+                self._release_process_lock(key, handle)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._forget(key)
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+def get_single_flight():
+    """프로세스 전역 SingleFlight 인스턴스를 반환합니다."""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight(
+                lock_dir=os.getenv("SINGLE_FLIGHT_LOCK_DIR") or get_artifact_manager().path("locks")
+            )
+        return _single_flight
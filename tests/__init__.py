@@ -0,0 +1,11 @@
+import importlib
+
+import pytest
+
+
+def import_or_skip(name):
+    """테스트 대상 모듈을 불러오고, 선택 의존성이 없거나(ImportError) 시스템 라이브러리를 불러올 수 없으면(OSError) 건너뜁니다."""
+    try:
+        return importlib.import_module(name)
+    except (ImportError, OSError) as e:
+        pytest.skip(f"{name}을(를) 불러올 수 없습니다: {e}", allow_module_level=True)
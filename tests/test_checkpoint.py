@@ -0,0 +1,37 @@
+from tests import import_or_skip
+
+checkpoint = import_or_skip("src.core.checkpoint")
+state_module = import_or_skip("src.core.state")
+workflow = import_or_skip("src.core.workflow")
+
+
+def test_resume_restores_last_completed_node(tmp_path):
+    """노드 완료 시점의 상태를 저장하고, 재개 시 마지막 체크포인트에서 첫 미완료 노드로 이어지는지 확인"""
+    store = checkpoint.CheckpointStore(str(tmp_path / "checkpoints.db"))
+    try:
+        state = state_module.EthicsState(ai_service="테스트 서비스", criteria="EU AI Act")
+        state = state.apply({"service_info": "서비스 설명", "ethical_risk_keywords": ["bias"]})
+        assert store.save(state, "service_input") == 0
+        state = state.apply({"criteria_info": "적용 기준"})
+        assert store.save(state, "criteria_search") == 1
+
+        restored = store.load(state.workflow_id)
+        assert restored.criteria_info.content == "적용 기준"
+        assert store.completed_nodes(state.workflow_id) == ["service_input", "criteria_search"]
+        assert workflow.router(restored) == "ethics_evaluation"
+    finally:
+        store.close()
+
+
+def test_failed_stage_is_not_checkpointed(tmp_path):
+    """실패 메시지가 담긴 단계 결과는 저장하지 않아 재개 시 그 단계부터 다시 실행되는지 확인"""
+    store = checkpoint.CheckpointStore(str(tmp_path / "checkpoints.db"))
+    try:
+        state = state_module.EthicsState(ai_service="테스트 서비스", service_info="서비스 설명", ethical_risk_keywords=["bias"])
+        assert store.save(state, "service_input") == 0
+        failed = state.apply({"criteria_info": "기준 검색 중 오류가 발생했습니다: timeout"})
+        assert checkpoint.failed_fields(failed) == ["criteria_info"]
+        assert store.save(failed, "criteria_search") is None
+        assert workflow.router(store.load(state.workflow_id)) == "criteria_search"
+    finally:
+        store.close()
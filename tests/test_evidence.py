@@ -0,0 +1,66 @@
+from tests import import_or_skip
+
+evidence = import_or_skip("src.tools.evidence")
+
+THRESHOLDS = evidence.EvidenceThresholds(min_chars=100, min_similarity=0.4, min_keyword_coverage=0.5, min_score=0.7)
+
+
+def _entry(source, content, similarity=None):
+    return {"source": source, "label": source, "content": content, "similarity": similarity}
+
+
+def test_score_evidence_sufficient_when_all_components_meet_thresholds():
+    texts = ["Providers of high-risk AI systems shall ensure transparency and human oversight. " * 2]
+    result = evidence.score_evidence(texts, ["transparency", "human oversight"], [0.6, 0.5], thresholds=THRESHOLDS)
+    assert result.sufficient
+    assert result.score == 1.0
+    assert result.keyword_coverage == 1.0
+    assert result.missing_keywords == []
+
+
+def test_score_evidence_reports_missing_keywords_and_low_similarity():
+    texts = ["Providers of high-risk AI systems shall ensure transparency. " * 2]
+    result = evidence.score_evidence(texts, ["transparency", "biometric identification", "data governance"], [0.1, 0.1], thresholds=THRESHOLDS)
+    assert not result.sufficient
+    assert result.missing_keywords == ["biometric identification", "data governance"]
+    assert result.similarity == 0.1
+
+
+def test_score_evidence_without_similarity_uses_length_and_coverage_only():
+    """웹 검색 결과처럼 유사도가 없으면 길이와 키워드 포함 비율만 평가하고, 웹 기준 길이를 따로 적용"""
+    texts = ["transparency obligations apply " * 3]
+    assert not evidence.score_evidence(texts, ["transparency"], thresholds=THRESHOLDS, min_chars=1000).sufficient
+    result = evidence.score_evidence(texts, ["transparency"], thresholds=THRESHOLDS, min_chars=50)
+    assert result.sufficient and result.similarity is None
+
+
+def test_score_evidence_empty_is_never_sufficient():
+    assert not evidence.score_evidence([], [], thresholds=THRESHOLDS).sufficient
+
+
+def test_merge_evidence_skips_duplicates():
+    pool, added = evidence.merge_evidence([], [_entry("vector", "Article 5"), _entry("vector", " Article 5 "), _entry("web", "")])
+    assert added == 1
+    pool, added = evidence.merge_evidence(pool, [_entry("web", "Article 5")])
+    assert added == 0 and len(pool) == 1
+
+
+def test_merge_evidence_reserves_slots_per_source():
+    """유사도가 높은 벡터 근거가 많아도 유사도 없는 웹 근거가 자기 몫의 자리를 유지"""
+    vectors = [_entry("vector", f"vector {i}", similarity=0.9 - i * 0.01) for i in range(8)]
+    webs = [_entry("web", f"web {i}") for i in range(3)]
+    pool, _ = evidence.merge_evidence([], vectors + webs, max_entries=6)
+    contents = [entry["content"] for entry in pool]
+    assert len(pool) == 6
+    assert contents == ["vector 0", "vector 1", "vector 2", "web 0", "web 1", "web 2"]
+
+
+def test_merge_evidence_fills_unused_share_by_rank():
+    """한 출처가 자기 몫을 다 쓰지 않으면 남은 자리를 다른 출처의 상위 근거로 채우고 추가 순서를 유지"""
+    vectors = [_entry("vector", f"vector {i}", similarity=0.5 + i * 0.1) for i in range(5)]
+    pool, _ = evidence.merge_evidence([_entry("web", "web 0")], vectors, max_entries=4)
+    assert [entry["content"] for entry in pool] == ["web 0", "vector 2", "vector 3", "vector 4"]
+
+
+def test_normalize_query_matches_tried_queries():
+    assert evidence.normalize_query('  "EU AI Act"  Transparency ') == evidence.normalize_query("eu ai act transparency")
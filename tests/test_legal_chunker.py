@@ -0,0 +1,79 @@
+from tests import import_or_skip
+
+legal_chunker = import_or_skip("src.core.legal_chunker")
+
+EU_PAGE = """(1) The purpose of this Regulation is to improve the functioning of the internal market.
+(2) This Regulation should be applied in accordance with the values of the Union.
+CHAPTER I
+Article 1
+Subject matter
+1. The purpose of this Regulation is to promote the uptake of human-centric AI.
+2. This Regulation lays down harmonised rules for the placing on the market of AI systems.
+Article 2
+Scope
+1. This Regulation applies to providers placing AI systems on the market.
+ANNEX III
+High-risk AI systems referred to in Article 6(2)
+1. Biometrics, in so far as their use is permitted under relevant Union or national law.
+2. Critical infrastructure: AI systems intended to be used as safety components.
+"""
+
+
+def _chunks(chunker, pages):
+    units = []
+    for page, text in pages:
+        units.extend(chunker.feed(page, text))
+    units.extend(chunker.finish())
+    return [chunk for _, chunks in units for chunk in chunks]
+
+
+def test_splits_on_recital_article_and_annex_boundaries():
+    chunks = _chunks(legal_chunker.LegalChunker("EU_AI_Act", "eu.pdf"), [(1, EU_PAGE)])
+    units = [(metadata["unit"], metadata.get("recital") or metadata.get("article") or metadata.get("annex")) for _, metadata in chunks]
+    assert units == [("recital", "1"), ("recital", "2"), ("article", "1"), ("article", "2"), ("annex", "III")]
+
+    article = chunks[2]
+    assert article[0].startswith("Article 1 - Subject matter\n")
+    assert article[1]["title"] == "Subject matter"
+    assert article[1]["chapter"] == "I"
+    assert article[1]["paragraphs"] == "1-2"
+    assert chunks[4][1]["paragraphs"] == "1-2"
+    assert "paragraphs" not in chunks[0][1]
+
+
+def test_long_article_is_split_by_paragraph():
+    paragraphs = "\n".join(f"{i}. " + "The provider shall ensure compliance with the requirements. " * 3 for i in range(1, 5))
+    chunker = legal_chunker.LegalChunker("EU_AI_Act", "eu.pdf", max_chars=400)
+    chunks = _chunks(chunker, [(3, f"Article 9\nRisk management system\n{paragraphs}")])
+    assert len(chunks) > 1
+    assert [metadata["paragraphs"] for _, metadata in chunks] == ["1-2", "3-4"]
+    for content, metadata in chunks:
+        assert content.startswith("Article 9 - Risk management system\n")
+        assert len(content) <= 400
+        assert metadata["page"] == 3
+
+
+def test_long_heading_is_clamped():
+    """머리말이 max_chars보다 길어도 본문 폭이 최소 길이 아래로 내려가지 않고 청크가 끝까지 만들어짐"""
+    title = "Obligations of providers " * 40
+    body = "1. " + "Providers shall keep the documentation up to date. " * 20
+    chunker = legal_chunker.LegalChunker("EU_AI_Act", "eu.pdf", max_chars=300)
+    chunks = _chunks(chunker, [(1, f"Article 16\n{title}\n{body}")])
+    assert chunks
+    for content, metadata in chunks:
+        heading, text = content.split("\n", 1)
+        assert len(heading) <= legal_chunker.MAX_HEADING_CHARS
+        assert metadata["heading"] == heading
+        assert 0 < len(text) <= legal_chunker.MIN_BODY_CHARS
+
+
+def test_text_without_headings_is_flushed_per_page():
+    """조항 제목이 없는 문서는 finish를 기다리지 않고 페이지마다 청크를 내보냄"""
+    chunker = legal_chunker.LegalChunker("OECD_AI_Principles", "oecd.pdf")
+    first = list(chunker.feed(1, "AI actors should respect the rule of law.\nThey should implement safeguards."))
+    second = list(chunker.feed(2, "AI actors should be accountable for the proper functioning of AI systems."))
+    assert len(first) == 1 and len(second) == 1
+    assert first[0][1][0][1]["page"] == 1 and first[0][1][0][1]["unit"] == "text"
+    assert second[0][1][0][1]["page"] == 2
+    assert first[0][1][0][0].startswith("OECD_AI_Principles\n")
+    assert list(chunker.finish()) == []
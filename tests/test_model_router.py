@@ -0,0 +1,42 @@
+import asyncio
+
+from tests import import_or_skip
+
+model_router = import_or_skip("src.utils.model_router")
+
+
+class _SlowModel:
+    model_name = "slow"
+
+    def __init__(self):
+        self.release = None
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        await self.release.wait()
+        return input
+
+
+def test_cancelled_waiter_does_not_leak_permit():
+    """허가를 기다리던 비동기 호출이 취소되어도 허가 수가 줄지 않음"""
+    llm = _SlowModel()
+    limited = model_router.ConcurrencyLimitedChatModel(llm, "large", 1)
+
+    async def scenario():
+        llm.release = asyncio.Event()
+        holder = asyncio.create_task(limited.ainvoke("first"))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.create_task(limited.ainvoke("second"))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        llm.release.set()
+        assert await holder == "first"
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        # 취소된 대기 스레드가 뒤늦게 얻은 허가를 반환한 뒤에는 다시 호출 가능
+        return await asyncio.wait_for(limited.ainvoke("third"), timeout=2)
+
+    assert asyncio.run(scenario()) == "third"
+    assert limited._semaphore.acquire(blocking=False)
+    limited._semaphore.release()
@@ -0,0 +1,81 @@
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from tests import import_or_skip
+
+single_flight = import_or_skip("src.utils.single_flight")
+
+
+def _slow_work(marker_dir, tag):
+    """실행 표시 파일을 남기고 잠시 기다린 뒤 결과를 반환합니다."""
+    open(os.path.join(marker_dir, f"run-{os.getpid()}-{threading.get_ident()}"), "w").close()
+    time.sleep(0.5)
+    return f"result-{tag}"
+
+
+def _follower(lock_dir, marker_dir, started, queue, tag):
+    started.wait(5)
+    queue.put(single_flight.SingleFlight(lock_dir).do("key", _slow_work, marker_dir, tag))
+
+
+def _leader(lock_dir, marker_dir, started, queue):
+    def work():
+        started.set()
+        return _slow_work(marker_dir, "leader")
+    queue.put(single_flight.SingleFlight(lock_dir).do("key", work))
+
+
+def test_threads_share_one_call(tmp_path):
+    """같은 키로 동시에 들어온 스레드들은 한 번만 실행하고 결과를 공유"""
+    flight = single_flight.SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def work():
+        calls.append(1)
+        started.set()
+        time.sleep(0.3)
+        return {"answer": 42}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", work)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("key", work))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"answer": 42}] * 5
+    # 진행 중인 작업만 합치므로 끝난 뒤의 호출은 다시 실행
+    flight.do("key", work)
+    assert len(calls) == 2
+
+
+@pytest.mark.skipif(single_flight.fcntl is None or "fork" not in multiprocessing.get_all_start_methods(), reason="fcntl과 fork가 필요합니다")
+def test_processes_share_leader_result_and_clean_up(tmp_path):
+    """다른 프로세스들은 리더의 실행이 끝나기를 기다려 결과를 읽고, 끝나면 잠금/결과/대기 표시 파일이 남지 않음"""
+    lock_dir = str(tmp_path / "locks")
+    marker_dir = str(tmp_path / "runs")
+    os.makedirs(marker_dir)
+    context = multiprocessing.get_context("fork")
+    started = context.Event()
+    queue = context.Queue()
+
+    processes = [context.Process(target=_leader, args=(lock_dir, marker_dir, started, queue))]
+    processes += [context.Process(target=_follower, args=(lock_dir, marker_dir, started, queue, i)) for i in range(3)]
+    for process in processes:
+        process.start()
+    results = [queue.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join(10)
+
+    assert results == ["result-leader"] * 4
+    assert len(os.listdir(marker_dir)) == 1
+    assert os.listdir(lock_dir) == []
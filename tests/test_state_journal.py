@@ -0,0 +1,60 @@
+import pytest
+
+from tests import import_or_skip
+
+state_module = import_or_skip("src.core.state")
+state_journal = import_or_skip("src.core.state_journal")
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_journal_round_trip_across_resumed_appends(tmp_path, compress):
+    """변경 필드만 기록한 저널을 재생해 임의 step의 상태를 복원하고, 재개 실행의 추가 기록(gzip 멤버 포함)도 이어서 읽음"""
+    state = state_module.EthicsState(ai_service="테스트 서비스", criteria="EU AI Act")
+    journal = state_journal.StateJournal(state.workflow_id, directory=str(tmp_path), compress=compress)
+    assert journal.append(state, node="start") == 0
+    state = state.apply({"service_info": "서비스 설명", "ethical_risk_keywords": ["bias", "privacy"]})
+    assert journal.append(state, node="service_input") == 1
+    # 변경이 없으면 기록하지 않음
+    assert journal.append(state, node="noop") == 1
+
+    # 재개 실행: 같은 저널 파일을 열어 마지막 step 다음부터 기록
+    resumed = state_journal.StateJournal(state.workflow_id, directory=str(tmp_path), compress=compress)
+    state = state.apply({"criteria_info": "적용 기준", "query_attempt": 1})
+    assert resumed.append(state, node="criteria_search") == 2
+
+    records = list(state_journal.iter_journal(resumed.path))
+    assert [record["node"] for record in records] == ["start", "service_input", "criteria_search"]
+    assert set(records[2]["changes"]) >= {"criteria_info", "query_attempt"}
+    assert "ai_service" not in records[2]["changes"]
+
+    first = state_journal.load_journal_state(resumed.path, step=0)
+    assert first.ai_service == "테스트 서비스" and first.service_info is None
+    middle = state_journal.load_journal_state(resumed.path, step=1)
+    assert middle.service_info.content == "서비스 설명"
+    assert middle.ethical_risk_keywords == ["bias", "privacy"]
+    assert middle.criteria_info is None
+    last = state_journal.load_journal_state(resumed.path)
+    assert last.criteria_info.content == "적용 기준"
+    assert last.query_attempt == 1
+    assert last.workflow_id == state.workflow_id
+
+
+def test_journal_keeps_blob_refs_for_long_messages(tmp_path, monkeypatch):
+    """긴 메시지는 저널에 blob 참조만 기록하고 복원 시 내용을 읽음"""
+    blob_store = import_or_skip("src.core.blob_store")
+    monkeypatch.setattr(blob_store, "_store", blob_store.BlobStore(str(tmp_path / "blobs")))
+    text = "긴 서비스 설명 " * 1000
+    state = state_module.EthicsState(ai_service="테스트 서비스", service_info=text)
+    journal = state_journal.StateJournal(state.workflow_id, directory=str(tmp_path))
+    journal.append(state, node="service_input")
+
+    changes = next(state_journal.iter_journal(journal.path))["changes"]
+    assert set(changes["service_info"]) == {"type", "blob", "length"}
+    assert state_journal.load_journal_state(journal.path).service_info.content == text
+
+
+def test_load_journal_state_without_records_raises(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_text("")
+    with pytest.raises(ValueError):
+        state_journal.load_journal_state(str(path))
@@ -0,0 +1,21 @@
+from tests import import_or_skip
+
+state_module = import_or_skip("src.core.state")
+workflow = import_or_skip("src.core.workflow")
+
+
+def _state(**kwargs):
+    return state_module.EthicsState(ai_service="테스트 서비스", service_info="서비스 설명", ethical_risk_keywords=["bias"], **kwargs)
+
+
+def test_route_after_criteria_search_retries_when_search_requested_it():
+    """기준 검색이 criteria_info 없이 query_attempt를 올리면 기준 검색을 다시 실행"""
+    assert workflow.route_after_criteria_search(_state(query_attempt=1)) == "criteria_search"
+
+
+def test_route_after_criteria_search_continues_with_result():
+    assert workflow.route_after_criteria_search(_state(criteria_info="적용 기준", query_attempt=2)) == "ethics_evaluation"
+
+
+def test_route_after_criteria_search_does_not_loop_on_first_empty_result():
+    assert workflow.route_after_criteria_search(_state()) == "ethics_evaluation"
@@ -1,9 +1,10 @@
 import os
 from dotenv import load_dotenv
-from src.utils import setup_logger
+from src.utils import setup_logger, get_artifact_manager
 from src.core import (
-    get_llm,
+    get_model_router,
     get_embeddings,
+    get_embedding_settings,
     load_ethics_frameworks_to_db,
     create_ethics_workflow
 )
@@ -17,23 +18,25 @@ def main():
     setup_logger()
     
     # 모델 초기화
-    llm = get_llm(model_name=os.getenv("LLM_MODEL", "gpt-4o"))
-    embeddings = get_embeddings(model_name=os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"))
+    llm = get_model_router()
+    _, embedding_model, faiss_path = get_embedding_settings()
+    embeddings = get_embeddings(model_name=embedding_model)
     
     # 윤리 프레임워크 벡터 DB 로드
-    ethics_db = load_ethics_frameworks_to_db(embeddings, vector_db_path=os.getenv("VECTOR_DB_PATH"))
+    ethics_db = load_ethics_frameworks_to_db(embeddings, faiss_path=faiss_path)
     
     # 워크플로우 생성
     workflow = create_ethics_workflow(llm, ethics_db)
     
     # 다이어그램 생성
     try:
-        # 저장 디렉토리 생성
-        os.makedirs("outputs", exist_ok=True)
+        # 저장 경로 (산출물 루트 아래)
+        diagram_path = os.path.join(get_artifact_manager().root, "ethics_workflow_diagram.html")
+        os.makedirs(os.path.dirname(diagram_path), exist_ok=True)
         
         # 다이어그램 생성 및 저장
-        workflow.write_html("outputs/ethics_workflow_diagram.html")
-        print(f"워크플로우 다이어그램이 생성되었습니다: {os.path.abspath('outputs/ethics_workflow_diagram.html')}")
+        workflow.write_html(diagram_path)
+        print(f"워크플로우 다이어그램이 생성되었습니다: {os.path.abspath(diagram_path)}")
         
         return 0
     except Exception as e: